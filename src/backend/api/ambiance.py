@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+CLI to render the ambiance of a recorded game to a WAV file, and benchmark the mixer
+"""
+import click
+from ..core.replay import Replay
+from ..services.ambiance.mixer import DEFAULT_FADE, GameAmbiance, Mixer, WavSink, benchmark, render_offline
+from ..services.ambiance.prefetch import AssetCache
+from ..services.ambiance.soundbank import SoundBank
+
+
+@click.command()
+@click.argument("bank", type=click.Path(exists=True, dir_okay=False), required=False)
+@click.argument("replay", type=click.Path(exists=True, dir_okay=False), required=False)
+@click.option("--output", type=click.Path(dir_okay=False), default="ambiance.wav", show_default=True)
+@click.option("--seconds", type=float, default=4.0, show_default=True, help="Seconds of ambiance per recorded action.")
+@click.option("--fade", type=float, default=DEFAULT_FADE, show_default=True, help="Crossfade length in seconds.")
+@click.option("--bench", is_flag=True, help="Measure how many times faster than real time the mixer runs.")
+def ambiance(bank, replay, output, seconds, fade, bench):
+    """🎵 Mix the ambiance of REPLAY (recorded with `cli --replay`) with the cues of BANK into a WAV file."""
+    if bank and replay:
+        recorded = Replay.load(replay)
+        with SoundBank(bank) as sounds:
+            cache = AssetCache.from_bank(sounds)
+            mixer = Mixer(sounds.sample_rate, sounds.channels, fade=fade)
+            game = recorded.seek(0)
+            follower = GameAmbiance(game, mixer, cache)
+            with WavSink(output, sounds.sample_rate, sounds.channels) as sink:
+                for index in range(len(recorded) + 1):
+                    follower.update(recorded.seek(index))
+                    render_offline(mixer, sink, seconds)
+                # Let the last jingle ring
+                render_offline(mixer, sink, 2 * seconds)
+            click.echo(click.style(f"✅ {sink.frames / sounds.sample_rate:.0f}s of ambiance written to {output}", fg="green"))
+    if bench:
+        click.echo(click.style(f"✅ Mixer runs {benchmark():.0f}x faster than real time", fg="green"))
+
+
+if __name__ == "__main__":
+    ambiance()
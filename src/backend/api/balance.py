@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+CLI to measure lineup balance by Monte Carlo simulation
+"""
+import time
+import click
+from ..core.balance import DEFAULT_GAMES, evaluate_distributions, save_balance
+from ..core.role_distributor import ROLE_DISTRIBUTIONS, _format_role_distribution
+
+
+@click.command()
+@click.option("--games", type=int, default=DEFAULT_GAMES, show_default=True, help="Games simulated per lineup.")
+@click.option("--workers", type=int, default=None, help="Worker processes (default: all cores).")
+@click.option("--seed", type=int, default=0, show_default=True)
+def balance(games, workers, seed):
+    """⚖️ Simulate every lineup of ROLE_DISTRIBUTIONS and cache the win rates."""
+    start = time.perf_counter()
+    results = evaluate_distributions(ROLE_DISTRIBUTIONS, games=games, workers=workers, seed=seed)
+    elapsed = time.perf_counter() - start
+
+    for num_players, variants in sorted(results.items()):
+        click.echo(click.style(f"\n{num_players} players", bold=True))
+        for i, result in enumerate(variants):
+            click.echo(f"  Lineup {i+1} ({result.summary()}): {_format_role_distribution(ROLE_DISTRIBUTIONS[num_players][i])}")
+
+    path = save_balance(results, ROLE_DISTRIBUTIONS)
+    total = sum(r.games for variants in results.values() for r in variants)
+    click.echo(click.style(f"\n✅ {total} games in {elapsed:.1f}s, saved to {path}", fg="green"))
+
+
+if __name__ == "__main__":
+    balance()
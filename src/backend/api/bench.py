@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+CLI to benchmark the engine hot paths and catch regressions against a baseline
+"""
+import click
+from ..core.benchmarks import (
+    BENCHMARKS,
+    DEFAULT_THRESHOLD,
+    STARTUP_BENCHMARKS,
+    compare,
+    default_results_path,
+    load_results,
+    run_suite,
+    save_results,
+)
+
+
+@click.command()
+@click.option("--only", multiple=True, type=click.Choice([*BENCHMARKS, *STARTUP_BENCHMARKS]), help="Benchmarks to run (default: all).")
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--repeat", type=int, default=10, show_default=True, help="Timed runs per benchmark (best one kept).")
+@click.option("--baseline", type=click.Path(dir_okay=False), default=None, help="Baseline JSON (default: in the cache directory).")
+@click.option("--threshold", type=float, default=DEFAULT_THRESHOLD, show_default=True, help="Allowed slowdown ratio (0.2 = 20%).")
+@click.option("--save", is_flag=True, help="Store this run as the new baseline.")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Also write this run's results to a JSON file.")
+def bench(only, seed, repeat, baseline, threshold, save, output):
+    """⏱️ Time the engine hot paths and compare them with the stored baseline."""
+    baseline_path = baseline or default_results_path()
+    results = run_suite(only or None, seed=seed, repeat=repeat)
+    previous = load_results(baseline_path)
+    comparisons = {c.name: c for c in compare(results, previous or {}, threshold)}
+
+    regressions = 0
+    for name, result in results.items():
+        line = f"  {name:<18} {result.seconds * 1e6:>12.2f} µs"
+        comparison = comparisons.get(name)
+        if comparison is not None:
+            regressions += comparison.regressed
+            line += click.style(
+                f"  x{comparison.ratio:.2f} vs baseline",
+                fg="red" if comparison.regressed else "green",
+            )
+        click.echo(line)
+
+    if output:
+        save_results(results, output, seed)
+    if save:
+        path = save_results(results, baseline_path, seed)
+        click.echo(click.style(f"\n✅ Baseline saved to {path}", fg="green"))
+    elif previous is None:
+        click.echo(f"\nNo baseline at {baseline_path}; run with --save to store one.")
+    if regressions and not save:
+        click.echo(click.style(f"\n❌ {regressions} benchmark(s) slower than the baseline by more than {threshold:.0%}", fg="red"))
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    bench()
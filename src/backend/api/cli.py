@@ -4,32 +4,45 @@ CLI to run a Werewolves game
 """
 import click
 from ..core.game import Game
-from .functions import first_night_process, process_night, process_day
+from ..core.replay import Replay
+from ..core.telemetry import METRICS
+from ..services.game_tracking.tracker import GameStore, GameTracker
+from .functions import play_game
+from .prompts import InquirerDecisionProvider
+from .replay import review
 
 
 @click.group(invoke_without_command=True)
 @click.argument("num_players", type=int, required=False, default=-1)
-def cli(num_players):
+@click.option("--metrics", type=click.Path(dir_okay=False), default=None, help="Time the game and write Prometheus metrics to this file.")
+@click.option("--replay", "replay_path", type=click.Path(dir_okay=False), default=None, help="Save the game to this replay file.")
+@click.option("--review", "review_game", is_flag=True, help="Step through the game (before / next) once it is over.")
+@click.option("--db", "database", type=click.Path(dir_okay=False), default=None, help="Store the game, its players and actions in this SQLite database.")
+def cli(num_players, metrics, replay_path, review_game, database):
     """🐺 Werewolves Game CLI Tool"""
+    if metrics:
+        METRICS.enable()
     click.echo("\n" + "=" * 50)
     click.echo(click.style("🐺 WEREWOLVES GAME CLI TOOL", fg="green", bold=True))
     click.echo("=" * 50)
-    game = Game(num_players)
-    game.show_players()
-    first_night_process(game)
-    game.show_players()
-    # Main Game Loop
-    while not game.is_over():
-        click.echo("\n🗳️ Village Vote (Day Phase)")
-        process_day(game)
-        game.show_players()
-        if game.is_over():
-            break
-
-        process_night(game)
-        game.round_number += 1
-        game.show_game_state()
-        game.show_players()
+    game = Game(num_players, provider=InquirerDecisionProvider())
+    start = game.snapshot()
+    if database:
+        with GameStore(database) as store:
+            play_game(game, after_phase=GameTracker(store, game).flush)
+        click.echo(f"🗄️ Game {game.uid} stored in {database}")
+    else:
+        play_game(game)
+    if metrics:
+        METRICS.write(metrics)
+        click.echo(f"⏱️ Metrics written to {metrics}")
+    if replay_path or review_game:
+        replay = Replay(start, game.journal)
+        if replay_path:
+            replay.save(replay_path)
+            click.echo(f"⏪ Replay written to {replay_path} (python -m src.backend.api.replay {replay_path})")
+        if review_game:
+            review(replay, len(replay))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+CLI to list the games stored in a SQLite database, show their statistics and benchmark the store
+"""
+import click
+from ..services.game_tracking.analytics import backfill, lineup_label
+from ..services.game_tracking.tracker import GameStore, benchmark
+
+
+@click.command()
+@click.argument("database", type=click.Path(exists=True, dir_okay=False), required=False)
+@click.option("--game", "uid", default=None, help="Show the players and actions of this game.")
+@click.option("--stats", is_flag=True, help="Show the statistics of the finished games.")
+@click.option("--backfill", "fill", is_flag=True, help="Add the finished games missing from the statistics first.")
+@click.option("--workers", type=int, default=None, help="Processes of the backfill (all cores by default).")
+@click.option("--bench", is_flag=True, help="Measure sustained stored actions per second.")
+@click.option("--actions", type=int, default=200_000, show_default=True)
+def games(database, uid, stats, fill, workers, bench, actions):
+    """🗄️ List the games recorded with `cli --db DATABASE`."""
+    if database and fill:
+        click.echo(f"📈 {backfill(database, workers=workers)} games added to the statistics")
+    if database and stats:
+        with GameStore(database) as store:
+            show_stats(store)
+    elif database:
+        with GameStore(database) as store:
+            for game in store.games():
+                if uid and game.uid != uid:
+                    continue
+                winner = game.winner.value if game.winner else "-"
+                click.echo(f"  {game.uid}: {game.status.value}, round {game.round_number}, winner {winner}")
+                if uid:
+                    for player in store.players(uid):
+                        status = "❤️ " if player.alive else "💀"
+                        role = player.role.value if player.role else "-"
+                        click.echo(f"    {status} {player.name:<15} {role}")
+                    for record in store.actions(uid):
+                        click.echo(f"    round {record.round_number} {record.period.value}: {record.actor} → {record.action.value} → {record.target}")
+    if bench:
+        rate, slowest = benchmark(actions)
+        click.echo(click.style(f"✅ {rate:,.0f} actions/s stored, slowest phase flush {slowest * 1e3:.2f} ms", fg="green"))
+
+
+def show_stats(store: GameStore) -> None:
+    report = store.analytics()
+    click.echo(click.style(f"📈 {report.games} finished games, {report.mean_rounds:.1f} rounds on average", bold=True))
+    click.echo("  First-night victims: " + ", ".join(f"{role} {count / max(report.games, 1):.0%}" for role, count in report.first_night_kills.items()))
+    click.echo(f"  Sorcière heals on the first night: {report.first_night_heal_rate:.0%} of {report.sorciere_games} games")
+    survival = report.mayor_survival()
+    click.echo("  Mayors still in office after 1, 2, 3 days: " + ", ".join(f"{share:.0%}" for share in survival[:3]))
+    for key, result in sorted(report.win_rates.items(), key=lambda item: -item[1].games):
+        click.echo(f"  {lineup_label(key):<16} {result.games:>6} games  {result.summary()}  ({key})")
+
+
+if __name__ == "__main__":
+    games()
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+CLI to try the GM phrase intent matcher and measure its throughput
+"""
+import click
+from ..services.vocal_detection.intents import IntentMatcher, benchmark
+
+
+@click.command()
+@click.argument("text", nargs=-1)
+@click.option("--bench", is_flag=True, help="Measure tokens per second on a synthetic transcript.")
+@click.option("--tokens", type=int, default=1_000_000, show_default=True)
+def intents(text, bench, tokens):
+    """🗣️ Print the intents recognized in TEXT (e.g. "la voyante se réveille")."""
+    if text:
+        for intent in IntentMatcher().feed(" ".join(text)):
+            state = intent.state.value if intent.state else "-"
+            action = intent.action.value if intent.action else "-"
+            click.echo(f"  {intent.phrase!r}: state={state} action={action}")
+    if bench:
+        click.echo(click.style(f"✅ {benchmark(tokens):,.0f} tokens/s", fg="green"))
+
+
+if __name__ == "__main__":
+    intents()
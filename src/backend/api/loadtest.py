@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Local load test of the table server: many bot-driven games at once, p99 action latency.
+
+Every table gets a game-master bot connected over WebSocket that answers each
+decision at random, after an optional think time. The action latency is the
+time between sending an answer and receiving the next decision (or the end of
+the game), so it covers the network round trip, the loop and the engine replay.
+"""
+import asyncio
+import base64
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from random import Random
+from typing import List, Optional
+
+import click
+
+from .server import (
+    WS_CLOSE,
+    WS_TEXT,
+    TableServer,
+    encode_frame,
+    read_frame,
+    read_headers,
+)
+
+
+@dataclass
+class LoadResult:
+    """Outcome of a load test run."""
+
+    tables: int
+    finished: int
+    elapsed: float
+    latencies: List[float] = field(default_factory=list)
+
+    def percentile(self, q: float) -> float:
+        """Latency (seconds) below which a fraction `q` of the actions completed."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, max(0, int(q * len(ordered) + 0.5) - 1))]
+
+    def summary(self) -> str:
+        ms = 1000
+        return (
+            f"{self.finished}/{self.tables} games, {len(self.latencies)} actions in {self.elapsed:.1f}s | "
+            f"p50 {self.percentile(0.5) * ms:.1f}ms p99 {self.percentile(0.99) * ms:.1f}ms "
+            f"max {max(self.latencies, default=0) * ms:.1f}ms"
+        )
+
+
+async def http_json(host: str, port: int, method: str, path: str, payload: Optional[dict] = None):
+    """One-shot JSON request to the server; returns (status, decoded body)."""
+    reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n"
+        f"Connection: close\r\n\r\n".encode() + body
+    )
+    status = int((await reader.readline()).split()[1])
+    headers = await read_headers(reader)
+    data = await reader.readexactly(int(headers.get("content-length", 0)))
+    writer.close()
+    return status, json.loads(data)
+
+
+async def play_table(
+    host: str, port: int, uid: str, rng: Random, latencies: List[float], think: float = 0.0
+) -> bool:
+    """Drive one table over WebSocket until its game is over; True if it finished normally."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(
+        f"GET /tables/{uid}/events HTTP/1.1\r\nHost: {host}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {base64.b64encode(os.urandom(16)).decode()}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode()
+    )
+    await reader.readline()
+    await read_headers(reader)
+    sent: Optional[float] = None
+    try:
+        while True:
+            opcode, payload = await read_frame(reader)
+            if opcode == WS_CLOSE:
+                return False
+            event = json.loads(payload)
+            decision = event.get("decision") if event["type"] == "state" else event
+            if event["type"] in ("decision", "over") and sent is not None:
+                latencies.append(time.perf_counter() - sent)
+                sent = None
+            if event["type"] == "over" or (event["type"] == "state" and event["status"] != "running"):
+                return event["status"] == "finished"
+            if event["type"] in ("decision", "state") and decision:
+                candidates = decision["candidates"]
+                name = None if decision["can_select_none"] and rng.random() < 0.5 else rng.choice(candidates)
+                if think:
+                    await asyncio.sleep(rng.uniform(0, 2 * think))
+                answer = json.dumps({"decision": decision["id"], "player": name}).encode()
+                sent = time.perf_counter()
+                writer.write(encode_frame(answer, WS_TEXT, mask=os.urandom(4)))
+    finally:
+        writer.write(encode_frame(b"", WS_CLOSE, mask=os.urandom(4)))
+        writer.close()
+
+
+async def run_load(
+    tables: int = 200, players: int = 8, seed: int = 0, think: float = 0.0, max_tables: Optional[int] = None
+) -> LoadResult:
+    """Start a server on a free local port and play `tables` concurrent games against it.
+
+    `think` is the mean delay (seconds) a bot waits before answering; 0 answers
+    immediately, which saturates the server.
+    """
+    server = TableServer(max_tables or tables)
+    await server.start("127.0.0.1", 0)
+    host, port = "127.0.0.1", server.port
+    latencies: List[float] = []
+    try:
+        start = time.perf_counter()
+        uids = []
+        for _ in range(tables):
+            status, table = await http_json(host, port, "POST", "/tables", {"players": players})
+            if status != 201:
+                raise RuntimeError(table["error"])
+            uids.append(table["uid"])
+        results = await asyncio.gather(
+            *(play_table(host, port, uid, Random(seed * 100003 + i), latencies, think) for i, uid in enumerate(uids))
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        await server.close()
+    return LoadResult(tables=tables, finished=sum(results), elapsed=elapsed, latencies=latencies)
+
+
+@click.command()
+@click.option("--tables", type=int, default=200, show_default=True, help="Concurrent games.")
+@click.option("--players", type=int, default=8, show_default=True)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--think", type=float, default=0.05, show_default=True, help="Mean seconds a bot waits before answering.")
+def loadtest(tables, players, seed, think):
+    """⏱️ Play many concurrent games against a local table server and report action latency."""
+    result = asyncio.run(run_load(tables, players, seed, think))
+    click.echo(click.style(f"✅ {result.summary()}", fg="green" if result.finished == tables else "yellow"))
+
+
+if __name__ == "__main__":
+    loadtest()
@@ -0,0 +1,97 @@
+"""
+Interactive terminal decision provider (click + inquirer)
+"""
+from typing import Dict, List, Optional
+import click
+import inquirer
+from ..core.decisions import Decision, DecisionProvider
+from ..core.game import Game, Player
+from ..core.role_distributor import Role, lineup_labels
+
+
+class InquirerDecisionProvider(DecisionProvider):
+    """Asks the game master for every decision through terminal prompts."""
+
+    verbose = True
+
+    def notify(self, message: str, **style) -> None:
+        click.echo(click.style(message, **style) if style else message)
+
+    def choose_num_players(self, choices: List[int], default: int) -> Optional[int]:
+        questions = [
+            inquirer.List(
+                "num_players",
+                message="How many players?",
+                choices=[str(i) for i in choices],
+                default=str(default),
+                carousel=True,
+            ),
+        ]
+        answers = inquirer.prompt(questions)
+        if not answers:
+            return None
+        return int(answers["num_players"])
+
+    def choose_player_name(self, index: int, default: str) -> Optional[str]:
+        questions = [
+            inquirer.Text(
+                "name",
+                message=f"Enter name for player {index+1}",
+                default=default,
+                validate=lambda _, x: len(x.strip()) > 0 or "Name cannot be empty",
+            ),
+        ]
+        answers = inquirer.prompt(questions)
+        if not answers:
+            return None
+        return answers["name"].strip() or default
+
+    def choose_lineup(self, num_players: int, variants: List[Dict[Role, int]]) -> Optional[int]:
+        print(f"\n🎮 Game Master: Choose lineup for {num_players} players")
+        print("=" * 60)
+
+        labels = lineup_labels(num_players, variants)
+        choices = [f"Lineup {i+1} {label}" for i, label in enumerate(labels)]
+        questions = [
+            inquirer.List(
+                'lineup',
+                message="Select a lineup",
+                choices=choices,
+                carousel=True
+            ),
+        ]
+        try:
+            answers = inquirer.prompt(questions)
+        except (KeyboardInterrupt, EOFError):
+            print("\n⚠️ Selection cancelled, using default variant")
+            return None
+        if not answers:
+            return None
+        # Extract lineup index from choice
+        return int(answers['lineup'].split()[1]) - 1
+
+    def select_player(
+        self,
+        game: Game,
+        candidates: List[Player],
+        author: Optional[Player] = None,
+        decision: Optional[Decision] = None,
+        can_select_none: bool = False,
+    ) -> Optional[Player]:
+        choices = [player.name for player in candidates]
+        if can_select_none:
+            choices.insert(0, "None")
+
+        questions = [
+            inquirer.List(
+                "player", message="Select a player:", choices=choices, carousel=True
+            ),
+        ]
+
+        answers = inquirer.prompt(questions)
+        if not answers:
+            return None
+        choice = answers["player"]
+        if choice == "None":
+            return None
+        return next((p for p in candidates if p.name == choice), None)
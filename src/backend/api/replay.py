@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+CLI to review a recorded game action by action (before / next, or jump to a round)
+"""
+from typing import Optional
+
+import click
+from ..core.game import Game, State
+from ..core.journal import NO_PLAYER
+from ..core.replay import Replay
+
+HELP = "[n]ext, [b]efore, [g]o ROUND [PERIOD [PHASE]], [q]uit"
+
+
+def describe(replay: Replay, game: Game, index: int) -> str:
+    """Title of the position after `index` actions."""
+    if index == 0:
+        return f"Start (0/{len(replay)})"
+    record = replay.record(index - 1)
+    actor = game.players[record.actor].name if record.actor != NO_PLAYER else "The village"
+    target = game.players[record.target].name if record.target != NO_PLAYER else "nobody"
+    period = record.period.value.replace("_", " ").title()
+    action = record.action.value.replace("_", " ")
+    return f"Round {record.round_number}, {period} ({index}/{len(replay)}): {actor} → {action} → {target}"
+
+
+def show(replay: Replay, game: Game, index: int) -> None:
+    click.echo(click.style(f"\n⏪ {describe(replay, game, index)}", bold=True))
+    for player in game.players:
+        status = "❤️ " if player.alive else "💀"
+        mayor = " 👑" if player.is_mayor else ""
+        lover = f" 💕 {player.lover.name}" if player.lover else ""
+        role = player.role.value.replace("_", " ").title() if player.role else "No Role"
+        click.echo(f"  {status} {player.name:<15} {role:<12}{mayor}{lover}")
+    if game.winner is not None:
+        click.echo(click.style(f"  🏁 Winner: {game.winner.value.replace('_', ' ').title()}", fg="green"))
+
+
+def review(replay: Replay, index: int = 0) -> None:
+    """Interactive navigation through the positions of `replay`."""
+    while True:
+        show(replay, replay.seek(index), index)
+        answer = click.prompt(HELP, default="n", show_default=False).split()
+        command = answer[0].lower() if answer else "n"
+        if command == "q":
+            return
+        if command == "n":
+            index = min(index + 1, len(replay))
+        elif command == "b":
+            index = max(index - 1, 0)
+        elif command == "g" and len(answer) >= 2 and answer[1].isdigit():
+            try:
+                period = State(answer[2]) if len(answer) > 2 else None
+                phase = int(answer[3]) if len(answer) > 3 else 1
+                index = replay.find(int(answer[1]), period, phase)
+            except (ValueError, LookupError) as e:
+                click.echo(click.style(f"❌ {e}", fg="red"))
+        else:
+            click.echo(HELP)
+
+
+@click.command()
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--round", "round_number", type=int, default=None, help="Start at the end of this round.")
+@click.option("--period", type=click.Choice([state.value for state in State]), default=None, help="... right after this period of the round.")
+@click.option("--phase", type=int, default=1, show_default=True, help="... in this night (or day) of the round (round 1 holds two nights).")
+def replay(path: str, round_number: Optional[int], period: Optional[str], phase: int):
+    """⏪ Review a game recorded with `cli --replay`, before / next."""
+    recorded = Replay.load(path)
+    index = 0
+    if round_number is not None:
+        index = recorded.find(round_number, State(period) if period else None, phase)
+    review(recorded, index)
+
+
+if __name__ == "__main__":
+    replay()
@@ -0,0 +1,704 @@
+"""
+Asyncio multi-table game server: many concurrent games in one process.
+
+Each table is an actor (`GameTable`) owning one `Game`. The rules engine
+stays synchronous (the same code the CLI and simulations run) but no thread
+waits on a decision: the table records the answers so far, and each answer
+replays the current phase from the snapshot taken after the previous one, on
+a small shared executor, until the next unanswered decision, which the
+engine reports by unwinding. On the
+loop side a pending decision is an awaitable (`await table.next_decision()`),
+answered by game-master or player devices through a small local
+HTTP/WebSocket API:
+
+    POST   /tables                         {"players": 8, "names": [...], "lineup": 0}
+    GET    /tables                         every table (uid, status, period, round)
+    GET    /tables/<uid>[?player=<name>]   table state (roles hidden on player devices)
+    POST   /tables/<uid>/decisions/<id>    {"player": "<name>"}, or null to pass
+    DELETE /tables/<uid>                   close the table
+    GET    /tables/<uid>/events[?player=]  WebSocket of JSON events; a device may answer
+                                           with {"decision": <id>, "player": "<name>"}
+    GET    /metrics                        engine timings, Prometheus text format (`--metrics`)
+
+Finished tables are evicted `finished_ttl` seconds after their game ended.
+Engine spans are paused during the replays; the time a decision waits for
+its device is recorded on the loop instead.
+
+Run with `python -m src.backend.api.server --port 8765`.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import click
+
+from ..core.decisions import Decision, DecisionProvider
+from ..core.game import Game, Player
+from ..core.lineup_catalog import lineups_for
+from ..core.role_distributor import MAX_PLAYERS, Role
+from ..core.telemetry import DECISION_SECONDS, METRICS
+from .functions import play_game
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_TABLES = 512
+# Threads replaying the engines of every table (a table only uses one while it computes)
+DEFAULT_ENGINE_WORKERS = 2
+# Seconds a finished table stays readable before it is evicted
+DEFAULT_FINISHED_TTL = 300.0
+# Events kept per table for devices that connect late
+HISTORY_SIZE = 64
+# Events buffered per WebSocket before a slow device is dropped
+SUBSCRIBER_QUEUE_SIZE = 1024
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+WS_TEXT, WS_CLOSE, WS_PING, WS_PONG = 0x1, 0x8, 0x9, 0xA
+
+HTTP_REASONS = {
+    200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class PendingDecision:
+    """A decision the engine is waiting for; resolved by `GameTable.answer`."""
+
+    id: int
+    decision: Optional[Decision]
+    author: Optional[str]
+    candidates: List[Player]
+    can_select_none: bool
+    # Role of the author, for the decision wait metric
+    role: str = ""
+
+    def to_json(self) -> dict:
+        return {
+            "id": self.id,
+            "decision": self.decision.value if self.decision else None,
+            "author": self.author,
+            "candidates": [player.name for player in self.candidates],
+            "can_select_none": self.can_select_none,
+        }
+
+
+class Suspended(Exception):
+    """Raised in an engine run when it reaches a decision that has no answer yet."""
+
+    def __init__(self, pending: PendingDecision) -> None:
+        super().__init__(pending.id)
+        self.pending = pending
+
+
+class TableProvider(DecisionProvider):
+    """Decision provider of a server table: answers from the recorded answers, suspends on the next one."""
+
+    def __init__(self, names: Optional[List[str]], lineup: int) -> None:
+        self.names = names
+        self.lineup = lineup
+        # Names chosen for the decisions answered so far (None: passed), in the order they were asked
+        self.answers: List[Optional[str]] = []
+        self._asked = 0
+        # Messages of the current run (None while the game is set up), and of the longest run so far (published)
+        self._told: Optional[int] = None
+        self._published = 0
+        self._outbox: List[dict] = []
+
+    def notify(self, message: str, **style) -> None:
+        if self._told is not None:
+            self._told += 1
+            if self._told <= self._published:
+                return
+        self._outbox.append({"type": "message", "text": message})
+
+    def choose_player_name(self, index: int, default: str) -> Optional[str]:
+        if self.names is not None and index < len(self.names):
+            return self.names[index]
+        return default
+
+    def choose_lineup(self, num_players: int, variants: List[Dict[Role, int]]) -> Optional[int]:
+        return self.lineup
+
+    def select_player(
+        self,
+        game: Game,
+        candidates: List[Player],
+        author: Optional[Player] = None,
+        decision: Optional[Decision] = None,
+        can_select_none: bool = False,
+    ) -> Optional[Player]:
+        index = self._asked
+        self._asked += 1
+        if index < len(self.answers):
+            name = self.answers[index]
+            return None if name is None else next(p for p in candidates if p.name == name)
+        raise Suspended(
+            PendingDecision(
+                id=index + 1,
+                decision=decision,
+                author=author.name if author else None,
+                candidates=list(candidates),
+                can_select_none=can_select_none,
+                role=author.role.value if author is not None and author.role is not None else "",
+            )
+        )
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        """Decisions asked and messages told so far in this run."""
+        return self._asked, self._told or 0
+
+    def rewind(self, position: Tuple[int, int] = (0, 0)) -> None:
+        """Start a new run from a `position` of an earlier run."""
+        self._asked, self._told = position
+
+    def flush(self) -> List[dict]:
+        """Messages not published yet."""
+        if self._told is not None:
+            self._published = max(self._published, self._told)
+        messages, self._outbox = self._outbox, []
+        return messages
+
+
+class GameTable:
+    """Actor owning one game: replays its engine up to each decision and publishes its events."""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        executor: ThreadPoolExecutor,
+        names: Optional[List[str]] = None,
+        lineup: int = 0,
+    ) -> None:
+        self.loop = loop
+        self.status = "waiting"
+        self.error: Optional[str] = None
+        self.pending: Optional[PendingDecision] = None
+        self.closed = False
+        # Loop time the game ended (finished, error or closed), for the eviction of finished tables
+        self.ended_at: Optional[float] = None
+        self.game: Optional[Game] = None
+        self.provider = TableProvider(names, lineup)
+        self._executor = executor
+        # Snapshot after the last finished phase, and the provider position there
+        self._checkpoint: Tuple[bytes, Tuple[int, int]] = (b"", (0, 0))
+        self._asked_at = 0.0
+        self._run: Optional[asyncio.Future] = None
+        self._history: Deque[dict] = deque(maxlen=HISTORY_SIZE)
+        self._subscribers: Set[Tuple[asyncio.Queue, Optional[str]]] = set()
+        # Set while a decision is pending or once the game is over
+        self._ready = asyncio.Event()
+        self._over = asyncio.Event()
+
+    async def setup(self, num_players: int) -> None:
+        """Create the game off the loop (generating a lineup may write the catalog); raises ValueError."""
+        self.game = await self.loop.run_in_executor(self._executor, self._create, num_players)
+        self._checkpoint = (self.game.snapshot(), (0, 0))
+        self._publish_all(self.provider.flush())
+
+    def _create(self, num_players: int) -> Game:
+        names, lineup = self.provider.names, self.provider.lineup
+        try:
+            # Bounded: each new player count is generated and written to the catalog
+            if num_players > MAX_PLAYERS:
+                raise KeyError(num_players)
+            lineups = lineups_for(num_players)
+        except KeyError:
+            raise ValueError(f"No lineup for {num_players} players") from None
+        if names is not None and len(names) != num_players:
+            raise ValueError(f"Expected {num_players} names, got {len(names)}")
+        if not 0 <= lineup < len(lineups):
+            raise ValueError(f"No lineup {lineup} for {num_players} players")
+        return Game(num_players, provider=self.provider)
+
+    @property
+    def uid(self) -> str:
+        return self.game.uid
+
+    @property
+    def running(self) -> bool:
+        return self.status == "running"
+
+    def start(self) -> None:
+        """Run the engine up to its first decision."""
+        self.status = "running"
+        self._advance()
+
+    async def wait(self) -> None:
+        """Wait until the game is over (or the table closed)."""
+        await self._over.wait()
+        if self._run is not None:
+            await asyncio.gather(self._run, return_exceptions=True)
+
+    async def next_decision(self) -> Optional[PendingDecision]:
+        """The decision the engine is waiting for, or None once the game is over."""
+        await self._ready.wait()
+        return self.pending
+
+    def answer(self, decision_id: int, name: Optional[str]) -> None:
+        """Answer the pending decision with a candidate name (None to pass)."""
+        pending = self.pending
+        if pending is None or pending.id != decision_id:
+            raise KeyError(f"Decision {decision_id} is not pending")
+        if name is not None and not any(p.name == name for p in pending.candidates):
+            raise ValueError(f"{name!r} is not a candidate")
+        if name is None and not pending.can_select_none:
+            raise ValueError("This decision requires a player")
+        METRICS.observe(
+            DECISION_SECONDS,
+            self.loop.time() - self._asked_at,
+            game=self.uid,
+            round=self.game.round_number,
+            decision=pending.decision.value if pending.decision is not None else "",
+            role=pending.role,
+        )
+        self.provider.answers.append(name)
+        self.pending = None
+        self._ready.clear()
+        self._publish({"type": "answered", "id": decision_id, "player": name})
+        self._advance()
+
+    def close(self) -> None:
+        """Stop the game (a replay in progress is discarded)."""
+        if self.closed:
+            return
+        self.closed = True
+        if self.ended_at is None:
+            self._finish([], "closed", None)
+
+    def state(self, player: Optional[str] = None) -> dict:
+        """JSON view of the table, for the game master or (with `player`) one player's device."""
+        game = self.game
+        pending = self.pending
+        return {
+            "uid": self.uid,
+            "status": self.status,
+            "error": self.error,
+            "period": game.period.value,
+            "round": game.round_number,
+            "winner": game.winner.value if game.winner else None,
+            "players": [
+                {
+                    "name": p.name,
+                    "alive": p.alive,
+                    "is_mayor": p.is_mayor,
+                    "role": p.role.value if p.role and (player is None or p.name == player or p.is_revealed) else None,
+                }
+                for p in game.players
+            ],
+            "decision": pending.to_json() if pending and _visible(pending.author, player) else None,
+        }
+
+    def subscribe(self, player: Optional[str] = None) -> asyncio.Queue:
+        """Queue receiving the table events visible to `player` (None: game master)."""
+        queue: asyncio.Queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add((queue, player))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers = {s for s in self._subscribers if s[0] is not queue}
+
+    # Engine (executor thread, one run at a time per table)
+    def _replay(self) -> Tuple[Game, List[dict], Optional[PendingDecision], str, Optional[str]]:
+        snapshot, position = self._checkpoint
+        game = Game.restore(snapshot, self.provider)
+        self.provider.rewind(position)
+        pending, status, error = None, "finished", None
+
+        def checkpoint(game: Game) -> None:
+            self._checkpoint = (game.snapshot(), self.provider.position)
+
+        with METRICS.paused():
+            try:
+                play_game(game, after_phase=checkpoint)
+            except Suspended as suspended:
+                pending, status = suspended.pending, "running"
+            except Exception as e:
+                status, error = "error", f"{type(e).__name__}: {e}"
+        return game, self.provider.flush(), pending, status, error
+
+    # Loop side
+    def _advance(self) -> None:
+        self._run = self.loop.run_in_executor(self._executor, self._replay)
+        self._run.add_done_callback(self._advanced)
+
+    def _advanced(self, run: asyncio.Future) -> None:
+        if self.closed or run.cancelled():
+            return
+        if run.exception() is not None:
+            self._finish([], "error", f"{type(run.exception()).__name__}: {run.exception()}")
+            return
+        game, messages, pending, status, error = run.result()
+        self.game = game
+        if pending is None:
+            self._finish(messages, status, error)
+            return
+        self._publish_all(messages)
+        self.pending = pending
+        self._asked_at = self.loop.time()
+        self._ready.set()
+        self._publish({"type": "decision", **pending.to_json()})
+
+    def _finish(self, messages: List[dict], status: str, error: Optional[str]) -> None:
+        self._publish_all(messages)
+        self.status = status
+        self.error = error
+        self.pending = None
+        self.ended_at = self.loop.time()
+        self._ready.set()
+        self._over.set()
+        winner = self.game.winner
+        self._publish({"type": "over", "status": status, "winner": winner.value if winner else None, "error": error})
+
+    def _publish_all(self, events: List[dict]) -> None:
+        for event in events:
+            self._publish(event)
+
+    def _publish(self, event: dict) -> None:
+        self._history.append(event)
+        for queue, player in list(self._subscribers):
+            if not _visible_event(event, player):
+                continue
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.unsubscribe(queue)
+
+
+def _visible(author: Optional[str], player: Optional[str]) -> bool:
+    """Whether a decision of `author` is shown to `player`'s device (the GM sees all)."""
+    return player is None or author == player
+
+
+def _visible_event(event: dict, player: Optional[str]) -> bool:
+    kind = event["type"]
+    if kind == "message":
+        # Narration names roles: game master only
+        return player is None
+    if kind == "decision":
+        return _visible(event["author"], player)
+    return True
+
+
+class TableServer:
+    """Hosts the tables of one process and serves them over HTTP/WebSocket."""
+
+    def __init__(
+        self,
+        max_tables: int = DEFAULT_MAX_TABLES,
+        engine_workers: int = DEFAULT_ENGINE_WORKERS,
+        finished_ttl: float = DEFAULT_FINISHED_TTL,
+    ) -> None:
+        self.max_tables = max_tables
+        self.finished_ttl = finished_ttl
+        self.tables: Dict[str, GameTable] = {}
+        # Shared by every table: an engine only holds a thread while it replays up to its next decision
+        self._executor = ThreadPoolExecutor(max_workers=engine_workers, thread_name_prefix="engine")
+        self._creating = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._evictions: Optional[asyncio.Task] = None
+
+    async def create_table(self, num_players: int, names: Optional[List[str]] = None, lineup: int = 0) -> GameTable:
+        """Create a table and start its game."""
+        self.evict_finished()
+        if sum(table.running for table in self.tables.values()) + self._creating >= self.max_tables:
+            raise HTTPError(503, f"Already running {self.max_tables} tables")
+        table = GameTable(asyncio.get_running_loop(), self._executor, names, lineup)
+        self._creating += 1
+        try:
+            await table.setup(num_players)
+        finally:
+            self._creating -= 1
+        self.tables[table.uid] = table
+        table.start()
+        return table
+
+    async def close_table(self, uid: str) -> None:
+        table = self.tables.pop(uid)
+        METRICS.forget(uid)
+        table.close()
+        await table.wait()
+
+    def evict_finished(self) -> int:
+        """Drop the tables whose game ended more than `finished_ttl` seconds ago; returns how many."""
+        now = asyncio.get_running_loop().time()
+        expired = [
+            uid for uid, table in self.tables.items()
+            if table.ended_at is not None and now - table.ended_at >= self.finished_ttl
+        ]
+        for uid in expired:
+            del self.tables[uid]
+            METRICS.forget(uid)
+        return len(expired)
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self._evictions = asyncio.ensure_future(self._evict_periodically())
+        return self._server
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._evictions is not None:
+            self._evictions.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for uid in list(self.tables):
+            await self.close_table(uid)
+        self._executor.shutdown()
+
+    async def _evict_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(max(self.finished_ttl / 2, 1.0))
+            self.evict_finished()
+
+    # HTTP
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                if headers.get("upgrade", "").lower() == "websocket":
+                    await self._websocket(target, headers, reader, writer)
+                    break
+                try:
+                    status, payload = await self._dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(encode_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, object]:
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        query = parse_qs(url.query)
+        player = query.get("player", [None])[0]
+        if parts == ["metrics"] and method == "GET":
+            return 200, METRICS.render()
+        if parts == ["tables"]:
+            if method == "GET":
+                return 200, [
+                    {"uid": t.uid, "status": t.status, "period": t.game.period.value, "round": t.game.round_number}
+                    for t in self.tables.values()
+                ]
+            if method == "POST":
+                options = _json_body(body)
+                try:
+                    table = await self.create_table(
+                        int(options.get("players", 0)), options.get("names"), int(options.get("lineup", 0))
+                    )
+                except ValueError as e:
+                    raise HTTPError(400, str(e))
+                return 201, table.state()
+            raise HTTPError(405, method)
+        if len(parts) < 2 or parts[0] != "tables":
+            raise HTTPError(404, url.path)
+        table = self.tables.get(parts[1])
+        if table is None:
+            raise HTTPError(404, f"No table {parts[1]}")
+        if len(parts) == 2:
+            if method == "GET":
+                return 200, table.state(player)
+            if method == "DELETE":
+                self.tables.pop(table.uid)
+                METRICS.forget(table.uid)
+                table.close()
+                return 200, {"uid": table.uid, "status": "closed"}
+            raise HTTPError(405, method)
+        if len(parts) == 4 and parts[2] == "decisions" and method == "POST":
+            _answer(table, parts[3], _json_body(body).get("player"), player)
+            return 200, {"ok": True}
+        raise HTTPError(404, url.path)
+
+    # WebSocket
+    async def _websocket(self, target: str, headers: Dict[str, str], reader, writer) -> None:
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        table = self.tables.get(parts[1]) if len(parts) == 3 and parts[2] == "events" else None
+        if table is None or "sec-websocket-key" not in headers:
+            writer.write(encode_response(404, {"error": url.path}, keep_alive=False))
+            return
+        player = parse_qs(url.query).get("player", [None])[0]
+        writer.write(
+            b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            b"Sec-WebSocket-Accept: " + websocket_accept(headers["sec-websocket-key"]).encode() + b"\r\n\r\n"
+        )
+        queue = table.subscribe(player)
+        writer.write(encode_frame(json.dumps({"type": "state", **table.state(player)}).encode()))
+        sender = asyncio.ensure_future(_send_events(queue, writer))
+        try:
+            while True:
+                opcode, payload = await read_frame(reader)
+                if opcode == WS_CLOSE:
+                    break
+                if opcode == WS_PING:
+                    writer.write(encode_frame(payload, WS_PONG))
+                elif opcode == WS_TEXT:
+                    message = json.loads(payload)
+                    try:
+                        _answer(table, message.get("decision"), message.get("player"), player)
+                    except HTTPError as e:
+                        writer.write(encode_frame(json.dumps({"type": "error", "error": str(e)}).encode()))
+        finally:
+            table.unsubscribe(queue)
+            sender.cancel()
+            if not writer.is_closing():
+                writer.write(encode_frame(b"", WS_CLOSE))
+
+
+async def _send_events(queue: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+    while True:
+        event = await queue.get()
+        writer.write(encode_frame(json.dumps(event).encode()))
+        if queue.empty():
+            await writer.drain()
+
+
+def _answer(table: GameTable, decision_id, name: Optional[str], player: Optional[str]) -> None:
+    pending = table.pending
+    if pending is not None and not _visible(pending.author, player):
+        raise HTTPError(409, "This decision belongs to another player")
+    try:
+        table.answer(int(decision_id), name)
+    except KeyError as e:
+        raise HTTPError(409, e.args[0])
+    except (TypeError, ValueError) as e:
+        raise HTTPError(400, str(e))
+
+
+def _json_body(body: bytes) -> dict:
+    try:
+        data = json.loads(body or b"{}")
+    except ValueError:
+        raise HTTPError(400, "Invalid JSON body")
+    if not isinstance(data, dict):
+        raise HTTPError(400, "Expected a JSON object")
+    return data
+
+
+# Minimal HTTP/1.1 and WebSocket (RFC 6455) framing, shared with the load test client
+async def read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    """Read one request: (method, target, lowercase headers, body), or None on EOF."""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    method, target, _ = line.decode("latin-1").split(" ", 2)
+    headers = await read_headers(reader)
+    body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return method, target, headers, body
+
+
+async def read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+def encode_response(status: int, payload: object, keep_alive: bool = True) -> bytes:
+    """JSON response, or plain text (Prometheus exposition format) for a string payload."""
+    if isinstance(payload, str):
+        body, content_type = payload.encode(), "text/plain; version=0.0.4"
+    else:
+        body, content_type = json.dumps(payload).encode(), "application/json"
+    head = (
+        f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+        f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode() + body
+
+
+def websocket_accept(key: str) -> str:
+    return base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+
+
+def encode_frame(payload: bytes, opcode: int = WS_TEXT, mask: Optional[bytes] = None) -> bytes:
+    """One final frame; clients must pass a 4-byte `mask`, servers send unmasked frames."""
+    size = len(payload)
+    mask_bit = 0x80 if mask else 0
+    if size < 126:
+        head = struct.pack("!BB", 0x80 | opcode, mask_bit | size)
+    elif size < 1 << 16:
+        head = struct.pack("!BBH", 0x80 | opcode, mask_bit | 126, size)
+    else:
+        head = struct.pack("!BBQ", 0x80 | opcode, mask_bit | 127, size)
+    if mask:
+        return head + mask + _unmask(payload, mask)
+    return head + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    """Read one frame: (opcode, unmasked payload)."""
+    first, second = await reader.readexactly(2)
+    size = second & 0x7F
+    if size == 126:
+        (size,) = struct.unpack("!H", await reader.readexactly(2))
+    elif size == 127:
+        (size,) = struct.unpack("!Q", await reader.readexactly(8))
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(size)
+    return first & 0x0F, _unmask(payload, mask) if mask else payload
+
+
+def _unmask(payload: bytes, mask: bytes) -> bytes:
+    key = int.from_bytes((mask * (len(payload) // 4 + 1))[: len(payload)], "big")
+    return (int.from_bytes(payload, "big") ^ key).to_bytes(len(payload), "big")
+
+
+async def serve(host: str, port: int, max_tables: int, engine_workers: int, finished_ttl: float) -> None:
+    server = TableServer(max_tables, engine_workers, finished_ttl)
+    await server.start(host, port)
+    click.echo(click.style(f"🎲 Serving tables on http://{host}:{server.port}", fg="green"))
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", type=int, default=DEFAULT_PORT, show_default=True)
+@click.option("--max-tables", type=int, default=DEFAULT_MAX_TABLES, show_default=True)
+@click.option("--engine-workers", type=int, default=DEFAULT_ENGINE_WORKERS, show_default=True, help="Threads replaying the engines.")
+@click.option("--finished-ttl", type=float, default=DEFAULT_FINISHED_TTL, show_default=True, help="Seconds a finished table is kept.")
+@click.option("--metrics", is_flag=True, help="Time decisions (served on GET /metrics).")
+def main(host, port, max_tables, engine_workers, finished_ttl, metrics):
+    """🎲 Host many concurrent game tables in one process."""
+    if metrics:
+        METRICS.enable()
+    try:
+        asyncio.run(serve(host, port, max_tables, engine_workers, finished_ttl))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+CLI to pack a folder of WAV files into a sound bank
+"""
+import click
+from ..services.ambiance.soundbank import DEFAULT_CHANNELS, DEFAULT_SAMPLE_RATE, SoundBank, build_bank
+
+
+@click.command()
+@click.argument("source", type=click.Path(exists=True, file_okay=False))
+@click.argument("output", type=click.Path(dir_okay=False))
+@click.option("--rate", type=int, default=DEFAULT_SAMPLE_RATE, show_default=True, help="Sample rate of the bank.")
+@click.option("--channels", type=int, default=DEFAULT_CHANNELS, show_default=True)
+def soundbank(source, output, rate, channels):
+    """🔊 Decode every WAV under SOURCE (cue name = relative path, e.g. state/loup_garou) into OUTPUT."""
+    cues = build_bank(source, output, sample_rate=rate, channels=channels)
+    with SoundBank(output) as bank:
+        for name in cues:
+            click.echo(f"  {name}: {bank.duration(name):.2f}s")
+    click.echo(click.style(f"✅ {len(cues)} cues packed into {output}", fg="green"))
+
+
+if __name__ == "__main__":
+    soundbank()
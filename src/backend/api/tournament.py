@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+CLI to play bot tournaments between strategies and stream every game to a CSV file
+"""
+import time
+import click
+from ..core.bots import STRATEGIES
+from ..core.lineup_catalog import lineups_for
+from ..core.role_distributor import _format_role_distribution
+from ..core.tournament import run_tournament
+
+
+@click.command()
+@click.option("--players", type=int, multiple=True, default=(10,), show_default=True, help="Table sizes (every lineup of each).")
+@click.option("--strategy", "strategies", multiple=True, type=click.Choice(list(STRATEGIES)), help="Bot strategies (default: all).")
+@click.option("--games", type=int, default=1000, show_default=True, help="Games per lineup and strategy.")
+@click.option("--workers", type=int, default=None, help="Worker processes (default: all cores).")
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--output", type=click.Path(dir_okay=False), default="tournament.csv", show_default=True, help="CSV file receiving one row per game.")
+def tournament(players, strategies, games, workers, seed, output):
+    """🤖 Play every lineup with every bot strategy and compare their win rates."""
+    lineups = [lineup for num_players in players for lineup in lineups_for(num_players)]
+    chosen = [STRATEGIES[name] for name in strategies or STRATEGIES]
+    start = time.perf_counter()
+    stats = run_tournament(lineups, chosen, games, output, workers=workers, seed=seed)
+    elapsed = time.perf_counter() - start
+
+    for index, lineup in enumerate(lineups):
+        click.echo(click.style(f"\nLineup {index} ({sum(lineup.values())} players): {_format_role_distribution(lineup)}", bold=True))
+        for strategy in chosen:
+            pair = stats.pairs[(index, strategy.name)]
+            click.echo(f"  {strategy.name:<16} {pair.result.summary()}  ({pair.mean_rounds:.1f} rounds)")
+
+    total = sum(pair.result.games for pair in stats.pairs.values())
+    click.echo(click.style(f"\n✅ {total} games in {elapsed:.1f}s, written to {output}", fg="green"))
+
+
+if __name__ == "__main__":
+    tournament()
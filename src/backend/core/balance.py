@@ -0,0 +1,189 @@
+"""
+Monte Carlo balance evaluation of the lineups in `ROLE_DISTRIBUTIONS`.
+
+Each lineup is played N times with random decisions on a process pool; the
+per-camp win rates (with Wilson confidence intervals) are cached on disk,
+keyed by a hash of the lineup table, so `set_lineup` can display them
+without simulating at game start.
+"""
+import hashlib
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from random import Random
+from typing import Dict, List, Optional, Tuple
+
+from .decisions import SimulationProvider
+from .game import Camp, Game
+from .phases import play_game
+from .role_distributor import Role, ROLE_DISTRIBUTIONS
+
+BALANCE_CACHE_VERSION = 1
+DEFAULT_GAMES = 2000
+CHUNK_SIZE = 250
+NOBODY = "nobody"
+OUTCOMES = [Camp.VILLAGEOIS.value, Camp.LOUP_GAROU.value, Camp.AMOUREUX.value, NOBODY]
+
+LineupTable = Dict[int, List[Dict[Role, int]]]
+
+
+def default_cache_dir() -> Path:
+    """Directory holding the balance cache (`WEREWOLVES_CACHE_DIR` overrides it)."""
+    env = os.environ.get("WEREWOLVES_CACHE_DIR")
+    if env:
+        return Path(env)
+    return Path.home() / ".cache" / "werewolves-ambiance"
+
+
+@dataclass
+class BalanceResult:
+    """Measured outcome counts of one lineup."""
+
+    games: int = 0
+    wins: Dict[str, int] = field(default_factory=lambda: {o: 0 for o in OUTCOMES})
+
+    def win_rate(self, outcome: str) -> float:
+        return self.wins.get(outcome, 0) / self.games if self.games else 0.0
+
+    def confidence_interval(self, outcome: str, z: float = 1.96) -> Tuple[float, float]:
+        """Wilson score interval of the win rate of `outcome`."""
+        if not self.games:
+            return 0.0, 1.0
+        n = self.games
+        p = self.win_rate(outcome)
+        denominator = 1 + z * z / n
+        centre = (p + z * z / (2 * n)) / denominator
+        margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+        return max(0.0, centre - margin), min(1.0, centre + margin)
+
+    def summary(self) -> str:
+        """Short label for the lineup menu, e.g. `👥 48% ±2 | 🐺 50% ±2`."""
+        icons = {
+            Camp.VILLAGEOIS.value: "👥",
+            Camp.LOUP_GAROU.value: "🐺",
+            Camp.AMOUREUX.value: "💕",
+        }
+        parts = []
+        for outcome, icon in icons.items():
+            if outcome == Camp.AMOUREUX.value and not self.wins.get(outcome):
+                continue
+            low, high = self.confidence_interval(outcome)
+            parts.append(f"{icon} {self.win_rate(outcome):.0%} ±{(high - low) / 2 * 100:.0f}")
+        return " | ".join(parts)
+
+
+def lineup_table_hash(distributions: LineupTable = ROLE_DISTRIBUTIONS) -> str:
+    """Stable hash of a lineup table (order of roles inside a lineup does not matter)."""
+    canonical = {
+        str(num_players): [
+            sorted((role.value, count) for role, count in variant.items())
+            for variant in variants
+        ]
+        for num_players, variants in sorted(distributions.items())
+    }
+    payload = json.dumps([BALANCE_CACHE_VERSION, canonical], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def play_random_game(lineup: Dict[Role, int], rng: Random) -> Game:
+    """Play one headless game of `lineup` with random decisions drawn from `rng`."""
+    game = Game.headless(lineup, SimulationProvider(rng=rng), rng)
+    play_game(game)
+    return game
+
+
+def simulate_lineup(lineup: Dict[Role, int], games: int, seed: int = 0) -> Dict[str, int]:
+    """Play `games` random games of `lineup` and count the winners."""
+    rng = Random(seed)
+    wins = {o: 0 for o in OUTCOMES}
+    for _ in range(games):
+        game = play_random_game(lineup, rng)
+        wins[game.winner.value if game.winner else NOBODY] += 1
+    return wins
+
+
+def _simulate_chunk(task: Tuple[int, int, List[Tuple[str, int]], int, int]) -> Tuple[int, int, Dict[str, int]]:
+    num_players, index, items, games, seed = task
+    lineup = {Role(role): count for role, count in items}
+    return num_players, index, simulate_lineup(lineup, games, seed)
+
+
+def evaluate_distributions(
+    distributions: LineupTable = ROLE_DISTRIBUTIONS,
+    games: int = DEFAULT_GAMES,
+    workers: Optional[int] = None,
+    seed: int = 0,
+) -> Dict[int, List[BalanceResult]]:
+    """Simulate every lineup of `distributions` on a process pool (all cores by default)."""
+    results = {
+        num_players: [BalanceResult() for _ in variants]
+        for num_players, variants in distributions.items()
+    }
+    tasks = []
+    for num_players, variants in sorted(distributions.items()):
+        for index, variant in enumerate(variants):
+            items = [(role.value, count) for role, count in variant.items()]
+            for start in range(0, games, CHUNK_SIZE):
+                chunk_seed = hash((seed, num_players, index, start)) & 0xFFFFFFFF
+                tasks.append((num_players, index, items, min(CHUNK_SIZE, games - start), chunk_seed))
+
+    def _merge(num_players: int, index: int, wins: Dict[str, int]) -> None:
+        result = results[num_players][index]
+        for outcome, count in wins.items():
+            result.wins[outcome] += count
+            result.games += count
+
+    if workers == 1:
+        for task in tasks:
+            _merge(*_simulate_chunk(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for outcome in pool.map(_simulate_chunk, tasks, chunksize=4):
+                _merge(*outcome)
+    return results
+
+
+def cache_path(distributions: LineupTable = ROLE_DISTRIBUTIONS, cache_dir: Optional[Path] = None) -> Path:
+    return (cache_dir or default_cache_dir()) / f"balance-{lineup_table_hash(distributions)}.json"
+
+
+def save_balance(
+    results: Dict[int, List[BalanceResult]],
+    distributions: LineupTable = ROLE_DISTRIBUTIONS,
+    cache_dir: Optional[Path] = None,
+) -> Path:
+    """Write simulation results to the on-disk cache and return its path."""
+    path = cache_path(distributions, cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "version": BALANCE_CACHE_VERSION,
+        "table_hash": lineup_table_hash(distributions),
+        "results": {
+            str(num_players): [{"games": r.games, "wins": r.wins} for r in variants]
+            for num_players, variants in results.items()
+        },
+    }
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(payload, indent=1))
+    tmp.replace(path)
+    return path
+
+
+def load_balance(
+    distributions: LineupTable = ROLE_DISTRIBUTIONS, cache_dir: Optional[Path] = None
+) -> Optional[Dict[int, List[BalanceResult]]]:
+    """Return cached results for this exact lineup table, or None if never simulated."""
+    path = cache_path(distributions, cache_dir)
+    try:
+        payload = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    if payload.get("version") != BALANCE_CACHE_VERSION:
+        return None
+    return {
+        int(num_players): [BalanceResult(games=r["games"], wins=r["wins"]) for r in variants]
+        for num_players, variants in payload["results"].items()
+    }
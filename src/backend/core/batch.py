@@ -0,0 +1,282 @@
+"""
+Vectorized batch simulator: B games stored as NumPy arrays (struct of arrays).
+
+Follows the rules of `first_night_process` / `process_night` / `process_day`
+with the same random policy as `decisions.SimulationProvider` (uniform picks,
+wolves spare wolves, Sorcière potions used with probability 1 - pass_rate),
+so its win rates match `balance.simulate_lineup` statistically.
+"""
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+
+from .game import Camp, Game
+from .role_distributor import Role
+from .roles import Chasseur, Cupidon, Sorciere
+
+ROLE_CODES: Dict[Role, int] = {role: code for code, role in enumerate(Role)}
+CAMPS: List[Camp] = list(Camp)
+CAMP_CODES: Dict[Camp, int] = {camp: code for code, camp in enumerate(CAMPS)}
+NOBODY = len(CAMPS)
+RUNNING = -1
+NO_PLAYER = -1
+
+LOUP_GAROU = ROLE_CODES[Role.LOUP_GAROU]
+SORCIERE = ROLE_CODES[Role.SORCIERE]
+CHASSEUR = ROLE_CODES[Role.CHASSEUR]
+CUPIDON = ROLE_CODES[Role.CUPIDON]
+UNSUPPORTED_ROLES = {Role.VOLEUR}
+
+
+@dataclass
+class BatchGames:
+    """State of B games of N players; every per-player array has shape (B, N)."""
+
+    alive: np.ndarray  # bool (B, N)
+    roles: np.ndarray  # int8 (B, N), codes from ROLE_CODES
+    lovers: np.ndarray  # int16 (B, N), NO_PLAYER if single
+    mayor: np.ndarray  # int16 (B,), NO_PLAYER if none
+    heal_left: np.ndarray  # bool (B,), Sorcière healing potion
+    poison_left: np.ndarray  # bool (B,), Sorcière poison potion
+    revenge_done: np.ndarray  # bool (B,), Chasseur already shot
+    lovers_chosen: np.ndarray  # bool (B,), Cupidon already acted
+    winner: np.ndarray  # int8 (B,), RUNNING, a CAMP_CODES value or NOBODY
+    rounds: np.ndarray  # int16 (B,), round_number when the game ended
+
+    @property
+    def batch(self) -> int:
+        return self.alive.shape[0]
+
+    @classmethod
+    def from_lineup(cls, lineup: Dict[Role, int], batch: int, rng: np.random.Generator) -> "BatchGames":
+        """Create `batch` fresh games of `lineup`, each with an independently shuffled role order."""
+        unsupported = UNSUPPORTED_ROLES.intersection(r for r, c in lineup.items() if c)
+        if unsupported:
+            raise ValueError(f"Batch engine does not support {sorted(r.value for r in unsupported)}")
+        codes = np.array(
+            [ROLE_CODES[role] for role, count in lineup.items() for _ in range(count)], dtype=np.int8
+        )
+        roles = rng.permuted(np.broadcast_to(codes, (batch, codes.size)), axis=1)
+        return cls._blank(roles)
+
+    @classmethod
+    def from_games(cls, games: List[Game]) -> "BatchGames":
+        """Load object games (same player count) into a batch, e.g. to cross-check both engines."""
+        state = cls._blank(
+            np.array([[ROLE_CODES[p.role] for p in g.players] for g in games], dtype=np.int8)
+        )
+        for b, game in enumerate(games):
+            index = {id(p): i for i, p in enumerate(game.players)}
+            for i, player in enumerate(game.players):
+                state.alive[b, i] = player.alive
+                if player.lover is not None:
+                    state.lovers[b, i] = index[id(player.lover)]
+                if player.is_mayor:
+                    state.mayor[b] = i
+                if isinstance(player, Sorciere):
+                    state.heal_left[b] = not player.potion_soin_utilisee
+                    state.poison_left[b] = not player.potion_poison_utilisee
+                elif isinstance(player, Chasseur):
+                    state.revenge_done[b] = player.revenge_target is not None
+                elif isinstance(player, Cupidon):
+                    state.lovers_chosen[b] = bool(player.lovers_chosen)
+        return state
+
+    @classmethod
+    def _blank(cls, roles: np.ndarray) -> "BatchGames":
+        batch, size = roles.shape
+        return cls(
+            alive=np.ones((batch, size), dtype=bool),
+            roles=np.ascontiguousarray(roles, dtype=np.int8),
+            lovers=np.full((batch, size), NO_PLAYER, dtype=np.int16),
+            mayor=np.full(batch, NO_PLAYER, dtype=np.int16),
+            heal_left=np.ones(batch, dtype=bool),
+            poison_left=np.ones(batch, dtype=bool),
+            revenge_done=np.zeros(batch, dtype=bool),
+            lovers_chosen=np.zeros(batch, dtype=bool),
+            winner=np.full(batch, RUNNING, dtype=np.int8),
+            rounds=np.zeros(batch, dtype=np.int16),
+        )
+
+    def camps(self) -> np.ndarray:
+        """Camp code of every player, with the lover XOR rule of `Player.camp`."""
+        is_wolf = self.roles == LOUP_GAROU
+        has_lover = self.lovers != NO_PLAYER
+        lover_is_wolf = np.take_along_axis(is_wolf, np.where(has_lover, self.lovers, 0), axis=1)
+        camps = np.where(is_wolf, CAMP_CODES[Camp.LOUP_GAROU], CAMP_CODES[Camp.VILLAGEOIS])
+        return np.where(has_lover & (is_wolf != lover_is_wolf), CAMP_CODES[Camp.AMOUREUX], camps)
+
+    def kill(self, victims: np.ndarray) -> None:
+        """Kill `victims[b]` in every game (NO_PLAYER skips); lovers die with them."""
+        games = np.nonzero(victims != NO_PLAYER)[0]
+        players = victims[games]
+        self.alive[games, players] = False
+        lovers = self.lovers[games, players]
+        bound = lovers != NO_PLAYER
+        self.alive[games[bound], lovers[bound]] = False
+
+    def check_over(self, active: np.ndarray) -> np.ndarray:
+        """Batched `Game.is_over`: set `winner` for finished games among `active`, return their mask."""
+        camps = self.camps()
+        counts = np.stack(
+            [((camps == code) & self.alive).sum(axis=1) for code in range(len(CAMPS))], axis=1
+        )
+        present = counts > 0
+        nobody = ~self.alive.any(axis=1)
+        single = present.sum(axis=1) == 1
+        over = active & (nobody | single)
+        self.winner[over] = np.where(nobody[over], NOBODY, present[over].argmax(axis=1))
+        return over
+
+    def role_index(self, code: int) -> np.ndarray:
+        """Index of the first player holding role `code` in each game (NO_PLAYER if none)."""
+        holders = self.roles == code
+        return np.where(holders.any(axis=1), holders.argmax(axis=1), NO_PLAYER)
+
+
+class BatchSimulator:
+    """Plays every game of a `BatchGames` to the end with random decisions."""
+
+    def __init__(self, state: BatchGames, rng: np.random.Generator, pass_rate: float = 0.5) -> None:
+        self.state = state
+        self.rng = rng
+        self.pass_rate = pass_rate
+        self.recently_killed = np.full(state.batch, NO_PLAYER, dtype=np.int16)
+        present = {int(code) for code in np.unique(state.roles)}
+        self.has_cupidon = CUPIDON in present
+        self.has_sorciere = SORCIERE in present
+        self.has_chasseur = CHASSEUR in present
+
+    def _pick(self, eligible: np.ndarray) -> np.ndarray:
+        """Uniform pick among `eligible` players per game; NO_PLAYER where nobody is eligible."""
+        keys = self.rng.random(eligible.shape)
+        keys[~eligible] = -1.0
+        return np.where(eligible.any(axis=1), keys.argmax(axis=1), NO_PLAYER).astype(np.int16)
+
+    def _uses(self, wanted: np.ndarray) -> np.ndarray:
+        """Games among `wanted` where an optional action is not passed."""
+        return wanted & (self.rng.random(wanted.shape) >= self.pass_rate)
+
+    def _columns(self) -> np.ndarray:
+        return np.arange(self.state.alive.shape[1])
+
+    def cupidon(self, active: np.ndarray) -> None:
+        s = self.state
+        todo = active & ~s.lovers_chosen
+        first = self._pick(s.alive & todo[:, None])
+        second = self._pick(s.alive & (self._columns() != first[:, None]) & (first != NO_PLAYER)[:, None])
+        games = np.nonzero(second != NO_PLAYER)[0]
+        s.lovers[games, first[games]] = second[games]
+        s.lovers[games, second[games]] = first[games]
+        s.lovers_chosen[games] = True
+
+    def wolves(self, active: np.ndarray) -> None:
+        s = self.state
+        prey = s.alive & (s.roles != LOUP_GAROU)
+        eligible = np.where(prey.any(axis=1)[:, None], prey, s.alive) & active[:, None]
+        victims = self._pick(eligible)
+        self.recently_killed = np.where(active, victims, self.recently_killed)
+        s.kill(victims)
+
+    def sorciere(self, active: np.ndarray) -> None:
+        s = self.state
+        games = np.arange(s.batch)
+        victim = self.recently_killed
+        victim_dead = (victim != NO_PLAYER) & ~s.alive[games, np.maximum(victim, 0)]
+        healed = self._uses(active & s.heal_left & victim_dead)
+        s.alive[games[healed], victim[healed]] = True
+        s.heal_left[healed] = False
+
+        poisoned = self._uses(active & s.poison_left & s.alive.any(axis=1))
+        targets = self._pick(s.alive & poisoned[:, None])
+        s.kill(targets)
+        s.poison_left[poisoned] = False
+
+    def _succession(self, games: np.ndarray, previous: np.ndarray) -> None:
+        """Dead mayor `previous` appoints an alive successor in `games`."""
+        s = self.state
+        successor = self._pick(s.alive & games[:, None] & (self._columns() != previous[:, None]))
+        s.mayor[games] = successor[games]
+
+    def day(self, active: np.ndarray) -> None:
+        s = self.state
+        games = np.arange(s.batch)
+        columns = self._columns()
+
+        # 0. Dead Chasseur takes someone with them
+        if self.has_chasseur:
+            hunter = s.role_index(CHASSEUR)
+            owed = active & (hunter != NO_PLAYER) & ~s.revenge_done
+            owed &= ~s.alive[games, np.maximum(hunter, 0)]
+            targets = self._pick(s.alive & owed[:, None] & (columns != hunter[:, None]))
+            s.kill(targets)
+            s.revenge_done |= targets != NO_PLAYER
+
+        # 1. Dead mayor nominates a successor
+        has_mayor = s.mayor != NO_PLAYER
+        dead_mayor = active & has_mayor & ~s.alive[games, np.maximum(s.mayor, 0)]
+        self._succession(dead_mayor, s.mayor.copy())
+
+        # 2. Election when there is no mayor
+        electing = active & (s.mayor == NO_PLAYER)
+        elected = self._pick(s.alive & electing[:, None])
+        s.mayor[electing] = elected[electing]
+
+        # 3. Village vote
+        eliminated = self._pick(s.alive & active[:, None])
+        was_mayor = (eliminated != NO_PLAYER) & (eliminated == s.mayor)
+        s.kill(eliminated)
+
+        # 4. Eliminated mayor nominates a successor right away (only if someone is left)
+        self._succession(was_mayor & s.alive.any(axis=1), eliminated)
+
+    def first_night(self, active: np.ndarray) -> None:
+        if self.has_cupidon:
+            self.cupidon(active)
+        self.wolves(active)
+        if self.has_sorciere:
+            self.sorciere(active)
+
+    def night(self, active: np.ndarray) -> None:
+        self.recently_killed = np.where(active, NO_PLAYER, self.recently_killed).astype(np.int16)
+        if self.has_cupidon:
+            self.cupidon(active & ~self.state.lovers_chosen)
+        self.wolves(active)
+        if self.has_sorciere:
+            self.sorciere(active)
+
+    def run(self) -> BatchGames:
+        """Play the same loop as `play_game` for every game until all are over."""
+        s = self.state
+        active = s.winner == RUNNING
+        round_number = 1
+        self.first_night(active)
+        while True:
+            active &= ~self.check_over(active, round_number)
+            if not active.any():
+                break
+            self.day(active)
+            active &= ~self.check_over(active, round_number)
+            if not active.any():
+                break
+            self.night(active)
+            round_number += 1
+        return s
+
+    def check_over(self, active: np.ndarray, round_number: int) -> np.ndarray:
+        over = self.state.check_over(active)
+        self.state.rounds[over] = round_number
+        return over
+
+
+def simulate_lineup_batch(
+    lineup: Dict[Role, int], games: int, seed: int = 0, pass_rate: float = 0.5
+) -> Dict[str, int]:
+    """Vectorized counterpart of `balance.simulate_lineup`: play `games` games and count winners."""
+    rng = np.random.default_rng(seed)
+    state = BatchSimulator(BatchGames.from_lineup(lineup, games, rng), rng, pass_rate).run()
+    counts = np.bincount(state.winner.astype(np.int64), minlength=NOBODY + 1)
+    wins = {camp.value: int(counts[code]) for camp, code in CAMP_CODES.items()}
+    wins["nobody"] = int(counts[NOBODY])
+    return wins
@@ -0,0 +1,219 @@
+"""
+Micro-benchmarks of the engine hot paths, with a stored baseline.
+
+Each benchmark is built from a seeded `Random` and timed with `timeit`
+(auto-ranged loop count, best of `repeat` short runs to filter out
+scheduler noise), so two runs on the same machine measure the same work.
+`import_core` times the imports of a headless worker in a fresh interpreter.
+Results are saved as JSON and compared with a baseline: a benchmark slower
+than the baseline by more than `threshold` (a ratio, 0.2 = 20%) is a
+regression.
+
+    results = run_suite(seed=0)
+    regressions = [c for c in compare(results, load_results(path)) if c.regressed]
+"""
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import timeit
+from dataclasses import dataclass
+from pathlib import Path
+from random import Random
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .balance import default_cache_dir
+from .decisions import Decision, RandomDecisionProvider
+from .game import Game
+from .phases import play_game
+from .role_distributor import ROLE_DISTRIBUTIONS, Role, _calculate_balance_score, _format_role_distribution
+
+BENCH_VERSION = 1
+DEFAULT_THRESHOLD = 0.2
+# Lineup of the game-level benchmarks: every role the engine plays
+LINEUP = {
+    Role.LOUP_GAROU: 3,
+    Role.VOYANTE: 1,
+    Role.SORCIERE: 1,
+    Role.CHASSEUR: 1,
+    Role.CUPIDON: 1,
+    Role.VILLAGEOIS: 3,
+}
+
+
+def _new_game(rng: Random) -> Game:
+    return Game.headless(LINEUP, RandomDecisionProvider(rng=rng), rng)
+
+
+def bench_distribute_roles(rng: Random) -> Callable[[], None]:
+    game = _new_game(rng)
+    return lambda: game.distribute_roles(rng)
+
+
+def bench_kill_lovers(rng: Random) -> Callable[[], None]:
+    game = _new_game(rng)
+    first, second = rng.sample(list(game.players), 2)
+    first.lover, second.lover = second, first
+
+    def run() -> None:
+        first.alive = second.alive = True
+        first.kill()
+
+    return run
+
+
+def bench_is_over(rng: Random) -> Callable[[], None]:
+    game = _new_game(rng)
+    for player in rng.sample(list(game.players), 3):
+        player.kill()
+    return game.is_over
+
+
+def bench_select_player(rng: Random) -> Callable[[], None]:
+    game = _new_game(rng)
+    author = game.players[0]
+    excluded = [p.name for p in rng.sample(list(game.players), 3)]
+    return lambda: game.select_player(
+        author=author,
+        alive=True,
+        can_select_self=False,
+        excluded_names=excluded,
+        decision=Decision.VOYANTE_SEE,
+    )
+
+
+def bench_lineup_labels(rng: Random) -> Callable[[], None]:
+    # The formatting part of `lineup_labels`, without the balance cache lookup
+    variants = [variant for lineups in ROLE_DISTRIBUTIONS.values() for variant in lineups]
+
+    def run() -> None:
+        for variant in variants:
+            _calculate_balance_score(variant)
+            _format_role_distribution(variant)
+
+    return run
+
+
+def bench_full_game(rng: Random) -> Callable[[], None]:
+    # Random choices from a fixed seed: the same game on every call
+    seed = rng.randrange(1 << 32)
+
+    def run() -> None:
+        play_game(_new_game(Random(seed)))
+
+    return run
+
+
+BENCHMARKS: Dict[str, Callable[[Random], Callable[[], None]]] = {
+    "distribute_roles": bench_distribute_roles,
+    "kill_lovers": bench_kill_lovers,
+    "is_over": bench_is_over,
+    "select_player": bench_select_player,
+    "lineup_labels": bench_lineup_labels,
+    "full_game": bench_full_game,
+}
+
+# Modules a headless worker imports to play games
+STARTUP_MODULES = ("src.backend.core", "src.backend.core.phases")
+STARTUP_BENCHMARKS: Dict[str, Tuple[str, ...]] = {"import_core": STARTUP_MODULES}
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+
+def import_time(modules: Iterable[str] = STARTUP_MODULES, runs: int = 5) -> float:
+    """Best time to import `modules` in a fresh interpreter (interpreter startup excluded)."""
+    imports = "; ".join(f"import {module}" for module in modules)
+    code = f"import time; start = time.perf_counter(); {imports}; print(time.perf_counter() - start)"
+    best = math.inf
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        best = min(best, float(out))
+    return best
+
+
+@dataclass
+class BenchResult:
+    name: str
+    # Best time of one call, in seconds
+    seconds: float
+    # Calls per timed run
+    number: int
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline: float
+    current: float
+    threshold: float = DEFAULT_THRESHOLD
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+    @property
+    def regressed(self) -> bool:
+        return self.ratio > 1 + self.threshold
+
+
+def run_suite(
+    names: Optional[Iterable[str]] = None, seed: int = 0, repeat: int = 10, min_time: float = 0.05
+) -> Dict[str, BenchResult]:
+    """Time the given benchmarks (all by default); each one gets its own `Random(seed)`."""
+    results = {}
+    for name in names or [*BENCHMARKS, *STARTUP_BENCHMARKS]:
+        if name in STARTUP_BENCHMARKS:
+            results[name] = BenchResult(name, import_time(STARTUP_BENCHMARKS[name], repeat), 1)
+            continue
+        run = BENCHMARKS[name](Random(seed))
+        timer = timeit.Timer(run)
+        number = 1
+        # Like Timer.autorange, up to `min_time` per timed run
+        while timer.timeit(number) < min_time and number < 1 << 20:
+            number *= 2
+        best = min(timer.repeat(repeat, number))
+        results[name] = BenchResult(name, best / number, number)
+    return results
+
+
+def compare(
+    results: Dict[str, BenchResult], baseline: Dict[str, BenchResult], threshold: float = DEFAULT_THRESHOLD
+) -> List[Comparison]:
+    """Comparison of every benchmark present in both runs."""
+    return [
+        Comparison(name, baseline[name].seconds, result.seconds, threshold)
+        for name, result in results.items()
+        if name in baseline
+    ]
+
+
+def default_results_path() -> Path:
+    return default_cache_dir() / "benchmarks.json"
+
+
+def save_results(results: Dict[str, BenchResult], path: Union[str, os.PathLike], seed: int = 0) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "version": BENCH_VERSION,
+        "seed": seed,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": {name: {"seconds": r.seconds, "number": r.number} for name, r in results.items()},
+    }
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+    return path
+
+
+def load_results(path: Union[str, os.PathLike]) -> Optional[Dict[str, BenchResult]]:
+    """Results saved by `save_results`, or None when missing or of another version."""
+    try:
+        payload = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return None
+    if payload.get("version") != BENCH_VERSION:
+        return None
+    return {name: BenchResult(name, r["seconds"], r["number"]) for name, r in payload["results"].items()}
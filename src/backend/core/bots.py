@@ -0,0 +1,157 @@
+"""
+Bot strategies: pluggable policies for the decisions of headless games.
+
+A policy answers one kind of decision; a `Strategy` names the policy used
+for each of them (wolf kill, Voyante target, Sorcière heal and poison,
+village vote) and `BotProvider` plays it, falling back to uniform random
+choices for everything else. Policies only use what the deciding players
+could know: the wolves know each other, the mayor and revealed roles are
+public, the Voyante knows the players she saw.
+
+    provider = BotProvider(STRATEGIES["seer_guided"], Random(0))
+
+Register a new policy by adding it to `POLICIES[decision]`.
+"""
+from dataclasses import dataclass, fields
+from random import Random
+from typing import Callable, Dict, List, Optional, TYPE_CHECKING
+
+from .decisions import Decision, RandomDecisionProvider
+from .role_distributor import Role
+
+if TYPE_CHECKING:
+    from .game import Game, Player
+
+# (game, candidates, author, rng) -> chosen player, or None to pass
+Policy = Callable[["Game", List["Player"], Optional["Player"], Random], Optional["Player"]]
+
+
+def uniform(game: "Game", candidates: List["Player"], author: Optional["Player"], rng: Random) -> Optional["Player"]:
+    return rng.choice(candidates)
+
+
+def coin_flip(game: "Game", candidates: List["Player"], author: Optional["Player"], rng: Random) -> Optional["Player"]:
+    """Pass half of the time (the policy of `RandomDecisionProvider`)."""
+    return None if rng.random() < 0.5 else rng.choice(candidates)
+
+
+def never(game: "Game", candidates: List["Player"], author: Optional["Player"], rng: Random) -> Optional["Player"]:
+    return None
+
+
+def spare_wolves(game: "Game", candidates: List["Player"], author: Optional["Player"], rng: Random) -> Optional["Player"]:
+    """Wolves never eat one of their own (the policy of the balance simulations)."""
+    prey = [p for p in candidates if p.role != Role.LOUP_GAROU]
+    return rng.choice(prey or candidates)
+
+
+def mayor_first(game: "Game", candidates: List["Player"], author: Optional["Player"], rng: Random) -> Optional["Player"]:
+    """The mayor when they can be picked (and are not a wolf), otherwise any non-wolf."""
+    for player in candidates:
+        if player.is_mayor and player.role != Role.LOUP_GAROU:
+            return player
+    return spare_wolves(game, candidates, author, rng)
+
+
+def unseen(game: "Game", candidates: List["Player"], author: Optional["Player"], rng: Random) -> Optional["Player"]:
+    """Any player the Voyante has not seen yet and whose role is not public."""
+    seen = getattr(author, "investigations", {})
+    unknown = [p for p in candidates if p.name not in seen and not p.is_revealed]
+    return rng.choice(unknown or candidates)
+
+
+def late_poison(game: "Game", candidates: List["Player"], author: Optional["Player"], rng: Random) -> Optional["Player"]:
+    """Keep the poison until half of the village is dead, then use it on someone else."""
+    if len(candidates) * 2 > len(game.players):
+        return None
+    others = [p for p in candidates if p is not author]
+    return rng.choice(others or candidates)
+
+
+def seer_guided(game: "Game", candidates: List["Player"], author: Optional["Player"], rng: Random) -> Optional["Player"]:
+    """The village follows the Voyante while she is alive: vote for a wolf she saw, else for someone she did not clear."""
+    voyante = game.players.first_with_role(Role.VOYANTE)
+    if voyante is not None and voyante.alive:
+        seen = [p for p in candidates if voyante.investigations.get(p.name) == Role.LOUP_GAROU]
+        if seen:
+            return rng.choice(seen)
+        suspects = [p for p in candidates if p is not voyante and p.name not in voyante.investigations]
+        return rng.choice(suspects or candidates)
+    return rng.choice(candidates)
+
+
+POLICIES: Dict[Decision, Dict[str, Policy]] = {
+    Decision.WOLF_KILL: {"random": uniform, "spare_wolves": spare_wolves, "mayor_first": mayor_first},
+    Decision.VOYANTE_SEE: {"random": uniform, "unseen": unseen},
+    Decision.SORCIERE_HEAL: {"random": coin_flip, "always": uniform, "never": never},
+    Decision.SORCIERE_POISON: {"random": coin_flip, "never": never, "late": late_poison},
+    Decision.VILLAGE_VOTE: {"random": uniform, "seer_guided": seer_guided},
+}
+
+
+@dataclass(frozen=True)
+class Strategy:
+    """Names of the policies of one bot strategy (keys of `POLICIES`)."""
+
+    name: str
+    wolf: str = "spare_wolves"
+    voyante: str = "random"
+    heal: str = "random"
+    poison: str = "random"
+    vote: str = "random"
+
+    def policies(self) -> Dict[Decision, Policy]:
+        """Policy per decision (raises ValueError for an unknown policy name)."""
+        decisions = {
+            "wolf": Decision.WOLF_KILL,
+            "voyante": Decision.VOYANTE_SEE,
+            "heal": Decision.SORCIERE_HEAL,
+            "poison": Decision.SORCIERE_POISON,
+            "vote": Decision.VILLAGE_VOTE,
+        }
+        policies = {}
+        for f in fields(self):
+            if f.name == "name":
+                continue
+            decision, policy = decisions[f.name], getattr(self, f.name)
+            if policy not in POLICIES[decision]:
+                raise ValueError(f"Unknown {f.name} policy {policy!r} (one of {', '.join(POLICIES[decision])})")
+            policies[decision] = POLICIES[decision][policy]
+        return policies
+
+
+STRATEGIES: Dict[str, Strategy] = {
+    strategy.name: strategy
+    for strategy in (
+        # Same choices as the balance simulations
+        Strategy("random"),
+        Strategy("hunting_wolves", wolf="mayor_first"),
+        Strategy("careful_witch", heal="always", poison="late"),
+        Strategy("seer_guided", voyante="unseen", vote="seer_guided"),
+    )
+}
+
+
+class BotProvider(RandomDecisionProvider):
+    """Answers decisions with the policies of `strategy`, uniformly at random otherwise."""
+
+    def __init__(self, strategy: Strategy, rng: Random) -> None:
+        super().__init__(rng=rng)
+        self.strategy = strategy
+        self._policies = strategy.policies()
+
+    def select_player(
+        self,
+        game: "Game",
+        candidates: List["Player"],
+        author: Optional["Player"] = None,
+        decision: Optional[Decision] = None,
+        can_select_none: bool = False,
+    ) -> Optional["Player"]:
+        policy = self._policies.get(decision)
+        if policy is None:
+            return super().select_player(game, candidates, author, decision, can_select_none)
+        choice = policy(game, candidates, author, self.rng)
+        if choice is None and not can_select_none:
+            choice = self.rng.choice(candidates)
+        return choice
@@ -0,0 +1,145 @@
+"""
+Decision providers: where every choice made during a game comes from.
+
+The engine never prompts directly; it asks its `DecisionProvider`. The
+interactive terminal provider lives with the CLI (`api/prompts.py`), the
+headless ones below are used by tests, simulations and servers.
+"""
+from enum import Enum
+from random import Random
+from typing import Dict, Iterable, List, Optional, TYPE_CHECKING
+
+from .role_distributor import Role
+
+if TYPE_CHECKING:
+    from .game import Game, Player
+
+
+class Decision(Enum):
+    """Kinds of player selection the engine can ask for."""
+
+    MAYOR_ELECTION = "mayor_election"
+    MAYOR_SUCCESSION = "mayor_succession"
+    VILLAGE_VOTE = "village_vote"
+    WOLF_KILL = "wolf_kill"
+    SORCIERE_HEAL = "sorciere_heal"
+    SORCIERE_POISON = "sorciere_poison"
+    VOYANTE_SEE = "voyante_see"
+    CUPIDON_LOVERS = "cupidon_lovers"
+    VOLEUR_STEAL = "voleur_steal"
+    CHASSEUR_REVENGE = "chasseur_revenge"
+
+
+class DecisionProvider:
+    """Base provider: answers every decision with its default and stays silent."""
+
+    # Whether the engine should format display-only output (player lists, game state)
+    verbose = False
+
+    def notify(self, message: str, **style) -> None:
+        """Receive a message meant for the game master (no-op by default)."""
+
+    def choose_num_players(self, choices: List[int], default: int) -> Optional[int]:
+        """Return the number of players, or None to cancel."""
+        return default
+
+    def choose_player_name(self, index: int, default: str) -> Optional[str]:
+        """Return the name of player `index` (0-based), or None to cancel."""
+        return default
+
+    def choose_lineup(self, num_players: int, variants: List[Dict[Role, int]]) -> Optional[int]:
+        """Return the index of the selected lineup in `variants`, or None for the default."""
+        return 0
+
+    def select_player(
+        self,
+        game: "Game",
+        candidates: List["Player"],
+        author: Optional["Player"] = None,
+        decision: Optional[Decision] = None,
+        can_select_none: bool = False,
+    ) -> Optional["Player"]:
+        """Return one of `candidates` (never empty), or None when allowed."""
+        raise NotImplementedError
+
+
+class ScriptedDecisionProvider(DecisionProvider):
+    """Replays a fixed list of answers (player names, or None to pass)."""
+
+    def __init__(
+        self,
+        answers: Iterable[Optional[str]] = (),
+        lineup: int = 0,
+        names: Optional[List[str]] = None,
+    ) -> None:
+        self.answers = list(answers)
+        self.lineup = lineup
+        self.names = names
+
+    def choose_player_name(self, index: int, default: str) -> Optional[str]:
+        if self.names is not None and index < len(self.names):
+            return self.names[index]
+        return default
+
+    def choose_lineup(self, num_players: int, variants: List[Dict[Role, int]]) -> Optional[int]:
+        return self.lineup
+
+    def select_player(
+        self,
+        game: "Game",
+        candidates: List["Player"],
+        author: Optional["Player"] = None,
+        decision: Optional[Decision] = None,
+        can_select_none: bool = False,
+    ) -> Optional["Player"]:
+        if not self.answers:
+            raise LookupError(f"Script exhausted at decision {decision}")
+        name = self.answers.pop(0)
+        if name is None:
+            return None
+        for player in candidates:
+            if player.name == name:
+                return player
+        raise ValueError(f"Scripted choice {name!r} is not a valid candidate for {decision}")
+
+
+class RandomDecisionProvider(DecisionProvider):
+    """Picks uniformly among candidates; passes with probability `pass_rate` when allowed."""
+
+    def __init__(
+        self, seed: Optional[int] = None, pass_rate: float = 0.5, rng: Optional[Random] = None
+    ) -> None:
+        self.rng = rng if rng is not None else Random(seed)
+        self.pass_rate = pass_rate
+
+    def choose_lineup(self, num_players: int, variants: List[Dict[Role, int]]) -> Optional[int]:
+        return self.rng.randrange(len(variants))
+
+    def select_player(
+        self,
+        game: "Game",
+        candidates: List["Player"],
+        author: Optional["Player"] = None,
+        decision: Optional[Decision] = None,
+        can_select_none: bool = False,
+    ) -> Optional["Player"]:
+        if can_select_none and self.rng.random() < self.pass_rate:
+            return None
+        return self.rng.choice(candidates)
+
+
+class SimulationProvider(RandomDecisionProvider):
+    """Random decisions, except that wolves never eat one of their own."""
+
+    def select_player(self, game, candidates, author=None, decision=None, can_select_none=False):
+        if decision == Decision.WOLF_KILL:
+            prey = [p for p in candidates if p.role != Role.LOUP_GAROU]
+            candidates = prey or candidates
+        return super().select_player(game, candidates, author, decision, can_select_none)
+
+
+def default_provider() -> DecisionProvider:
+    """Return the interactive terminal provider, imported lazily to keep the UI out of the core."""
+    from ..api.prompts import InquirerDecisionProvider
+
+    return InquirerDecisionProvider()
@@ -1,11 +1,17 @@
-from dataclasses import dataclass, field
-from random import shuffle
-from typing import List, Dict, Optional, Type
+from dataclasses import dataclass, field, fields
+from random import Random, shuffle
+from typing import Iterable, List, Dict, Optional, Type, TYPE_CHECKING
 from enum import Enum
-import uuid
-import click
-import inquirer
-from .role_distributor import Role, set_lineup
+import os
+from .decisions import Decision, DecisionProvider, default_provider
+from .journal import NO_PLAYER, ActionJournal
+from .players import INDEXED_ATTRIBUTES, PlayerTable, role_of
+from .registry import role_class
+from .role_distributor import MAX_PLAYERS, Role, set_lineup
+from .telemetry import decision_span
+
+if TYPE_CHECKING:
+    from .phases import Schedule
 
 
 class GameStatus(Enum):
@@ -62,12 +68,17 @@ class ActionType(Enum):
     CHOOSE_LOVERS = "choose_lovers"
     STEAL_ROLE = "steal_role"
     REVENGE_KILL = "revenge_kill"
+    # Mayor change: actor is the previous mayor (successions), target the new one (none when nobody is chosen)
+    MAYOR = "mayor"
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
-    """Represents a player in a game."""
+    """Represents a player in a game (seated in a `PlayerTable`, which assigns `player_id`)."""
 
+    # Declared first so they exist before the indexed fields are assigned in __init__
+    _table: Optional[PlayerTable] = field(default=None, init=False, repr=False, compare=False)
+    player_id: int = field(default=-1, init=False, repr=False, compare=False)
     name: str
     role: Optional[Role] = None
     alive: bool = True
@@ -94,6 +105,18 @@ class Player:
 
     lover: Optional["Player"] = None
 
+    def __setattr__(self, name: str, value) -> None:
+        # Keep the owning table's indexes in sync with kills, heals, reveals and role swaps
+        if name in INDEXED_ATTRIBUTES:
+            table = self._table
+            if table is not None:
+                old = getattr(self, name)
+                object.__setattr__(self, name, value)
+                if old is not value:
+                    table.player_changed(self, name, old)
+                return
+        object.__setattr__(self, name, value)
+
     def kill(self) -> None:
         """Mark the player as dead; if they have an alive lover, also kill them."""
         self.alive = False
@@ -101,13 +124,17 @@ class Player:
             self.lover.kill()
 
 
+# Fields every role class shares
+PLAYER_FIELDS = frozenset(f.name for f in fields(Player) if f.init)
+
+
 @dataclass
 class Action:
     """Represents an action taken by some actor targeting a player."""
 
-    actor: Player
+    actor: Optional[Player]
     action: ActionType
-    target: Player
+    target: Optional[Player]
 
 
 @dataclass
@@ -127,119 +154,165 @@ class Game:
     status: GameStatus
     period: State
     round_number: int
-    players: List[Player] = field(default_factory=list)
     lineup: Dict[Role, int] = field(default_factory=dict)
-    game_log: List[Log] = field(default_factory=list)
+    journal: ActionJournal = field(default_factory=ActionJournal)
     recently_killed: List[Player] = field(default_factory=list)
+    winner: Optional[Camp] = None
 
-    def __init__(self, num_players: int) -> None:
-        self.uid = str(uuid.uuid4())[:8]
+    def __init__(
+        self,
+        num_players: int,
+        provider: Optional[DecisionProvider] = None,
+        debug: bool = False,
+    ) -> None:
+        # 8 random hex digits (like a truncated uuid4, without importing uuid)
+        self.uid = os.urandom(4).hex()
         self.status = GameStatus.WAITING
         self.period = State.START_UP
         self.round_number = 1
+        self._schedule = None
         self.players = []
         self.lineup = {}
-        self.game_log = []
+        self.journal = ActionJournal()
         self.recently_killed = []
+        self.winner = None
+        # Check the incremental camp counters against a full recount in is_over
+        self.debug = debug
+        self._provider = provider
 
         try:
             if num_players == -1:
-                questions = [
-                    inquirer.List(
-                        "num_players",
-                        message="How many players?",
-                        choices=[str(i) for i in range(4, 13)],
-                        default="6",
-                        carousel=True,
-                    ),
-                ]
-
-                answers = inquirer.prompt(questions)
-                if not answers:
-                    click.echo(click.style("❌ Game setup cancelled", fg="yellow"))
+                chosen = self.provider.choose_num_players(list(range(4, MAX_PLAYERS + 1)), 6)
+                if chosen is None:
+                    self.notify("❌ Game setup cancelled", fg="yellow")
                     return
 
-                num_players = int(answers["num_players"])
+                num_players = chosen
 
             for i in range(num_players):
-                questions = [
-                    inquirer.Text(
-                        "name",
-                        message=f"Enter name for player {i+1}",
-                        default=f"Player{i+1}",
-                        validate=lambda _, x: len(x.strip()) > 0
-                        or "Name cannot be empty",
-                    ),
-                ]
-
-                answers = inquirer.prompt(questions)
-                if not answers:
-                    click.echo(click.style("❌ Player creation cancelled", fg="yellow"))
+                name = self.provider.choose_player_name(i, f"Player{i+1}")
+                if name is None:
+                    self.notify("❌ Player creation cancelled", fg="yellow")
                     return
 
-                name = answers["name"].strip() or f"Player{i+1}"
-                self.players.append(Player(name=name))
+                self.players.append(Player(name=name.strip() or f"Player{i+1}"))
 
             if self.players:
                 try:
-                    self.lineup = set_lineup(len(self.players))
-                    self.distribute_roles()
-                    click.echo(
-                        click.style(
-                            f"✅ Game created successfully with {len(self.players)} players",
-                            fg="green",
-                        )
+                    self.lineup = set_lineup(len(self.players), self.provider)
+                    # Seeded providers (random bots) also seed the role shuffle
+                    self.distribute_roles(getattr(self.provider, "rng", None))
+                    self.notify(
+                        f"✅ Game created successfully with {len(self.players)} players",
+                        fg="green",
                     )
                 except Exception as e:
-                    click.echo(click.style(f"❌ Error setting up roles: {e}", fg="red"))
+                    self.notify(f"❌ Error setting up roles: {e}", fg="red")
             else:
-                click.echo(click.style("❌ No players were created", fg="red"))
+                self.notify("❌ No players were created", fg="red")
 
         except KeyboardInterrupt:
-            click.echo(click.style("\n❌ Game creation cancelled", fg="yellow"))
+            self.notify("\n❌ Game creation cancelled", fg="yellow")
         except Exception as e:
-            click.echo(click.style(f"❌ Error: {e}", fg="red"))
+            self.notify(f"❌ Error: {e}", fg="red")
+
+    @property
+    def provider(self) -> DecisionProvider:
+        """Decision provider; the interactive default is only created when a game without one needs it."""
+        if self._provider is None:
+            self._provider = default_provider()
+        return self._provider
+
+    @provider.setter
+    def provider(self, provider: Optional[DecisionProvider]) -> None:
+        self._provider = provider
+
+    @property
+    def players(self) -> PlayerTable:
+        """Players of the game; assigning a plain list seats them in a new `PlayerTable`."""
+        return self._players
+
+    @players.setter
+    def players(self, players: Iterable[Player]) -> None:
+        self._players = players if isinstance(players, PlayerTable) else PlayerTable(players)
+        # New seats may hold other roles
+        self._schedule = None
+
+    @property
+    def schedule(self) -> "Schedule":
+        """Compiled phase steps of this game (see `phases`); compiled on first use when roles were seated by hand."""
+        if self._schedule is None:
+            from .phases import compile_schedule
+
+            self._schedule = compile_schedule(frozenset(player.role for player in self.players))
+        return self._schedule
+
+    def notify(self, message: str = "", **style) -> None:
+        """Send a message to the game master through the decision provider."""
+        self.provider.notify(message, **style)
 
     def elect_mayor(self, players: List[Player]) -> bool:
         """Elect a mayor by inputting the name of the chosen player (external vote)."""
-        chosen = self.select_player(alive=True)
+        chosen = self.select_player(
+            players=players, alive=True, decision=Decision.MAYOR_ELECTION
+        )
         if chosen:
             for p in self.players:
                 p.is_mayor = False
             chosen.is_mayor = True
-            click.echo(f"👑 {chosen.name} is now the Mayor!")
+            self.save_action(None, ActionType.MAYOR, chosen)
+            self.notify(f"👑 {chosen.name} is now the Mayor!")
             return True
         return False
 
     def village_vote_input(self) -> Optional[Player]:
         """Input the name of the player chosen by the village to be eliminated."""
-        chosen = self.select_player(alive=True)
+        chosen = self.select_player(alive=True, decision=Decision.VILLAGE_VOTE)
         if chosen:
+            self.save_action(None, ActionType.VOTE, chosen)
             self.village_vote(chosen)
-            click.echo(f"💀 {chosen.name} has been eliminated by the village!")
+            self.notify(f"💀 {chosen.name} has been eliminated by the village!")
             return chosen
         return None
 
-    def save_action(self, actor: Player, action: ActionType, target: Player) -> None:
-        """Save an action to the current game's log."""
-        if not self.game_log:
-            # create a log entry for the current round/period if missing
-            self.game_log.append(
-                Log(round_number=self.round_number, period=self.period, actions=[])
-            )
-
-        self.game_log[self.round_number - 1].actions.append(
-            Action(actor=actor, action=action, target=target)
+    def save_action(
+        self, actor: Optional[Player], action: ActionType, target: Optional[Player]
+    ) -> None:
+        """Append an action of the current round/period to the journal (actor None for collective actions)."""
+        self.journal.append(
+            self.round_number,
+            self.period,
+            action,
+            actor.player_id if actor is not None else NO_PLAYER,
+            target.player_id if target is not None else NO_PLAYER,
         )
 
+    @property
+    def game_log(self) -> List[Log]:
+        """Journal decoded as `Log` entries, one per consecutive (round, period)."""
+        logs: List[Log] = []
+        for record in self.journal:
+            if not logs or (logs[-1].round_number, logs[-1].period) != (record.round_number, record.period):
+                logs.append(Log(round_number=record.round_number, period=record.period, actions=[]))
+            logs[-1].actions.append(
+                Action(
+                    actor=self.players.get(record.actor) if record.actor != NO_PLAYER else None,
+                    action=record.action,
+                    target=self.players.get(record.target) if record.target != NO_PLAYER else None,
+                )
+            )
+        return logs
+
     def show_players(self) -> None:
         """Print players and minimal status info."""
+        if not self.provider.verbose:
+            return
         if not self.players:
-            click.echo(click.style("❌ No players in the game", fg="red"))
+            self.notify("❌ No players in the game", fg="red")
             return
 
-        click.echo(f"\n👥 Players in Game {self.uid}:")
-        click.echo("=" * 50)
+        self.notify(f"\n👥 Players in Game {self.uid}:")
+        self.notify("=" * 50)
 
         for i, player in enumerate(self.players, 1):
             status = "💀  " if not player.alive else "❤️  "
@@ -252,11 +325,11 @@ class Game:
                 else "No Role"
             )
 
-            click.echo(f"{i:2d}. {player.name:<15} {status}{mayor}{revealed}")
-            click.echo(f"    Role: {role}")
+            self.notify(f"{i:2d}. {player.name:<15} {status}{mayor}{revealed}")
+            self.notify(f"    Role: {role}")
             if lover:
-                click.echo(f"    Lover: {lover}")
-            click.echo()
+                self.notify(f"    Lover: {lover}")
+            self.notify()
 
     def select_player(
         self,
@@ -266,54 +339,66 @@ class Game:
         is_revealed: Optional[bool] = None,
         can_select_self: bool = False,
         can_select_none: bool = False,
+        excluded_names: Iterable[str] = (),
+        decision: Optional[Decision] = None,
     ) -> Optional[Player]:
-        """Prompt user to select a player filtered by criteria. Returns the Player or None."""
-        if players is None:
-            players = self.players
-
-        filtered_players = [
-            player
-            for player in players
-            if (alive is None or player.alive == alive)
-            and (is_revealed is None or player.is_revealed == is_revealed)
-            and (can_select_self or player != author)
-        ]
-
-        choices = [player.name for player in filtered_players]
-        if can_select_none:
-            choices.insert(0, "None")
-        if not choices:
-            click.echo("No players available for selection.")
+        """Ask the provider to select a player filtered by criteria. Returns the Player or None."""
+        excluded_names = set(excluded_names)
+        if players is None or players is self.players:
+            # Cached status view, only narrowed further when needed
+            filtered_players = self.players.view(alive=alive, is_revealed=is_revealed)
+            if (author is not None and not can_select_self) or excluded_names:
+                filtered_players = [
+                    player
+                    for player in filtered_players
+                    if (can_select_self or player is not author)
+                    and player.name not in excluded_names
+                ]
+            else:
+                filtered_players = list(filtered_players)
+        else:
+            filtered_players = [
+                player
+                for player in players
+                if (alive is None or player.alive == alive)
+                and (is_revealed is None or player.is_revealed == is_revealed)
+                and (can_select_self or player != author)
+                and player.name not in excluded_names
+            ]
+
+        if not filtered_players:
+            if not can_select_none:
+                self.notify("No players available for selection.")
             return None
 
-        questions = [
-            inquirer.List(
-                "player", message="Select a player:", choices=choices, carousel=True
-            ),
-        ]
-
-        answers = inquirer.prompt(questions)
-        if not answers:
-            return None
-        choice = answers["player"]
-        if choice == "None":
-            return None
-        return self.get_player_by_name(choice)
+        with decision_span(self, author, decision):
+            return self.provider.select_player(
+                self,
+                filtered_players,
+                author=author,
+                decision=decision,
+                can_select_none=can_select_none,
+            )
 
     def show_game_state(self) -> None:
         """Show overall game state summary."""
-        click.echo(f"\n🎮 Game State: {self.uid}")
-        click.echo("=" * 30)
-        click.echo(f"Status: {self.status.value}")
-        click.echo(f"Period: {self.period.value.replace('_', ' ').title()}")
-        click.echo(f"Round: {self.round_number}")
-        click.echo(f"Players Alive: {sum(1 for p in self.players if p.alive)}")
-        click.echo(f"Players Total: {len(self.players)}")
+        if not self.provider.verbose:
+            return
+        self.notify(f"\n🎮 Game State: {self.uid}")
+        self.notify("=" * 30)
+        self.notify(f"Status: {self.status.value}")
+        self.notify(f"Period: {self.period.value.replace('_', ' ').title()}")
+        self.notify(f"Round: {self.round_number}")
+        self.notify(f"Players Alive: {len(self.players.view(alive=True))}")
+        self.notify(f"Players Total: {len(self.players)}")
 
     def loup_garou_kill(self) -> None:
         """Kill a selected player during wolf night action."""
-        target = self.select_player(alive=True, can_select_self=False)
+        target = self.select_player(
+            alive=True, can_select_self=False, decision=Decision.WOLF_KILL
+        )
         if target:
+            self.save_action(None, ActionType.KILL, target)
             self.recently_killed.append(target)
             target.kill()
 
@@ -321,8 +406,8 @@ class Game:
         """Execute a village vote result to kill a player."""
         target.kill()
 
-    def distribute_roles(self) -> None:
-        """Distribute roles to players according to `self.lineup`. Imports role classes at runtime to avoid circular imports."""
+    def distribute_roles(self, rng: Optional[Random] = None) -> None:
+        """Distribute roles to players according to `self.lineup`, shuffling with `rng` (global random by default). Role classes come from the lazy role registry."""
         if len(self.players) != sum(self.lineup.values()):
             raise ValueError("Number of players must match role distribution")
 
@@ -330,66 +415,108 @@ class Game:
         for role, count in self.lineup.items():
             roles_list.extend([role] * count)
 
-        shuffle(roles_list)
+        if rng is None:
+            shuffle(roles_list)
+        else:
+            rng.shuffle(roles_list)
 
-        # Import role classes here to avoid circular imports
-        from .roles import Cupidon, Voyante, Sorciere, Chasseur, Voleur
-
-        role_class_map = {
-            Role.CUPIDON: Cupidon,
-            Role.VOYANTE: Voyante,
-            Role.SORCIERE: Sorciere,
-            Role.CHASSEUR: Chasseur,
-            Role.VOLEUR: Voleur,
-            Role.LOUP_GAROU: Player,
-            Role.VILLAGEOIS: Player,
-        }
+        from .phases import compile_schedule
 
         for i, player in enumerate(self.players):
             role_enum = roles_list[i]
-            role_class = role_class_map.get(role_enum, Player)
-            new_player = role_class(name=player.name)
+            new_player = role_class(role_enum)(name=player.name)
             new_player.role = role_enum
             self.players[i] = new_player
+        # The calling order only depends on the lineup: compiled once for the whole game
+        self._schedule = compile_schedule(frozenset(roles_list))
+
+    def reseat(self, player: Player, role_state_from: Optional[Player] = None) -> Player:
+        """Replace `player` by an instance of the class of its current role (after a Voleur swap).
+
+        Shared fields (name, status, lover...) are kept; the role-specific ones
+        come from `role_state_from` when it is of that class, since the state
+        goes with the card. References other players hold to `player` (lover,
+        Cupidon's lovers, Chasseur's target) are moved to the new instance.
+        """
+        cls = role_class(player.role)
+        if type(player) is cls:
+            return player
+        template = role_state_from if type(role_state_from) is cls else None
+        new_player = cls(name=player.name)
+        for f in fields(cls):
+            if f.init:
+                source = player if f.name in PLAYER_FIELDS else template
+                if source is not None:
+                    setattr(new_player, f.name, getattr(source, f.name))
+        self.players[player.player_id] = new_player
+
+        for other in self.players:
+            for f in fields(other):
+                value = getattr(other, f.name)
+                if value is player:
+                    setattr(other, f.name, new_player)
+                elif isinstance(value, tuple) and any(item is player for item in value):
+                    setattr(other, f.name, tuple(new_player if item is player else item for item in value))
+        self.recently_killed = [new_player if p is player else p for p in self.recently_killed]
+        return new_player
 
     def get_role_instance(self, role_class: Type[Role]) -> Optional[Player]:
         """Return the first player instance that matches a Role enum derived from `role_class` name."""
-        role_enum_name = role_class.__name__.upper()
-        try:
-            role_enum = Role[role_enum_name]
-        except KeyError:
+        role_enum = role_of(role_class)
+        if role_enum is None:
             return None
-
-        for player in self.players:
-            if player.role == role_enum:
-                return player
-        return None
+        return self.players.first_with_role(role_enum)
 
     def get_player_by_name(self, name: str) -> Optional[Player]:
         """Find a player by name (exact match)."""
-        for player in self.players:
-            if player.name == name:
-                return player
-        return None
+        return self.players.by_name(name)
+
+    def snapshot(self) -> bytes:
+        """Serialize the whole game state into a compact versioned binary snapshot."""
+        from .snapshot import dump_game
+
+        return dump_game(self)
+
+    @classmethod
+    def headless(cls, lineup: Dict[Role, int], provider: DecisionProvider, rng: Optional[Random] = None) -> "Game":
+        """Game of `lineup` without any setup prompt: players P1..Pn, roles dealt with `rng`."""
+        game = cls(0, provider=provider)
+        game.players = [Player(name=f"P{i+1}") for i in range(sum(lineup.values()))]
+        game.lineup = dict(lineup)
+        game.distribute_roles(rng)
+        return game
+
+    @classmethod
+    def restore(cls, data: bytes, provider: Optional[DecisionProvider] = None) -> "Game":
+        """Rebuild a game from `snapshot()` bytes."""
+        from .snapshot import load_game
+
+        return load_game(data, provider)
+
+    def fork(self, provider: Optional[DecisionProvider] = None) -> "Game":
+        """Independent copy of the current position (same provider unless another is given)."""
+        return self.restore(self.snapshot(), provider if provider is not None else self._provider)
 
     def is_over(self) -> bool:
-        """Check if the game is over based on Camps."""
-        alive_players = [p for p in self.players if p.alive]
+        """Check if the game is over based on Camps.
 
-        if not alive_players:
-            click.echo("\n💀 Everyone is dead. Nobody wins.")
-            self.status = GameStatus.FINISHED
-            return True
+        A finished game gets its `winner` and `GameStatus.FINISHED`; `period`
+        is left alone (`play_game` moves it to `State.COMPLETED`).
+        """
+        if self.debug:
+            self.players.check_camp_counters()
 
-        # Count players per camp
-        counts = {Camp.VILLAGEOIS: 0, Camp.LOUP_GAROU: 0, Camp.AMOUREUX: 0}
+        # Alive players per camp, kept up to date by the player table
+        counts = self.players.alive_by_camp()
 
-        for p in alive_players:
-            counts[p.camp] += 1
+        if not any(counts.values()):
+            self.notify("\n💀 Everyone is dead. Nobody wins.")
+            self.status = GameStatus.FINISHED
+            return True
 
-        # villagers_count = counts[Camp.VILLAGEOIS]
-        wolves_count = counts[Camp.LOUP_GAROU]
-        lovers_count = counts[Camp.AMOUREUX]
+        # villagers_count = counts.get(Camp.VILLAGEOIS, 0)
+        wolves_count = counts.get(Camp.LOUP_GAROU, 0)
+        lovers_count = counts.get(Camp.AMOUREUX, 0)
 
         # Count how many camps have players
         camps_alive = sum(1 for count in counts.values() if count > 0)
@@ -397,11 +524,14 @@ class Game:
         # Game ends only when all remaining players are from the same camp
         if camps_alive == 1:
             if lovers_count > 0:
-                click.echo("\n💕 The Lovers have won! Love conquers all.")
+                self.winner = Camp.AMOUREUX
+                self.notify("\n💕 The Lovers have won! Love conquers all.")
             elif wolves_count > 0:
-                click.echo("\n🐺 The Werewolves have won!")
+                self.winner = Camp.LOUP_GAROU
+                self.notify("\n🐺 The Werewolves have won!")
             else:
-                click.echo("\n🎉 The Village has won!")
+                self.winner = Camp.VILLAGEOIS
+                self.notify("\n🎉 The Village has won!")
             self.status = GameStatus.FINISHED
             return True
 
@@ -0,0 +1,192 @@
+"""
+Compact append-only action journal.
+
+Each action is one fixed-width 8-byte record (round, period code, action
+code, actor id, target id) appended to a `bytearray`. Player ids are the
+stable seats from `PlayerTable`. A journal can stream to a file
+(`JournalSink`, fsync every few records) and archived files are read back
+through `mmap` without copying (`JournalReader`).
+"""
+import mmap
+import os
+import struct
+import time
+from functools import lru_cache
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+MAGIC = b"WWJ1"
+VERSION = 1
+NO_PLAYER = -1
+
+# round (uint16), period code (uint8), action code (uint8), actor id (int16), target id (int16)
+RECORD = struct.Struct("<HBBhh")
+# magic, version (uint16), record size (uint16), game uid (8 ascii bytes)
+HEADER = struct.Struct("<4sHH8s")
+
+
+@lru_cache(maxsize=None)
+def _codes() -> Tuple[tuple, tuple, Dict, Dict]:
+    """Period and action codes: position of the member in `State` / `ActionType`."""
+    # Imported lazily: game.py imports this module
+    from .game import ActionType, State
+
+    periods, actions = tuple(State), tuple(ActionType)
+    return (
+        periods,
+        actions,
+        {period: code for code, period in enumerate(periods)},
+        {action: code for code, action in enumerate(actions)},
+    )
+
+
+class JournalRecord(NamedTuple):
+    """Decoded journal record; ids are `player_id` seats (NO_PLAYER when absent)."""
+
+    round_number: int
+    period: "State"  # type: ignore[name-defined]  # noqa: F821
+    action: "ActionType"  # type: ignore[name-defined]  # noqa: F821
+    actor: int
+    target: int
+
+
+class _RecordView:
+    """Shared decoding over a buffer of packed records."""
+
+    _records: memoryview
+
+    def __len__(self) -> int:
+        return len(self._records) // RECORD.size
+
+    def __getitem__(self, index: int) -> JournalRecord:
+        index = range(len(self))[index]
+        return self._decode(RECORD.unpack_from(self._records, index * RECORD.size))
+
+    def __iter__(self) -> Iterator[JournalRecord]:
+        for fields in RECORD.iter_unpack(self._records):
+            yield self._decode(fields)
+
+    def raw(self) -> memoryview:
+        """The packed records (no header), without copying; release it before appending again."""
+        return self._records
+
+    @staticmethod
+    def _decode(fields) -> JournalRecord:
+        periods, actions, _, _ = _codes()
+        round_number, period, action, actor, target = fields
+        return JournalRecord(round_number, periods[period], actions[action], actor, target)
+
+
+class ActionJournal(_RecordView):
+    """In-memory append-only journal of a game's actions."""
+
+    def __init__(self, records: bytes = b"") -> None:
+        self._buffer = bytearray(records)
+        self._sink: Optional["JournalSink"] = None
+
+    @property
+    def _records(self) -> memoryview:
+        return memoryview(self._buffer)
+
+    def append(self, round_number: int, period, action, actor: int = NO_PLAYER, target: int = NO_PLAYER) -> None:
+        _, _, period_codes, action_codes = _codes()
+        record = RECORD.pack(round_number, period_codes[period], action_codes[action], actor, target)
+        self._buffer += record
+        if self._sink is not None:
+            self._sink.write(record)
+
+    def stream_to(self, sink: "JournalSink") -> None:
+        """Write the records so far to `sink`, then every new one as it is appended."""
+        if len(self._buffer):
+            sink.write(bytes(self._buffer))
+        self._sink = sink
+
+    def to_bytes(self, uid: str = "") -> bytes:
+        """Standalone journal file contents (header + records)."""
+        return _header(uid) + bytes(self._buffer)
+
+
+class JournalSink:
+    """Append-only journal file, fsynced every `fsync_every` records or `fsync_interval` seconds."""
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        uid: str = "",
+        fsync_every: int = 64,
+        fsync_interval: float = 1.0,
+    ) -> None:
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._file: BinaryIO = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(_header(uid))
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def write(self, records: bytes) -> None:
+        self._file.write(records)
+        self._pending += len(records) // RECORD.size
+        if self._pending >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """Flush buffered records and fsync them to disk."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self) -> "JournalSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class JournalReader(_RecordView):
+    """Memory-mapped view over a journal file; records are decoded on access only."""
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        magic, version, record_size, uid = HEADER.unpack_from(self._view)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self._view.release()
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} action journal")
+        self.uid = uid.rstrip(b"\0").decode("ascii")
+        # A record cut by a crash mid-write is ignored
+        end = HEADER.size + (len(self._view) - HEADER.size) // RECORD.size * RECORD.size
+        self._records = self._view[HEADER.size:end]
+
+    def close(self) -> None:
+        self._records.release()
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self) -> "JournalReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _header(uid: str) -> bytes:
+    return HEADER.pack(MAGIC, VERSION, RECORD.size, uid.encode("ascii")[:8])
+
+
+def read_journal(data: bytes) -> List[JournalRecord]:
+    """Decode journal file contents produced by `ActionJournal.to_bytes`."""
+    magic, version, record_size, _ = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise ValueError(f"Not a version {VERSION} action journal")
+    view = memoryview(data)[HEADER.size:]
+    view = view[: len(view) // RECORD.size * RECORD.size]
+    return [_RecordView._decode(fields) for fields in RECORD.iter_unpack(view)]
@@ -0,0 +1,160 @@
+"""
+Generated lineups for any number of players.
+
+`ROLE_DISTRIBUTIONS` only covers 4 to 12 players. For other player counts,
+`generate_lineups` enumerates the compositions allowed by a set of
+`LineupConstraints`: the wolf ratio, how many special roles (each held by
+one player), which ones are allowed or required. The best ones are kept,
+ranked by how close they are to the target wolf ratio and then by number of
+specials. Results are memoized and stored in an on-disk catalog keyed by a
+hash of the constraints, so a table size is only generated once.
+"""
+import hashlib
+import json
+import math
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from .role_distributor import ROLE_DISTRIBUTIONS, Role
+
+CATALOG_VERSION = 1
+# Roles other than villagers and wolves, in display order
+SPECIAL_ROLES: Tuple[Role, ...] = (
+    Role.VOYANTE,
+    Role.SORCIERE,
+    Role.CHASSEUR,
+    Role.CUPIDON,
+    Role.PETITE_FILLE,
+    Role.VOLEUR,
+)
+
+Lineup = Dict[Role, int]
+
+
+@dataclass(frozen=True)
+class LineupConstraints:
+    """What a generated lineup must satisfy."""
+
+    min_wolf_ratio: float = 0.2
+    max_wolf_ratio: float = 0.34
+    # Ranking: lineups closest to this ratio come first
+    target_wolf_ratio: float = 0.28
+    max_specials: int = 5
+    min_villagers: int = 1
+    # The Voleur is left out by default (the batch simulator does not play it)
+    allowed: FrozenSet[Role] = frozenset(SPECIAL_ROLES) - {Role.VOLEUR}
+    required: FrozenSet[Role] = frozenset({Role.VOYANTE})
+    # Lineups kept per player count
+    variants: int = 6
+
+    def key(self) -> str:
+        """Stable hash of the constraints (names the on-disk catalog)."""
+        fields = asdict(self)
+        fields["allowed"] = sorted(role.value for role in self.allowed)
+        fields["required"] = sorted(role.value for role in self.required)
+        payload = json.dumps([CATALOG_VERSION, fields], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+DEFAULT_CONSTRAINTS = LineupConstraints()
+
+
+@lru_cache(maxsize=None)
+def generate_lineups(num_players: int, constraints: LineupConstraints = DEFAULT_CONSTRAINTS) -> Tuple[Lineup, ...]:
+    """Best `constraints.variants` lineups of `num_players` (memoized; treat them as read-only)."""
+    specials = [role for role in SPECIAL_ROLES if role in constraints.allowed]
+    required = [role for role in specials if role in constraints.required]
+    optional = [role for role in specials if role not in constraints.required]
+    if len(required) < len(constraints.required):
+        raise ValueError(f"Required roles not allowed: {set(constraints.required) - set(required)}")
+
+    min_wolves = max(1, math.ceil(constraints.min_wolf_ratio * num_players))
+    max_wolves = math.floor(constraints.max_wolf_ratio * num_players)
+    ranked = []
+    for wolves in range(min_wolves, max_wolves + 1):
+        for extra in range(min(len(optional), constraints.max_specials - len(required)) + 1):
+            for chosen in combinations(optional, extra):
+                roles = required + list(chosen)
+                villagers = num_players - wolves - len(roles)
+                if villagers < constraints.min_villagers:
+                    continue
+                lineup = {Role.VILLAGEOIS: villagers, Role.LOUP_GAROU: wolves}
+                lineup.update((role, 1) for role in roles)
+                rank = (abs(wolves - constraints.target_wolf_ratio * num_players), -len(roles), wolves)
+                ranked.append((rank, [specials.index(role) for role in roles], lineup))
+    ranked.sort(key=lambda entry: entry[:2])
+    return tuple(lineup for _, _, lineup in ranked[: constraints.variants])
+
+
+class LineupCatalog:
+    """Generated lineups per player count, memoized in memory and in a JSON file."""
+
+    def __init__(self, constraints: LineupConstraints = DEFAULT_CONSTRAINTS, path: Optional[Path] = None) -> None:
+        self.constraints = constraints
+        if path is None:
+            from .balance import default_cache_dir
+
+            path = default_cache_dir() / f"lineups-{constraints.key()}.json"
+        self.path = Path(path)
+        self._lineups: Optional[Dict[int, List[Lineup]]] = None
+
+    def get(self, num_players: int) -> List[Lineup]:
+        """Lineups of `num_players`, generated and saved on the first request."""
+        if self._lineups is None:
+            self._lineups = self._load()
+        lineups = self._lineups.get(num_players)
+        if lineups is None:
+            lineups = [dict(lineup) for lineup in generate_lineups(num_players, self.constraints)]
+            self._lineups[num_players] = lineups
+            self._save()
+        return lineups
+
+    def _load(self) -> Dict[int, List[Lineup]]:
+        try:
+            payload = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if payload.get("version") != CATALOG_VERSION:
+            return {}
+        return {
+            int(num_players): [{Role(role): count for role, count in lineup} for lineup in lineups]
+            for num_players, lineups in payload["lineups"].items()
+        }
+
+    def _save(self) -> None:
+        payload = {
+            "version": CATALOG_VERSION,
+            "lineups": {
+                str(num_players): [[(role.value, count) for role, count in lineup.items()] for lineup in lineups]
+                for num_players, lineups in sorted(self._lineups.items())
+            },
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(payload, indent=1))
+            tmp.replace(self.path)
+        except OSError:
+            # Read-only cache: keep the in-memory catalog only
+            pass
+
+
+@lru_cache(maxsize=None)
+def default_catalog() -> LineupCatalog:
+    return LineupCatalog()
+
+
+def lineups_for(num_players: int) -> List[Lineup]:
+    """Hand-written lineups of `ROLE_DISTRIBUTIONS` when there are some, generated ones otherwise.
+
+    Raises KeyError when no lineup fits the default constraints (too few players).
+    """
+    if num_players in ROLE_DISTRIBUTIONS:
+        return ROLE_DISTRIBUTIONS[num_players]
+    lineups = default_catalog().get(num_players)
+    if not lineups:
+        raise KeyError(num_players)
+    return lineups
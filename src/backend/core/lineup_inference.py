@@ -0,0 +1,158 @@
+"""
+Lineup inference: narrow down the composition of a game from what is observed.
+
+The candidate lineups of each player count are compiled once into bitmask
+tables (`LineupIndex`): for every role, the lineups holding at least k of
+it, and those without it. The candidates left after any observations are a
+single integer mask, so each observation costs one AND whatever the number
+of lineups, and the reports derived from a mask (possible roles, roles still
+to be called tonight) are memoized on it.
+"""
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+from .lineup_catalog import lineups_for
+from .registry import FIRST_NIGHT_ONLY
+from .role_distributor import ROLE_DISTRIBUTIONS, Role
+
+# Night calling order (the wolves before the Sorcière, as in `process_night`)
+NIGHT_ORDER: Tuple[Role, ...] = (Role.CUPIDON, Role.VOLEUR, Role.VOYANTE, Role.LOUP_GAROU, Role.SORCIERE)
+
+
+class CompiledLineups:
+    """Bitmask tables over the candidate lineups of one player count."""
+
+    def __init__(self, lineups: Iterable[Mapping[Role, int]]) -> None:
+        self.lineups: List[Dict[Role, int]] = [dict(lineup) for lineup in lineups]
+        self.all = (1 << len(self.lineups)) - 1
+        # at_least[role][k]: lineups with at least k players of `role` (index 0 is every lineup)
+        self.at_least: Dict[Role, List[int]] = {}
+        for role in Role:
+            most = max((lineup.get(role, 0) for lineup in self.lineups), default=0)
+            self.at_least[role] = [
+                sum(1 << i for i, lineup in enumerate(self.lineups) if lineup.get(role, 0) >= k)
+                for k in range(most + 1)
+            ]
+        self.present = {role: self.require(self.all, role, 1) for role in Role}
+        self.without = {role: self.all & ~self.present[role] for role in Role}
+        self._possible: Dict[int, FrozenSet[Role]] = {}
+
+    def require(self, mask: int, role: Role, count: int) -> int:
+        """`mask` restricted to lineups with at least `count` players of `role`."""
+        table = self.at_least[role]
+        return mask & table[count] if count < len(table) else 0
+
+    def possible(self, mask: int) -> FrozenSet[Role]:
+        """Roles present in at least one lineup of `mask` (memoized)."""
+        roles = self._possible.get(mask)
+        if roles is None:
+            roles = frozenset(role for role in Role if mask & self.present[role])
+            self._possible[mask] = roles
+        return roles
+
+
+class LineupIndex:
+    """Compiled candidate lineups keyed by player count."""
+
+    def __init__(self, distributions: Mapping[int, Iterable[Mapping[Role, int]]]) -> None:
+        self._compiled = {num_players: CompiledLineups(lineups) for num_players, lineups in distributions.items()}
+
+    @classmethod
+    def from_lineups(cls, lineups: Iterable[Mapping[Role, int]]) -> "LineupIndex":
+        """Index arbitrary lineups, grouped by their number of players."""
+        grouped: Dict[int, List[Mapping[Role, int]]] = {}
+        for lineup in lineups:
+            grouped.setdefault(sum(lineup.values()), []).append(lineup)
+        return cls(grouped)
+
+    def __getitem__(self, num_players: int) -> CompiledLineups:
+        return self._compiled[num_players]
+
+    def __contains__(self, num_players: int) -> bool:
+        return num_players in self._compiled
+
+
+@lru_cache(maxsize=None)
+def default_index() -> LineupIndex:
+    """Index of `ROLE_DISTRIBUTIONS` (keyed by their declared player count)."""
+    return LineupIndex(ROLE_DISTRIBUTIONS)
+
+
+class LineupInference:
+    """Candidate lineups of one game, narrowed by each observation.
+
+    Observations that would leave no candidate (an STT mistake, a house-rule
+    lineup) are ignored and reported by returning False.
+    """
+
+    def __init__(self, num_players: int, index: Optional[LineupIndex] = None) -> None:
+        index = index or default_index()
+        if num_players not in index:
+            # Larger tables: the generated lineups of the catalog
+            index = LineupIndex({num_players: lineups_for(num_players)})
+        self.compiled = index[num_players]
+        self.mask = self.compiled.all
+        # Players seen waking up / revealed on death, per role
+        self._seen: Dict[Role, int] = {}
+        self._revealed: Dict[Role, int] = {}
+
+    @property
+    def candidates(self) -> List[Dict[Role, int]]:
+        return [lineup for i, lineup in enumerate(self.compiled.lineups) if self.mask >> i & 1]
+
+    def observe_wake(self, role: Role) -> bool:
+        """The role was called and answered: at least one such player."""
+        return self._count(self._seen, role, 1)
+
+    def observe_reveal(self, role: Role) -> bool:
+        """One more (distinct) player of this role revealed, e.g. on death."""
+        return self._count(self._revealed, role, self._revealed.get(role, 0) + 1)
+
+    def observe_absent(self, role: Role) -> bool:
+        """The role is known not to be in the game."""
+        return self._narrow(self.mask & self.compiled.without[role])
+
+    def observe_call(self, role: Role, first_night: bool) -> bool:
+        """The GM calls `role`.
+
+        On the first night, every role earlier in `NIGHT_ORDER` that was never
+        seen is absent: the GM only calls the roles of the lineup.
+        """
+        if first_night:
+            for earlier in NIGHT_ORDER[:NIGHT_ORDER.index(role)] if role in NIGHT_ORDER else ():
+                if earlier not in self._seen:
+                    self.observe_absent(earlier)
+        return self.observe_wake(role)
+
+    def possible_roles(self) -> FrozenSet[Role]:
+        return self.compiled.possible(self.mask)
+
+    def certain_roles(self) -> FrozenSet[Role]:
+        """Roles present in every remaining candidate."""
+        present = self.compiled.present
+        return frozenset(role for role in Role if present[role] and self.mask & ~present[role] == 0)
+
+    def night_roles(self, first_night: bool, after: Optional[Role] = None) -> Tuple[Role, ...]:
+        """Roles that may still be called this night, in order (those after `after` only)."""
+        possible = self.possible_roles()
+        start = NIGHT_ORDER.index(after) + 1 if after in NIGHT_ORDER else 0
+        return tuple(
+            role
+            for role in NIGHT_ORDER[start:]
+            if role in possible and (first_night or role not in FIRST_NIGHT_ONLY)
+        )
+
+    def _count(self, counts: Dict[Role, int], role: Role, value: int) -> bool:
+        previous = counts.get(role, 0)
+        counts[role] = value
+        needed = max(self._seen.get(role, 0), self._revealed.get(role, 0))
+        if self._narrow(self.compiled.require(self.mask, role, needed)):
+            return True
+        counts[role] = previous
+        return False
+
+    def _narrow(self, mask: int) -> bool:
+        if not mask:
+            return False
+        self.mask = mask
+        return True
@@ -0,0 +1,345 @@
+"""
+Live win probabilities of a running game, for the game master's display.
+
+The remaining game is played under the random policy of the balance
+simulations (uniform picks, wolves never eat one of their own, optional
+potions passed with probability `pass_rate`). A position is reduced to a
+canonical state: how many alive players of each kind (camp, wolf, Hunter),
+the alive lovers, the Hunter's pending shot and the Sorcière's potions.
+Players of the same kind are interchangeable, and the Voyante and the mayor
+do not change the odds under this policy, so they are left out.
+
+Small endgames are solved exactly by an expectimax over chance nodes, one
+node per step of a phase, memoized in a transposition table kept between
+calls. The exact search gets three quarters of the time budget (half of it
+for larger positions); when it runs out, the rest of the budget samples
+playouts, each stopping as soon as it reaches a position small enough to be
+solved (or already solved). At least one playout is always sampled.
+Solved positions stay in the table, so the refreshes of one game quickly
+become exact.
+
+    odds = estimate_win_probabilities(game, budget=0.02)
+    game.notify(f"📊 {odds.summary()}")
+"""
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from random import Random
+from typing import Dict, List, Optional, Tuple, Union
+
+from .game import Camp, Game, State
+from .role_distributor import Role
+
+NOBODY = "nobody"
+OUTCOMES = (Camp.VILLAGEOIS.value, Camp.LOUP_GAROU.value, Camp.AMOUREUX.value, NOBODY)
+CAMPS = (Camp.VILLAGEOIS, Camp.LOUP_GAROU, Camp.AMOUREUX)
+CAMP_CODES = {camp: code for code, camp in enumerate(CAMPS)}
+
+# Player kind = camp code * 3 + tag
+PLAIN, WOLF, HUNTER = range(3)
+KINDS = len(CAMPS) * 3
+
+# Share of the budget kept for the playouts when the exact search of a small position runs out
+SAMPLING_SHARE = 0.25
+
+# Steps of a phase (chance nodes); the game is checked for a winner after the last step of each phase
+DAY_HUNTER, DAY_VOTE, NIGHT_WOLVES, NIGHT_HEAL, NIGHT_POISON = range(5)
+
+Kind = int
+Counts = Tuple[int, ...]
+# Alive lovers still bound to each other, as their two (sorted) kinds
+Couple = Optional[Tuple[Kind, Kind]]
+# Wolves' victim awaiting the Sorcière: its kind and the kind of the lover who died with it
+Victim = Optional[Tuple[Kind, Optional[Kind]]]
+# (step, counts, couple, hunter owed, heal left, poison left, victim)
+Position = Tuple[int, Counts, Couple, bool, bool, bool, Victim]
+Odds = Tuple[float, float, float, float]
+# A position, or the index of the outcome in OUTCOMES once the game is over
+Node = Union[Position, int]
+
+
+def _is_wolf(kind: Kind) -> bool:
+    return kind % 3 == WOLF
+
+
+def _alive(counts: Counts, couple: Couple) -> int:
+    return sum(counts) + (2 if couple else 0)
+
+
+def _outcome(counts: Counts, couple: Couple) -> Optional[int]:
+    """Index of the winning outcome, or None while several camps are alive."""
+    camps = {kind // 3 for kind, count in enumerate(counts) if count}
+    if couple:
+        camps.update(kind // 3 for kind in couple)
+    if not camps:
+        return OUTCOMES.index(NOBODY)
+    if len(camps) == 1:
+        return camps.pop()
+    return None
+
+
+def _picks(counts: Counts, couple: Couple, wolves: bool = True) -> List[Tuple[float, Kind, bool]]:
+    """Uniform pick among alive players (non-wolves only when `wolves` is False): (probability, kind, in couple)."""
+    weights = [(count, kind, False) for kind, count in enumerate(counts) if count and (wolves or not _is_wolf(kind))]
+    if couple:
+        weights.extend((1, kind, True) for kind in couple if wolves or not _is_wolf(kind))
+    total = sum(weight for weight, _, _ in weights)
+    return [(weight / total, kind, coupled) for weight, kind, coupled in weights]
+
+
+def _kill(counts: Counts, couple: Couple, owed: bool, kind: Kind, coupled: bool):
+    """Kill one player of `kind` (and their lover): new counts, couple, hunter owed and the lover who died."""
+    partner = None
+    if coupled:
+        first, second = couple
+        partner = second if kind == first else first
+        couple = None
+    else:
+        counts = counts[:kind] + (counts[kind] - 1,) + counts[kind + 1:]
+    if kind % 3 == HUNTER or partner is not None and partner % 3 == HUNTER:
+        owed = True
+    return counts, couple, owed, partner
+
+
+def _end_of_phase(step: int, counts: Counts, couple: Couple, owed: bool, heal: bool, poison: bool) -> Node:
+    outcome = _outcome(counts, couple)
+    if outcome is not None:
+        return outcome
+    return (step, counts, couple, owed, heal, poison, None)
+
+
+def _chances(position: Position, pass_rate: float) -> List[Tuple[float, Node]]:
+    """Outcomes of the next step of `position`, with their probabilities."""
+    step, counts, couple, owed, heal, poison, victim = position
+    alive = _alive(counts, couple)
+
+    if step == DAY_HUNTER:
+        if not owed or not alive:
+            return [(1.0, (DAY_VOTE, counts, couple, owed, heal, poison, None))]
+        chances = []
+        for p, kind, coupled in _picks(counts, couple):
+            c, cp, _, _ = _kill(counts, couple, owed, kind, coupled)
+            chances.append((p, (DAY_VOTE, c, cp, False, heal, poison, None)))
+        return chances
+
+    if step == DAY_VOTE:
+        if not alive:
+            return [(1.0, _end_of_phase(NIGHT_WOLVES, counts, couple, owed, heal, poison))]
+        chances = []
+        for p, kind, coupled in _picks(counts, couple):
+            c, cp, o, _ = _kill(counts, couple, owed, kind, coupled)
+            chances.append((p, _end_of_phase(NIGHT_WOLVES, c, cp, o, heal, poison)))
+        return chances
+
+    if step == NIGHT_WOLVES:
+        if not alive:
+            return [(1.0, (NIGHT_POISON, counts, couple, owed, heal, poison, None))]
+        has_prey = any(not _is_wolf(kind) for _, kind, _ in _picks(counts, couple))
+        chances = []
+        for p, kind, coupled in _picks(counts, couple, wolves=not has_prey):
+            c, cp, o, partner = _kill(counts, couple, owed, kind, coupled)
+            chances.append((p, (NIGHT_HEAL, c, cp, o, heal, poison, (kind, partner))))
+        return chances
+
+    if step == NIGHT_HEAL:
+        skip = (NIGHT_POISON, counts, couple, owed, heal, poison, None)
+        if not heal or victim is None:
+            return [(1.0, skip)]
+        kind, partner = victim
+        # The healed player comes back alone: a lover who died with them stays dead
+        revived = counts[:kind] + (counts[kind] + 1,) + counts[kind + 1:]
+        # A healed Hunter is alive again and owes no shot (if the victim's lover was the Hunter, they stay owed)
+        still_owed = owed and kind % 3 != HUNTER
+        return [(pass_rate, skip), (1 - pass_rate, (NIGHT_POISON, revived, couple, still_owed, False, poison, None))]
+
+    # NIGHT_POISON
+    if not poison or not alive:
+        return [(1.0, _end_of_phase(DAY_HUNTER, counts, couple, owed, heal, poison))]
+    chances = [(pass_rate, _end_of_phase(DAY_HUNTER, counts, couple, owed, heal, poison))]
+    for p, kind, coupled in _picks(counts, couple):
+        c, cp, o, _ = _kill(counts, couple, owed, kind, coupled)
+        chances.append(((1 - pass_rate) * p, _end_of_phase(DAY_HUNTER, c, cp, o, heal, False)))
+    return chances
+
+
+class TranspositionTable:
+    """Solved positions (exact odds), bounded in entries; the oldest entries are evicted first."""
+
+    def __init__(self, capacity: int = 1 << 18) -> None:
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._odds: Dict[Position, Odds] = {}
+
+    def __len__(self) -> int:
+        return len(self._odds)
+
+    def __contains__(self, position: Position) -> bool:
+        return position in self._odds
+
+    def get(self, position: Position) -> Optional[Odds]:
+        odds = self._odds.get(position)
+        if odds is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return odds
+
+    def put(self, position: Position, odds: Odds) -> None:
+        if len(self._odds) >= self.capacity:
+            del self._odds[next(iter(self._odds))]
+        self._odds[position] = odds
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+@dataclass
+class WinEstimate:
+    # Outcome (camp value or "nobody") -> probability
+    probabilities: Dict[str, float]
+    # Solved exactly, or sampled with `samples` playouts
+    exact: bool
+    samples: int
+    seconds: float
+
+    def summary(self) -> str:
+        """One line for the game master, e.g. "Villageois 62% | Loup Garou 38%"."""
+        shown = [(o, p) for o, p in self.probabilities.items() if p >= 0.005]
+        odds = " | ".join(f"{o.replace('_', ' ').title()} {p:.0%}" for o, p in shown)
+        if self.exact:
+            return f"Win odds: {odds}"
+        return f"Win odds (~{self.samples} playouts): {odds}"
+
+
+class WinEstimator:
+    """Win probabilities of a game: exact search first (3/4 of the budget up to `exact_players` alive players, half of it above), then playouts."""
+
+    def __init__(
+        self,
+        budget: float = 0.02,
+        exact_players: int = 16,
+        pass_rate: float = 0.5,
+        table: Optional[TranspositionTable] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.budget = budget
+        self.exact_players = exact_players
+        self.pass_rate = pass_rate
+        self.table = table if table is not None else TranspositionTable()
+        self.rng = Random(seed)
+        self._deadline = 0.0
+        self._nodes = 0
+
+    def estimate(self, game: Game, budget: Optional[float] = None) -> WinEstimate:
+        """Odds of `game` from its current position, computed within `budget` seconds."""
+        start = time.perf_counter()
+        budget = self.budget if budget is None else budget
+        end = start + budget
+        node = position_of(game)
+        if isinstance(node, int):
+            return self._result(_certain(node), True, 0, start)
+
+        # The exact search leaves part of the budget to the playouts (half of it for larger positions,
+        # whose solved parts are kept for the next refresh)
+        large = _alive(node[1], node[2]) > self.exact_players
+        self._deadline = end - budget * (0.5 if large else SAMPLING_SHARE)
+        try:
+            return self._result(self.solve(node), True, 0, start)
+        except _OutOfTime:
+            self._deadline = end
+
+        totals = [0.0] * len(OUTCOMES)
+        samples = 0
+        # At least one playout, even when the exact search overran its share
+        while not samples or time.perf_counter() < self._deadline:
+            odds = self._playout(node)
+            totals = [t + p for t, p in zip(totals, odds)]
+            samples += 1
+        return self._result(tuple(t / samples for t in totals), False, samples, start)
+
+    def solve(self, node: Node) -> Odds:
+        """Exact odds of `node` (raises `_OutOfTime` past the deadline; solved positions are kept)."""
+        if isinstance(node, int):
+            return _certain(node)
+        odds = self.table.get(node)
+        if odds is not None:
+            return odds
+        self._nodes += 1
+        if not self._nodes & 0xFF and time.perf_counter() > self._deadline:
+            raise _OutOfTime
+        totals = [0.0] * len(OUTCOMES)
+        for p, child in _chances(node, self.pass_rate):
+            for i, value in enumerate(self.solve(child)):
+                totals[i] += p * value
+        odds = tuple(totals)
+        self.table.put(node, odds)
+        return odds
+
+    def _playout(self, node: Node) -> Odds:
+        """One random continuation, finished exactly once it is small enough (randomly once the time is up)."""
+        solving = True
+        while not isinstance(node, int):
+            if node in self.table:
+                return self.solve(node)
+            if solving and _alive(node[1], node[2]) <= self.exact_players:
+                try:
+                    return self.solve(node)
+                except _OutOfTime:
+                    solving = False
+            draw = self.rng.random()
+            chances = _chances(node, self.pass_rate)
+            for p, child in chances:
+                draw -= p
+                if draw < 0:
+                    break
+            node = child
+        return _certain(node)
+
+    def _result(self, odds: Odds, exact: bool, samples: int, start: float) -> WinEstimate:
+        return WinEstimate(dict(zip(OUTCOMES, odds)), exact, samples, time.perf_counter() - start)
+
+
+def _certain(outcome: int) -> Odds:
+    return tuple(1.0 if i == outcome else 0.0 for i in range(len(OUTCOMES)))
+
+
+def position_of(game: Game) -> Node:
+    """Canonical position of `game` between two phases (the outcome index if it is over)."""
+    if game.period == State.START_UP:
+        raise ValueError("The first night has not been played yet")
+    hunter = game.players.first_with_role(Role.CHASSEUR)
+    sorciere = game.players.first_with_role(Role.SORCIERE)
+
+    counts = [0] * KINDS
+    couple: List[Kind] = []
+    for player in game.players.view(alive=True):
+        tag = WOLF if player.role == Role.LOUP_GAROU else HUNTER if player is hunter else PLAIN
+        kind = CAMP_CODES[player.camp] * 3 + tag
+        lover = player.lover
+        if lover is not None and lover.alive and lover.lover is player:
+            couple.append(kind)
+        else:
+            counts[kind] += 1
+    couple_kinds = tuple(sorted(couple)) if couple else None
+
+    outcome = _outcome(tuple(counts), couple_kinds)
+    if outcome is not None:
+        return outcome
+    # The vote ends the day; any other step means a night was just played
+    step = NIGHT_WOLVES if game.period in (State.DAY_VOTE, State.MAYOR_ELECTION) else DAY_HUNTER
+    owed = hunter is not None and not hunter.alive and hunter.revenge_target is None
+    heal = sorciere is not None and not sorciere.potion_soin_utilisee
+    poison = sorciere is not None and not sorciere.potion_poison_utilisee
+    return (step, tuple(counts), couple_kinds, owed, heal, poison, None)
+
+
+@lru_cache(maxsize=None)
+def default_estimator() -> WinEstimator:
+    return WinEstimator()
+
+
+def estimate_win_probabilities(game: Game, budget: Optional[float] = None) -> WinEstimate:
+    """Odds of `game` with the shared estimator (its transposition table is reused between calls)."""
+    return default_estimator().estimate(game, budget)
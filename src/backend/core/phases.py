@@ -0,0 +1,282 @@
+"""
+Table-driven game flow.
+
+The calling order is compiled once per game, when roles are distributed, into
+a `Schedule`: tuples of `Step(period, role, handler)` for the first night,
+the following nights and the day. Running a phase is a loop over its steps;
+a role step is skipped when nobody holds the role, and its handler gets the
+holder (found through the player table's role index).
+"""
+from dataclasses import dataclass
+from typing import Callable, FrozenSet, Optional, Tuple
+
+from .decisions import Decision
+from .game import ActionType, Game, Player, State
+from .role_distributor import Role
+from .registry import FIRST_NIGHT_ONLY, ROLE_ORDER
+from .telemetry import METRICS, phase_span, step_span
+
+Handler = Callable[[Game, Optional[Player]], None]
+
+
+@dataclass(frozen=True)
+class Step:
+    """One entry of the transition table."""
+
+    period: State
+    # Role whose holder acts, or None for collective steps (wolves, village)
+    role: Optional[Role]
+    handler: Handler
+    announce: str = ""
+
+
+@dataclass(frozen=True)
+class Schedule:
+    """Compiled steps of each phase for one game."""
+
+    first_night: Tuple[Step, ...]
+    night: Tuple[Step, ...]
+    day: Tuple[Step, ...]
+
+
+# Night handlers
+def _choose_lovers(game: Game, cupidon) -> None:
+    if cupidon.lovers_chosen:
+        return
+    cupidon.choose_lovers(game)
+    for lover in cupidon.lovers_chosen:
+        game.save_action(cupidon, ActionType.CHOOSE_LOVERS, lover)
+
+
+def _steal(game: Game, voleur) -> None:
+    target = voleur.choose_player_to_steal(game)
+    if target:
+        game.save_action(voleur, ActionType.STEAL_ROLE, target)
+        # Each player becomes an instance of the class of their new role
+        game.reseat(voleur, role_state_from=target)
+        game.reseat(target, role_state_from=voleur)
+
+
+def _see(game: Game, voyante) -> None:
+    """Run the Voyante investigation and announce the result."""
+    target = voyante.choose_player_to_see(game)
+    if target:
+        game.save_action(voyante, ActionType.REVEAL, target)
+        game.notify(
+            f"🔍 Voyante {voyante.name} sees that {target.name} is a {target.role.value.replace('_', ' ').title()}"
+        )
+
+
+def _wolves(game: Game, _: Optional[Player]) -> None:
+    game.loup_garou_kill()
+
+
+def _potions(game: Game, sorciere) -> None:
+    healed, poisoned = sorciere.choose_player_to_save_or_kill(game)
+    if healed:
+        game.save_action(sorciere, ActionType.HEAL, healed)
+    if poisoned:
+        game.save_action(sorciere, ActionType.POISON, poisoned)
+
+
+NIGHT_STEPS = {
+    Role.CUPIDON: Step(State.CUPIDON, Role.CUPIDON, _choose_lovers, "Cupidon is choosing lovers..."),
+    Role.VOLEUR: Step(State.VOLEUR, Role.VOLEUR, _steal, "Voleur is choosing a player to steal their role..."),
+    Role.VOYANTE: Step(State.VOYANTE, Role.VOYANTE, _see, "Voyante is choosing a player to see..."),
+    Role.SORCIERE: Step(State.SORCIERE, Role.SORCIERE, _potions, "Sorciere is choosing a player to save or kill..."),
+}
+WOLVES_STEP = Step(State.LOUP_GAROU, None, _wolves, "LoupGarou is choosing a player to eliminate...")
+
+
+# Day handlers
+def _hunter_revenge(game: Game, chasseur) -> None:
+    """A dead Hunter who hasn't retaliated yet takes someone with them."""
+    if chasseur.alive or chasseur.revenge_target is not None:
+        return
+    game.notify(f"\n🔫 The Hunter {chasseur.name} has died!")
+    game.notify("They must choose a target to take with them!")
+    target = game.select_player(
+        author=chasseur,
+        alive=True,
+        can_select_self=False,
+        decision=Decision.CHASSEUR_REVENGE,
+    )
+    if target:
+        game.save_action(chasseur, ActionType.REVENGE_KILL, target)
+        # target.kill() is called inside choose_revenge_target
+        chasseur.choose_revenge_target(target)
+        game.notify(f"💥 {chasseur.name} shoots {target.name} with their dying breath!")
+    else:
+        game.notify(f"{chasseur.name} died without shooting anyone.")
+
+
+def _appoint_successor(game: Game, mayor: Player) -> Optional[Player]:
+    """A dead mayor nominates an alive successor (or nobody)."""
+    successor = game.select_player(
+        author=mayor,
+        players=[p for p in game.players if p.alive],
+        alive=True,
+        can_select_self=False,
+        decision=Decision.MAYOR_SUCCESSION,
+    )
+    game.save_action(mayor, ActionType.MAYOR, successor)
+    mayor.is_mayor = False
+    if successor:
+        successor.is_mayor = True
+        game.notify(f"👑 {mayor.name} has appointed {successor.name} as the new Mayor.")
+    return successor
+
+
+def _mayor_succession(game: Game, _: Optional[Player]) -> None:
+    mayor = next((p for p in game.players if p.is_mayor), None)
+    if mayor and not mayor.alive:
+        game.notify(f"⚠️ The Mayor {mayor.name} has died!")
+        game.notify("They must nominate a successor.")
+        if _appoint_successor(game, mayor) is None:
+            game.notify(
+                "No successor selected. The Village remains without a Mayor for now (or a new election will occur)."
+            )
+
+
+def _mayor_election(game: Game, _: Optional[Player]) -> None:
+    if any(p.is_mayor for p in game.players):
+        return
+    game.notify("📢 No Mayor currently. Holding an election!")
+    if game.elect_mayor([p for p in game.players if p.alive]):
+        mayor = next((p for p in game.players if p.is_mayor), None)
+        if mayor:
+            game.notify(f"👑 New Mayor elected: {mayor.name}")
+    else:
+        game.notify("❌ Election failed (tie or no votes).")
+
+
+def _village_vote(game: Game, _: Optional[Player]) -> None:
+    game.notify("\n🗳️ Village Vote")
+    eliminated = game.village_vote_input()
+    # An eliminated mayor nominates a successor immediately
+    if eliminated and eliminated.is_mayor:
+        game.notify(f"\n⚠️ The Mayor {eliminated.name} has been eliminated!")
+        game.notify("They must nominate a successor immediately.")
+        if not any(p.alive for p in game.players):
+            game.save_action(eliminated, ActionType.MAYOR, None)
+        elif _appoint_successor(game, eliminated) is None:
+            game.notify("No successor selected. The Village remains without a Mayor.")
+        eliminated.is_mayor = False
+
+
+DAY_STEPS: Tuple[Step, ...] = (
+    Step(State.DAY_VOTE, Role.CHASSEUR, _hunter_revenge),
+    Step(State.MAYOR_ELECTION, None, _mayor_succession),
+    Step(State.MAYOR_ELECTION, None, _mayor_election),
+    Step(State.DAY_VOTE, None, _village_vote),
+)
+# Periods of the day steps: in a journal, the first of them ends a night
+DAY_PERIODS: FrozenSet[State] = frozenset(step.period for step in DAY_STEPS)
+
+
+def compile_schedule(roles: FrozenSet[Role]) -> Schedule:
+    """Steps of a game holding `roles`, in the `ROLE_ORDER` calling order (wolves before the Sorcière)."""
+    night = []
+    for role in ROLE_ORDER:
+        if role is Role.SORCIERE:
+            night.append(WOLVES_STEP)
+        if role in roles and role in NIGHT_STEPS:
+            night.append(NIGHT_STEPS[role])
+    if WOLVES_STEP not in night:
+        night.append(WOLVES_STEP)
+    return Schedule(
+        first_night=tuple(night),
+        night=tuple(step for step in night if step.role not in FIRST_NIGHT_ONLY),
+        day=tuple(step for step in DAY_STEPS if step.role is None or step.role in roles),
+    )
+
+
+def run_steps(game: Game, steps: Tuple[Step, ...]) -> None:
+    """Run the steps of one phase in order."""
+    for step in steps:
+        actor = None
+        if step.role is not None:
+            actor = game.players.first_with_role(step.role)
+            if actor is None:
+                continue
+        game.period = step.period
+        if step.announce:
+            game.notify(step.announce)
+        with step_span(game, step):
+            step.handler(game, actor)
+
+
+def first_night_process(game: Game) -> None:
+    """Process the first night steps"""
+    game.notify("\n\n🌙 First night")
+    game.notify("=" * 50)
+    with phase_span(game, "first_night"):
+        run_steps(game, game.schedule.first_night)
+
+
+def process_night(game: Game) -> None:
+    """Process the night steps of the roles present"""
+    game.notify("\n\n🌙 Night Phase")
+    game.notify("=" * 50)
+    # Reset recently killed for this night
+    game.recently_killed = []
+    with phase_span(game, "night"):
+        run_steps(game, game.schedule.night)
+    game.notify("Night phase ended.")
+
+
+def process_day(game: Game) -> None:
+    """Process the day steps: Hunter revenge, Mayor checks (election/succession) and Village Vote."""
+    game.notify("\n\n☀️ Day Phase")
+    game.notify("=" * 50)
+    game.period = State.DAY_VOTE
+    with phase_span(game, "day"):
+        run_steps(game, game.schedule.day)
+
+
+def show_odds(game: Game) -> None:
+    """Show the game master the live win probabilities (interactive providers only)."""
+    if not game.provider.verbose:
+        return
+    from .odds import estimate_win_probabilities
+
+    game.notify(f"\n📊 {estimate_win_probabilities(game).summary()}")
+
+
+def play_game(game: Game, after_phase: Optional[Callable[[Game], None]] = None) -> None:
+    """Run a whole game from the first night until `game.is_over()`.
+
+    A game restored between two phases resumes with the next one (the day
+    after a night, the night after a day). `after_phase(game)` is called at
+    the end of every phase, and once more when the game is over, in
+    `State.COMPLETED`.
+    """
+    done = after_phase or (lambda game: None)
+    if game.period is State.START_UP:
+        game.show_players()
+        first_night_process(game)
+        game.show_players()
+        done(game)
+    # The village vote ends the day; any other period means a night was just played
+    day = game.period is not State.DAY_VOTE
+    # Main Game Loop
+    while not game.is_over():
+        show_odds(game)
+        if day:
+            game.notify("\n🗳️ Village Vote (Day Phase)")
+            process_day(game)
+            game.show_players()
+        else:
+            process_night(game)
+            game.round_number += 1
+            game.show_game_state()
+            game.show_players()
+        done(game)
+        day = not day
+    game.period = State.COMPLETED
+    done(game)
+
+    if METRICS.enabled:
+        game.notify("\n⏱️ Timings")
+        for line in METRICS.summary(game.uid):
+            game.notify(line)
@@ -0,0 +1,205 @@
+"""
+Indexed player table: stable integer ids and O(1) lookups by name, role and status.
+"""
+from bisect import insort
+from collections.abc import Sequence
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, Type, TYPE_CHECKING
+
+from .role_distributor import Role
+
+if TYPE_CHECKING:
+    from .game import Camp, Player
+
+# Player attributes whose changes invalidate the table indexes
+INDEXED_ATTRIBUTES = frozenset({"name", "role", "alive", "is_revealed", "lover"})
+
+
+class PlayerTable(Sequence):
+    """List-like container of a game's players with maintained indexes.
+
+    A player's id is its seat (position in the table); replacing a seat, as
+    `Game.distribute_roles` does, keeps the id. Players report their own
+    changes (kill, heal, reveal, lovers, role swap) through
+    `Player.__setattr__`, so the cached views are only rebuilt when one of
+    those happens, and the per-camp alive counters stay exact.
+    """
+
+    __slots__ = ("_players", "_by_name", "_by_role", "_views", "_types", "_counted", "_camp_alive")
+
+    def __init__(self, players: Iterable["Player"] = ()) -> None:
+        self._players: List["Player"] = []
+        self._by_name: Dict[str, "Player"] = {}
+        self._by_role: Dict[Optional[Role], List["Player"]] = {}
+        self._views: Dict[Tuple[Optional[bool], Optional[bool]], Tuple["Player", ...]] = {}
+        self._types: Optional[FrozenSet[type]] = None
+        # Camp each seat is counted in (None when dead) and alive players per camp
+        self._counted: List[Optional["Camp"]] = []
+        self._camp_alive: Dict["Camp", int] = {}
+        for player in players:
+            self.append(player)
+
+    # Sequence protocol
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def __iter__(self) -> Iterator["Player"]:
+        return iter(self._players)
+
+    def __getitem__(self, index):
+        return self._players[index]
+
+    def __contains__(self, player: object) -> bool:
+        return getattr(player, "_table", None) is self
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PlayerTable):
+            other = other._players
+        return self._players == other
+
+    def __repr__(self) -> str:
+        return f"PlayerTable({self._players!r})"
+
+    def index(self, player: "Player") -> int:
+        return player.player_id if player in self else self._players.index(player)
+
+    def append(self, player: "Player") -> None:
+        self._attach(player, len(self._players))
+        self._players.append(player)
+        self._counted.append(None)
+        self._index(player)
+        self._count(player)
+
+    def __setitem__(self, index: int, player: "Player") -> None:
+        seat = range(len(self._players))[index]
+        old = self._players[seat]
+        _remove(self._by_role[old.role], old)
+        object.__setattr__(old, "_table", None)
+        self._attach(player, seat)
+        self._players[seat] = player
+        self._index(player)
+        self._count(player)
+        if player.name != old.name:
+            self._rebuild_names()
+        elif self._by_name.get(old.name) is old:
+            self._by_name[old.name] = player
+
+    # Lookups
+    def get(self, player_id: int) -> "Player":
+        """Return the player with a given stable id."""
+        return self._players[player_id]
+
+    def by_name(self, name: str) -> Optional["Player"]:
+        """First player named `name`, or None."""
+        return self._by_name.get(name)
+
+    def with_role(self, role: Optional[Role]) -> Tuple["Player", ...]:
+        """Players currently holding `role`, in seat order."""
+        return tuple(self._by_role.get(role, ()))
+
+    def first_with_role(self, role: Optional[Role]) -> Optional["Player"]:
+        holders = self._by_role.get(role)
+        return holders[0] if holders else None
+
+    def types(self) -> FrozenSet[type]:
+        """Set of player classes present (role classes like `Sorciere`, or `Player`)."""
+        if self._types is None:
+            self._types = frozenset(type(player) for player in self._players)
+        return self._types
+
+    def view(self, alive: Optional[bool] = None, is_revealed: Optional[bool] = None) -> Tuple["Player", ...]:
+        """Players matching the status filters (None means any); cached until a status changes."""
+        key = (alive, is_revealed)
+        cached = self._views.get(key)
+        if cached is None:
+            cached = tuple(
+                player
+                for player in self._players
+                if (alive is None or player.alive == alive)
+                and (is_revealed is None or player.is_revealed == is_revealed)
+            )
+            self._views[key] = cached
+        return cached
+
+    def alive_by_camp(self) -> Dict["Camp", int]:
+        """Alive players per camp, maintained incrementally (camps with nobody alive may be absent)."""
+        return dict(self._camp_alive)
+
+    def recount_camps(self) -> Dict["Camp", int]:
+        """Alive players per camp, recomputed from scratch."""
+        counts: Dict["Camp", int] = {}
+        for player in self._players:
+            if player.alive:
+                counts[player.camp] = counts.get(player.camp, 0) + 1
+        return counts
+
+    def check_camp_counters(self) -> None:
+        """Raise AssertionError if the incremental counters drifted from a full recount."""
+        expected = self.recount_camps()
+        actual = {camp: n for camp, n in self._camp_alive.items() if n}
+        if actual != expected:
+            raise AssertionError(f"Camp counters out of sync: {actual} != {expected}")
+
+    # Index maintenance
+    def _attach(self, player: "Player", seat: int) -> None:
+        if player in self:
+            raise ValueError(f"{player.name} is already seated in this table")
+        object.__setattr__(player, "player_id", seat)
+        object.__setattr__(player, "_table", self)
+
+    def _index(self, player: "Player") -> None:
+        self._by_name.setdefault(player.name, player)
+        insort(self._by_role.setdefault(player.role, []), player, key=_seat)
+        self._views.clear()
+        self._types = None
+
+    def _count(self, player: "Player") -> None:
+        """Move `player` to the camp counter matching its current camp/alive state."""
+        seat = player.player_id
+        old = self._counted[seat]
+        new = player.camp if player.alive else None
+        if old is new:
+            return
+        if old is not None:
+            self._camp_alive[old] -= 1
+        if new is not None:
+            self._camp_alive[new] = self._camp_alive.get(new, 0) + 1
+        self._counted[seat] = new
+
+    def _rebuild_names(self) -> None:
+        self._by_name = {}
+        for player in self._players:
+            self._by_name.setdefault(player.name, player)
+
+    def player_changed(self, player: "Player", attribute: str, old: object) -> None:
+        """Called by `Player.__setattr__` after one of `INDEXED_ATTRIBUTES` changed."""
+        if attribute == "role":
+            _remove(self._by_role[old], player)
+            insort(self._by_role.setdefault(player.role, []), player, key=_seat)
+            # Rare (Voleur): whoever loves this player may change camp too
+            for other in self._players:
+                self._count(other)
+        elif attribute == "name":
+            self._rebuild_names()
+        elif attribute == "lover":
+            self._count(player)
+        else:
+            self._views.clear()
+            if attribute == "alive":
+                self._count(player)
+
+
+def role_of(role_class: Type) -> Optional[Role]:
+    """Role enum matching a role class name (`Sorciere` -> `Role.SORCIERE`), or None."""
+    return Role.__members__.get(role_class.__name__.upper())
+
+
+def _seat(player: "Player") -> int:
+    return player.player_id
+
+
+def _remove(players: List["Player"], player: "Player") -> None:
+    """Remove `player` by identity (dataclass equality compares fields)."""
+    for i, other in enumerate(players):
+        if other is player:
+            del players[i]
+            return
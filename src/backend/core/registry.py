@@ -0,0 +1,37 @@
+"""
+Role registry: the calling order, the first-night-only roles and the class
+of each role, declared once.
+
+Only names are declared here, so importing the rules does not import the
+role implementations; `role_class` imports `roles.py` the first time a
+class is actually needed (seating players) and caches the result.
+"""
+from functools import lru_cache
+from importlib import import_module
+from typing import Dict, FrozenSet, Optional, Tuple, Type
+
+from .role_distributor import Role
+
+# Night calling order ("ordre d'appel"); the Chasseur only acts when dying
+ROLE_ORDER: Tuple[Role, ...] = (Role.CUPIDON, Role.VOLEUR, Role.VOYANTE, Role.SORCIERE, Role.CHASSEUR)
+# Roles only called on the first night
+FIRST_NIGHT_ONLY: FrozenSet[Role] = frozenset({Role.CUPIDON, Role.VOLEUR})
+
+# Role -> (module relative to this package, class name); other roles are plain players
+ROLE_CLASSES: Dict[Role, Tuple[str, str]] = {
+    Role.CUPIDON: (".roles", "Cupidon"),
+    Role.VOLEUR: (".roles", "Voleur"),
+    Role.VOYANTE: (".roles", "Voyante"),
+    Role.SORCIERE: (".roles", "Sorciere"),
+    Role.CHASSEUR: (".roles", "Chasseur"),
+}
+
+
+@lru_cache(maxsize=None)
+def role_class(role: Optional[Role]) -> Type:
+    """Class of the players holding `role` (`Player` when it has no class of its own)."""
+    entry = ROLE_CLASSES.get(role)
+    if entry is None:
+        return import_module(".game", __package__).Player
+    module, name = entry
+    return getattr(import_module(module, __package__), name)
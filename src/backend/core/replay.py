@@ -0,0 +1,219 @@
+"""
+Replays of recorded games, with checkpoints for fast seeking.
+
+A replay is a start snapshot (`Game.snapshot()` taken before the actions to
+replay) and the game's action journal. `apply_action` turns one journal
+record back into its effect on a game. Every `every` actions a snapshot of
+the replayed position is kept as a checkpoint, so `seek(index)` restores the
+nearest checkpoint at or before `index` (binary search) and applies at most
+`every - 1` actions; checkpoints past the last one are made on first use.
+`find(round, period)` binary-searches the journal for "round 3, after the
+wolves acted"; the engine counts rounds from one night to the next, so round
+1 holds two nights and `phase` tells them apart. A replay file stores the start snapshot, the journal and all
+the checkpoints:
+
+    replay = Replay(start, game.journal)
+    replay.save("game.wwr")
+    position = Replay.load("game.wwr").seek_to(3, State.LOUP_GAROU)
+"""
+import os
+import struct
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Tuple, Union
+
+from .decisions import DecisionProvider
+from .game import ActionType, Game, State
+from .journal import NO_PLAYER, ActionJournal, JournalRecord, _RecordView
+from .phases import DAY_PERIODS
+
+MAGIC = b"WWR1"
+VERSION = 1
+DEFAULT_EVERY = 32
+
+# magic, version, checkpoint interval, checkpoints, start snapshot bytes, journal bytes
+HEADER = struct.Struct("<4sHHIII")
+# action index, snapshot bytes
+CHECKPOINT = struct.Struct("<II")
+
+
+def apply_action(game: Game, record: JournalRecord) -> None:
+    """Redo the effect of one journal record on `game` (without journaling it again)."""
+    game.round_number = record.round_number
+    game.period = record.period
+    actor = game.players[record.actor] if record.actor != NO_PLAYER else None
+    target = game.players[record.target] if record.target != NO_PLAYER else None
+    action = record.action
+
+    if action is ActionType.KILL:
+        game.recently_killed = [target]
+        target.kill()
+    elif action is ActionType.VOTE:
+        game.village_vote(target)
+    elif action is ActionType.HEAL:
+        actor.heal(target)
+        if target in game.recently_killed:
+            game.recently_killed.remove(target)
+    elif action is ActionType.POISON:
+        actor.poison(target)
+    elif action is ActionType.REVEAL:
+        actor.investigations[target.name] = target.role
+    elif action is ActionType.CHOOSE_LOVERS:
+        # One record per lover; they are bound once both are known
+        actor.lovers_chosen += (target,)
+        if len(actor.lovers_chosen) == 2:
+            first, second = actor.lovers_chosen
+            first.lover, second.lover = second, first
+    elif action is ActionType.STEAL_ROLE:
+        actor.steal_role(target)
+        game.reseat(actor, role_state_from=target)
+        game.reseat(target, role_state_from=actor)
+    elif action is ActionType.REVENGE_KILL:
+        actor.choose_revenge_target(target)
+    elif action is ActionType.MAYOR:
+        if actor is not None:
+            actor.is_mayor = False
+        if target is not None:
+            for player in game.players:
+                player.is_mayor = False
+            target.is_mayor = True
+
+
+class Replay:
+    """Positions of a recorded game, by number of actions applied."""
+
+    def __init__(
+        self,
+        start: bytes,
+        journal: _RecordView,
+        every: int = DEFAULT_EVERY,
+        checkpoints: Optional[List[Tuple[int, bytes]]] = None,
+    ) -> None:
+        self.start = start
+        self.every = every
+        game = Game.restore(start, DecisionProvider())
+        # Records already in the start snapshot were played before it
+        self.offset = len(game.journal)
+        # An `ActionJournal` or a `JournalReader` (archived game)
+        self.journal = journal
+        # (actions applied, snapshot), sorted; checkpoints hold an empty journal
+        self.checkpoints = checkpoints or [(0, self._checkpoint(game))]
+        self._indexes = [index for index, _ in self.checkpoints]
+
+    def __len__(self) -> int:
+        """Number of actions that can be replayed."""
+        return len(self.journal) - self.offset
+
+    def record(self, index: int) -> JournalRecord:
+        """The `index`-th replayed action (0-based)."""
+        return self.journal[self.offset + index]
+
+    def seek(self, index: int) -> Game:
+        """Position after the first `index` actions (a new silent `Game`)."""
+        if not 0 <= index <= len(self):
+            raise IndexError(f"Action {index} out of range (0 to {len(self)})")
+        position = bisect_right(self._indexes, index) - 1
+        applied, snapshot = self.checkpoints[position]
+        game = Game.restore(snapshot, DecisionProvider())
+        while applied < index:
+            apply_action(game, self.record(applied))
+            applied += 1
+            if applied % self.every == 0 and applied > self._indexes[-1]:
+                self.checkpoints.append((applied, self._checkpoint(game)))
+                self._indexes.append(applied)
+        if index == len(self) and game.is_over():
+            # Winner, status and period of a finished game
+            game.period = State.COMPLETED
+        return game
+
+    def find(self, round_number: int, period: Optional[State] = None, phase: int = 1) -> int:
+        """Number of actions up to the end of `round_number`, or right after its `period`.
+
+        A round runs from one night to the next (round 1 holds the first night,
+        day 1 and the second night): `period` is looked up in the `phase`-th
+        night of the round, or its `phase`-th day for a day period. So
+        `find(1, State.LOUP_GAROU)` is right after the first night's wolves and
+        `find(1, State.LOUP_GAROU, phase=2)` after the second night's.
+        """
+        # Rounds never decrease along the journal
+        start = bisect_left(range(len(self)), round_number, key=self._round)
+        end = bisect_right(range(len(self)), round_number, key=self._round)
+        if period is None:
+            return end
+        day = period in DAY_PERIODS
+        seen, found, previous = 0, None, None
+        for index in range(start, end):
+            record = self.record(index)
+            in_day = record.period in DAY_PERIODS
+            if in_day == day and in_day != previous:
+                seen += 1
+                if seen > phase:
+                    break
+            previous = in_day
+            if seen == phase and record.period == period:
+                found = index + 1
+        if found is None:
+            raise LookupError(f"No {period.value} action in phase {phase} of round {round_number}")
+        return found
+
+    def seek_to(self, round_number: int, period: Optional[State] = None, phase: int = 1) -> Game:
+        """Position at the end of a round, or right after one of its periods ("round 3, after the wolves")."""
+        return self.seek(self.find(round_number, period, phase))
+
+    def build_checkpoints(self) -> None:
+        """Make every checkpoint (before saving)."""
+        last = len(self) // self.every * self.every
+        if last > self._indexes[-1]:
+            self.seek(last)
+
+    def to_bytes(self) -> bytes:
+        self.build_checkpoints()
+        journal = bytes(self.journal.raw())
+        parts = [
+            HEADER.pack(MAGIC, VERSION, self.every, len(self.checkpoints), len(self.start), len(journal)),
+            self.start,
+            journal,
+        ]
+        for index, snapshot in self.checkpoints:
+            parts.append(CHECKPOINT.pack(index, len(snapshot)))
+            parts.append(snapshot)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        magic, version, every, count, start_size, journal_size = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a version {VERSION} replay")
+        offset = HEADER.size
+        start = data[offset:offset + start_size]
+        offset += start_size
+        journal = ActionJournal(data[offset:offset + journal_size])
+        offset += journal_size
+        checkpoints = []
+        for _ in range(count):
+            index, size = CHECKPOINT.unpack_from(data, offset)
+            offset += CHECKPOINT.size
+            checkpoints.append((index, data[offset:offset + size]))
+            offset += size
+        return cls(start, journal, every, checkpoints)
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        tmp = f"{os.fspath(path)}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(self.to_bytes())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "Replay":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def _round(self, index: int) -> int:
+        return self.record(index).round_number
+
+    @staticmethod
+    def _checkpoint(game: Game) -> bytes:
+        journal, game.journal = game.journal, type(game.journal)()
+        try:
+            return game.snapshot()
+        finally:
+            game.journal = journal
@@ -1,6 +1,8 @@
 from enum import Enum
-from typing import Dict
-import inquirer
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .decisions import DecisionProvider
 
 
 class Role(Enum):
@@ -54,6 +56,9 @@ ROLE_DISTRIBUTIONS = {
     ],
 }
 
+# Largest table offered when choosing the number of players
+MAX_PLAYERS = 30
+
 
 def _format_role_distribution(distribution: Dict[Role, int]) -> str:
     """Format a role distribution for display"""
@@ -65,7 +70,7 @@ def _format_role_distribution(distribution: Dict[Role, int]) -> str:
 
 
 def _calculate_balance_score(distribution: Dict[Role, int]) -> str:
-    """Calculate and return a balance indicator for the distribution"""
+    """Calculate and return a balance indicator for the distribution (fallback when no simulation is cached)"""
     total_players = sum(distribution.values())
     wolves = distribution.get(Role.LOUP_GAROU, 0)
     specials = sum(count for role, count in distribution.items() if role not in [Role.VILLAGEOIS, Role.LOUP_GAROU])
@@ -81,42 +86,39 @@ def _calculate_balance_score(distribution: Dict[Role, int]) -> str:
         return "⚖️ Balanced"
 
 
-def set_lineup(num_players: int) -> Dict[Role, int]:
-    """Calculate optimal role distribution for given number of players with GM selection"""
-    variants = ROLE_DISTRIBUTIONS[num_players]
+def lineup_labels(num_players: int, variants: List[Dict[Role, int]]) -> List[str]:
+    """Menu labels for `variants`: measured balance when cached, heuristic otherwise, then the roles"""
+    from .balance import load_balance
 
-    # Present options to game master
-    print(f"\n🎮 Game Master: Choose lineup for {num_players} players")
-    print("=" * 60)
+    # Measured win rates if `python -m src.backend.api.balance` was run for this table
+    measured = load_balance()
 
-    choices = []
+    labels = []
     for i, variant in enumerate(variants):
-        balance = _calculate_balance_score(variant)
-        description = _format_role_distribution(variant)
-        choice_text = f"Lineup {i+1} ({balance}): {description}"
-        choices.append(choice_text)
-
-    questions = [
-        inquirer.List(
-            'lineup',
-            message="Select a lineup",
-            choices=choices,
-            carousel=True
-        ),
-    ]
-
-    try:
-        answers = inquirer.prompt(questions)
-        if answers:
-            # Extract lineup index from choice
-            selected_index = int(answers['lineup'].split()[1]) - 1
-            selected_variant = variants[selected_index]
-
-            print(f"\n✅ Selected lineup: {_format_role_distribution(selected_variant)}")
-            return selected_variant.copy()
+        if measured and num_players in measured and i < len(measured[num_players]):
+            balance = measured[num_players][i].summary()
         else:
-            # Fallback to first variant if cancelled
-            return variants[0].copy()
-    except (KeyboardInterrupt, EOFError):
-        print("\n⚠️ Selection cancelled, using default variant")
+            balance = _calculate_balance_score(variant)
+        description = _format_role_distribution(variant)
+        labels.append(f"({balance}): {description}")
+    return labels
+
+
+def set_lineup(num_players: int, provider: Optional["DecisionProvider"] = None) -> Dict[Role, int]:
+    """Calculate optimal role distribution for given number of players with GM selection"""
+    if provider is None:
+        from .decisions import default_provider
+        provider = default_provider()
+
+    from .lineup_catalog import lineups_for
+
+    variants = lineups_for(num_players)
+
+    selected_index = provider.choose_lineup(num_players, variants)
+    if selected_index is None:
+        # Fallback to first variant if cancelled
         return variants[0].copy()
+
+    selected_variant = variants[selected_index]
+    provider.notify(f"\n✅ Selected lineup: {_format_role_distribution(selected_variant)}")
+    return selected_variant.copy()
@@ -1,11 +1,11 @@
 from dataclasses import dataclass, field
-from typing import Optional, Dict
-import click
+from typing import Optional, Dict, Tuple
+from .decisions import Decision
 from .game import Player, Game
 from .role_distributor import Role
 
 
-@dataclass
+@dataclass(slots=True)
 class Sorciere(Player):
     """Witch role: can heal or poison once."""
 
@@ -22,7 +22,9 @@ class Sorciere(Player):
             self.potion_poison_utilisee = True
             target.kill()
 
-    def choose_player_to_save_or_kill(self, game: "Game") -> None:  # type: ignore[name-defined]
+    def choose_player_to_save_or_kill(self, game: "Game") -> Tuple[Optional[Player], Optional[Player]]:  # type: ignore[name-defined]
+        """Offer both potions; returns the (healed, poisoned) players."""
+        save_choice = poison_choice = None
         if not self.potion_soin_utilisee and game.recently_killed:
 
             save_choice = game.select_player(
@@ -31,6 +33,7 @@ class Sorciere(Player):
                 alive=False,
                 can_select_self=True,
                 can_select_none=True,
+                decision=Decision.SORCIERE_HEAL,
             )
             if save_choice:
                 self.heal(save_choice)
@@ -38,38 +41,39 @@ class Sorciere(Player):
 
         if not self.potion_poison_utilisee:
             poison_choice = game.select_player(
-                author=self, alive=True, can_select_self=True, can_select_none=True
+                author=self,
+                alive=True,
+                can_select_self=True,
+                can_select_none=True,
+                decision=Decision.SORCIERE_POISON,
             )
             if poison_choice:
                 self.poison(poison_choice)
+        return save_choice, poison_choice
 
 
-@dataclass
+@dataclass(slots=True)
 class Voyante(Player):
     """Seer role: can reveal a player's role."""
 
     investigations: Dict[str, Role] = field(default_factory=dict)
 
-    def choose_player_to_see(self, game: "Game") -> None:  # type: ignore[name-defined]
-        available_players = [
-            player
-            for player in game.players
-            if player.name not in self.investigations
-        ]
+    def choose_player_to_see(self, game: "Game") -> Optional[Player]:  # type: ignore[name-defined]
+        """Investigate a player not seen yet; returns the investigated player."""
         target = game.select_player(
             author=self,
-            players=available_players,
             alive=True,
             can_select_self=False,
+            excluded_names=self.investigations.keys(),
+            decision=Decision.VOYANTE_SEE,
         )
         if target and target.name not in self.investigations:
             self.investigations[target.name] = target.role
-            click.echo(
-                f"🔍 Voyante {self.name} sees that {target.name} is a {target.role.value.replace('_', ' ').title()}"
-            )
+            return target
+        return None
 
 
-@dataclass
+@dataclass(slots=True)
 class Chasseur(Player):
     """Hunter role: chooses a revenge target when dying."""
 
@@ -81,14 +85,19 @@ class Chasseur(Player):
             target.kill()
 
 
-@dataclass
+@dataclass(slots=True)
 class Cupidon(Player):
     """Cupid: binds two players as lovers."""
 
     lovers_chosen: tuple = field(default_factory=tuple)
 
     def choose_lovers(self, game: "Game") -> None:  # type: ignore[name-defined]
-        player1 = game.select_player(author=self, alive=True, can_select_self=True)
+        player1 = game.select_player(
+            author=self,
+            alive=True,
+            can_select_self=True,
+            decision=Decision.CUPIDON_LOVERS,
+        )
         if not player1:
             return
         player2 = game.select_player(
@@ -96,6 +105,7 @@ class Cupidon(Player):
             players=[p for p in game.players if p != player1],
             alive=True,
             can_select_self=True,
+            decision=Decision.CUPIDON_LOVERS,
         )
         if player2 and not self.lovers_chosen:
             self.lovers_chosen = (player1, player2)
@@ -103,7 +113,7 @@ class Cupidon(Player):
             player2.lover = player1
 
 
-@dataclass
+@dataclass(slots=True)
 class Voleur(Player):
     """Thief: can steal another player's role at the beginning."""
 
@@ -116,3 +126,18 @@ class Voleur(Player):
             target.role = self.role
             self.role = self.original_role
             self.role_stolen = True
+
+    def choose_player_to_steal(self, game: "Game") -> Optional[Player]:  # type: ignore[name-defined]
+        """Pick a player to swap roles with; returns the robbed player."""
+        if self.role_stolen:
+            return None
+        target = game.select_player(
+            author=self,
+            alive=True,
+            can_select_self=False,
+            can_select_none=True,
+            decision=Decision.VOLEUR_STEAL,
+        )
+        if target:
+            self.steal_role(target)
+        return target
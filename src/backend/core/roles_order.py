@@ -2,19 +2,19 @@
 """
 Définit l'ordre prédéfini d'appel des rôles pour le jeu du Loup-Garou.
 Inclut une fonction utilitaire pour déterminer l'ordre des rôles à appeler selon les rôles présents dans la partie.
+L'ordre lui-même est déclaré une seule fois dans `registry.ROLE_ORDER` : les classes des rôles
+ne sont importées qu'au premier accès à `ROLES_ORDER`.
 """
 
 from typing import List, Type
-from src.backend.core.roles import Cupidon, Voleur, Voyante, Sorciere, Chasseur
+from .registry import ROLE_ORDER, role_class
 
-# Ordre classique des rôles pour la nuit du Loup-Garou
-ROLES_ORDER: List[Type] = [
-    Cupidon,  # Cupidon agit en premier (première nuit)
-    Voleur,  # Voleur (première nuit)
-    Voyante,  # Voyante
-    Sorciere,  # Sorcière
-    Chasseur,  # Chasseur (agit à la mort, mais on le garde pour l'ordre)
-]
+
+def __getattr__(name: str):
+    # Ordre classique des rôles pour la nuit du Loup-Garou (classes chargées à la demande)
+    if name == "ROLES_ORDER":
+        return [role_class(role) for role in ROLE_ORDER]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_roles_order_for_game(game) -> List[Type]:
@@ -24,5 +24,5 @@ def get_roles_order_for_game(game) -> List[Type]:
     :param game: instance de Game
     :return: liste ordonnée des classes de rôles présents dans la partie
     """
-    present_roles = set(type(player) for player in game.players)
-    return [role for role in ROLES_ORDER if role in present_roles]
+    present_roles = game.players.types()
+    return [role_class(role) for role in ROLE_ORDER if role_class(role) in present_roles]
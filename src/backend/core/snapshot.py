@@ -0,0 +1,191 @@
+"""
+Versioned binary snapshots of a `Game` (used by `Game.snapshot`, `Game.restore` and `Game.fork`).
+
+Layout (little endian): a fixed game header, the lineup, the recently
+killed seats, one record per player (fixed part, name, then the fields of
+its role class) and finally the raw action journal. Player references
+(lovers, Chasseur target, Cupidon choices) are stored as seats.
+"""
+import struct
+from typing import Dict, List, Optional
+
+from .decisions import DecisionProvider
+from .game import Camp, Game, GameStatus, Player, State
+from .journal import NO_PLAYER, ActionJournal
+from .role_distributor import Role
+from .roles import Chasseur, Cupidon, Sorciere, Voleur, Voyante
+
+MAGIC = b"WWS1"
+VERSION = 1
+NONE = 0xFF
+
+# magic, version, status, period, winner, debug, round, uid, players, lineup entries, recently killed, journal bytes
+GAME = struct.Struct("<4sBBBBBH8sHBBI")
+LINEUP_ENTRY = struct.Struct("<BH")
+SEAT = struct.Struct("<h")
+# class code, role code, flags, lover seat, name length
+PLAYER = struct.Struct("<BBBhH")
+CODE = struct.Struct("<B")
+
+ALIVE, REVEALED, MAYOR, HEAL_USED, POISON_USED, ROLE_STOLEN = (1 << i for i in range(6))
+
+CLASSES = (Player, Sorciere, Voyante, Chasseur, Cupidon, Voleur)
+CLASS_CODES = {cls: code for code, cls in enumerate(CLASSES)}
+ROLES = tuple(Role)
+ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+STATUSES = tuple(GameStatus)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+PERIODS = tuple(State)
+PERIOD_CODES = {period: code for code, period in enumerate(PERIODS)}
+CAMPS = tuple(Camp)
+CAMP_CODES = {camp: code for code, camp in enumerate(CAMPS)}
+
+
+def _role_code(role: Optional[Role]) -> int:
+    return NONE if role is None else ROLE_CODES[role]
+
+
+def _seat(player: Optional[Player]) -> int:
+    return NO_PLAYER if player is None else player.player_id
+
+
+def dump_game(game: Game) -> bytes:
+    """Serialize `game` (players, roles, lovers, potions, journal...) into bytes."""
+    journal = game.journal.raw()
+    parts: List[bytes] = [
+        GAME.pack(
+            MAGIC,
+            VERSION,
+            STATUS_CODES[game.status],
+            PERIOD_CODES[game.period],
+            NONE if game.winner is None else CAMP_CODES[game.winner],
+            game.debug,
+            game.round_number,
+            game.uid.encode("ascii")[:8],
+            len(game.players),
+            len(game.lineup),
+            len(game.recently_killed),
+            len(journal),
+        )
+    ]
+    parts.extend(LINEUP_ENTRY.pack(ROLE_CODES[role], count) for role, count in game.lineup.items())
+    parts.extend(SEAT.pack(_seat(p)) for p in game.recently_killed)
+
+    for player in game.players:
+        name = player.name.encode("utf-8")
+        flags = (
+            (ALIVE if player.alive else 0)
+            | (REVEALED if player.is_revealed else 0)
+            | (MAYOR if player.is_mayor else 0)
+        )
+        extra = b""
+        if isinstance(player, Sorciere):
+            flags |= (HEAL_USED if player.potion_soin_utilisee else 0) | (POISON_USED if player.potion_poison_utilisee else 0)
+        elif isinstance(player, Voleur):
+            flags |= ROLE_STOLEN if player.role_stolen else 0
+            extra = CODE.pack(_role_code(player.original_role))
+        elif isinstance(player, Chasseur):
+            extra = SEAT.pack(_seat(player.revenge_target))
+        elif isinstance(player, Cupidon):
+            extra = CODE.pack(len(player.lovers_chosen)) + b"".join(SEAT.pack(_seat(p)) for p in player.lovers_chosen)
+        elif isinstance(player, Voyante):
+            entries = [CODE.pack(len(player.investigations))]
+            for seen, role in player.investigations.items():
+                seen_name = seen.encode("utf-8")
+                entries.append(SEAT.pack(len(seen_name)) + seen_name + CODE.pack(_role_code(role)))
+            extra = b"".join(entries)
+        parts.append(
+            PLAYER.pack(CLASS_CODES[type(player)], _role_code(player.role), flags, _seat(player.lover), len(name))
+        )
+        parts.append(name)
+        parts.append(extra)
+
+    parts.append(bytes(journal))
+    return b"".join(parts)
+
+
+def load_game(data: bytes, provider: Optional[DecisionProvider] = None) -> Game:
+    """Rebuild a `Game` from `dump_game` output (without a provider, the default one is created on first use)."""
+    view = memoryview(data)
+    (magic, version, status, period, winner, debug, round_number, uid,
+     n_players, n_lineup, n_recent, journal_size) = GAME.unpack_from(view)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a version {VERSION} game snapshot")
+    offset = GAME.size
+
+    lineup: Dict[Role, int] = {}
+    for _ in range(n_lineup):
+        role, count = LINEUP_ENTRY.unpack_from(view, offset)
+        lineup[ROLES[role]] = count
+        offset += LINEUP_ENTRY.size
+    recent = [SEAT.unpack_from(view, offset + i * SEAT.size)[0] for i in range(n_recent)]
+    offset += n_recent * SEAT.size
+
+    players: List[Player] = []
+    # (player, lover seat, role-specific seats to resolve once everyone exists)
+    links = []
+    for _ in range(n_players):
+        class_code, role, flags, lover, name_size = PLAYER.unpack_from(view, offset)
+        offset += PLAYER.size
+        name = str(view[offset:offset + name_size], "utf-8")
+        offset += name_size
+        cls = CLASSES[class_code]
+        player = cls(
+            name=name,
+            role=None if role == NONE else ROLES[role],
+            alive=bool(flags & ALIVE),
+            is_revealed=bool(flags & REVEALED),
+            is_mayor=bool(flags & MAYOR),
+        )
+        seats = ()
+        if cls is Sorciere:
+            player.potion_soin_utilisee = bool(flags & HEAL_USED)
+            player.potion_poison_utilisee = bool(flags & POISON_USED)
+        elif cls is Voleur:
+            player.role_stolen = bool(flags & ROLE_STOLEN)
+            original = view[offset]
+            player.original_role = None if original == NONE else ROLES[original]
+            offset += CODE.size
+        elif cls is Chasseur:
+            seats = SEAT.unpack_from(view, offset)
+            offset += SEAT.size
+        elif cls is Cupidon:
+            count = view[offset]
+            offset += CODE.size
+            seats = tuple(SEAT.unpack_from(view, offset + i * SEAT.size)[0] for i in range(count))
+            offset += count * SEAT.size
+        elif cls is Voyante:
+            count = view[offset]
+            offset += CODE.size
+            for _ in range(count):
+                (size,) = SEAT.unpack_from(view, offset)
+                offset += SEAT.size
+                seen = str(view[offset:offset + size], "utf-8")
+                offset += size
+                code = view[offset]
+                offset += CODE.size
+                player.investigations[seen] = None if code == NONE else ROLES[code]
+        players.append(player)
+        links.append((player, lover, seats))
+
+    # Silent shell game: the setup path would prompt and notify through the default provider
+    game = Game(0, provider=DecisionProvider())
+    game.provider = provider
+    game.uid = bytes(uid).rstrip(b"\0").decode("ascii")
+    game.status = STATUSES[status]
+    game.period = PERIODS[period]
+    game.winner = None if winner == NONE else CAMPS[winner]
+    game.debug = bool(debug)
+    game.round_number = round_number
+    game.lineup = lineup
+    game.players = players
+    for player, lover, seats in links:
+        if lover != NO_PLAYER:
+            player.lover = players[lover]
+        if isinstance(player, Chasseur):
+            player.revenge_target = None if seats[0] == NO_PLAYER else players[seats[0]]
+        elif isinstance(player, Cupidon):
+            player.lovers_chosen = tuple(players[seat] for seat in seats)
+    game.recently_killed = [players[seat] for seat in recent]
+    game.journal = ActionJournal(view[offset:offset + journal_size])
+    return game
@@ -0,0 +1,237 @@
+"""
+Engine timings: spans recorded into latency histograms, exported in the Prometheus text format.
+
+Phases, role steps and decisions are timed with labels (game uid, round,
+phase, role, decision). Disabled by default: the span helpers then return a
+shared no-op context after a single flag check. Enable with
+`METRICS.enable()` or the `WEREWOLVES_METRICS=1` environment variable.
+
+    METRICS.enable()
+    play_game(game)                  # ends with a per-game timing summary
+    METRICS.write("werewolves.prom")  # or GET /metrics on the table server
+"""
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from .decisions import Decision
+    from .game import Game, Player
+    from .phases import Step
+
+PHASE_SECONDS = "werewolves_phase_seconds"
+STEP_SECONDS = "werewolves_step_seconds"
+DECISION_SECONDS = "werewolves_decision_seconds"
+CUE_LATENCY_SECONDS = "werewolves_cue_latency_seconds"
+HELP = {
+    PHASE_SECONDS: "Duration of a game phase (first night, night, day).",
+    STEP_SECONDS: "Duration of one step of a phase (a role acting, the wolves, the vote...).",
+    DECISION_SECONDS: "Time spent waiting for a decision (game master or device).",
+    CUE_LATENCY_SECONDS: "Delay from the end of a spoken GM cue to the matching game state change.",
+}
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, math.inf
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Observation counts per bucket (upper bounds), with their sum, count and max."""
+
+    __slots__ = ("buckets", "counts", "sum", "count", "max")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+
+class Span:
+    """Context timing its block into one histogram."""
+
+    __slots__ = ("metrics", "name", "labels", "start")
+
+    def __init__(self, metrics: "Metrics", name: str, labels: Labels) -> None:
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.metrics.record(self.name, self.labels, time.perf_counter() - self.start)
+
+
+class NullSpan:
+    """Span used while metrics are disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class Metrics:
+    """Histograms keyed by metric name and labels (thread-safe)."""
+
+    def __init__(self, enabled: bool = False, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.enabled = enabled
+        self.buckets = buckets
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """Drop what the current thread records in this block (an engine run replaying known decisions)."""
+        self._local.paused = True
+        try:
+            yield
+        finally:
+            self._local.paused = False
+
+    def span(self, name: str, **labels) -> Union[Span, NullSpan]:
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, _labels(labels))
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        if self.enabled:
+            self.record(name, _labels(labels), value)
+
+    def record(self, name: str, labels: Labels, value: float) -> None:
+        if getattr(self._local, "paused", False):
+            return
+        with self._lock:
+            histogram = self._histograms.get((name, labels))
+            if histogram is None:
+                histogram = self._histograms[(name, labels)] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def histograms(self, **labels) -> Dict[Tuple[str, Labels], Histogram]:
+        """Histograms whose labels include `labels`."""
+        wanted = set(_labels(labels))
+        with self._lock:
+            return {key: h for key, h in self._histograms.items() if wanted <= set(key[1])}
+
+    def forget(self, game: str) -> None:
+        """Drop the histograms of one game (a table removed from a long-running server)."""
+        with self._lock:
+            self._histograms = {k: h for k, h in self._histograms.items() if ("game", game) not in k[1]}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """Every histogram in the Prometheus text exposition format."""
+        by_name: Dict[str, List[Tuple[Labels, Histogram]]] = defaultdict(list)
+        with self._lock:
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                by_name[name].append((labels, histogram))
+        lines = []
+        for name, series in by_name.items():
+            lines.append(f"# HELP {name} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in series:
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == math.inf else repr(bound)
+                    lines.append(f"{name}_bucket{_format(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_format(labels)} {histogram.sum!r}")
+                lines.append(f"{name}_count{_format(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Union[str, os.PathLike]) -> None:
+        """Write `render()` atomically (for a node exporter textfile collector)."""
+        tmp = f"{os.fspath(path)}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    def summary(self, game: str) -> List[str]:
+        """Per-game report: phases, steps and decisions by total time."""
+        totals: Dict[Tuple[str, str], List[float]] = {}
+        for (name, labels), histogram in self.histograms(game=game).items():
+            label = dict(labels)
+            what = " ".join(dict.fromkeys(label[key] for key in ("phase", "decision", "role") if label.get(key)))
+            total = totals.setdefault((name, what), [0, 0.0, 0.0])
+            total[0] += histogram.count
+            total[1] += histogram.sum
+            total[2] = max(total[2], histogram.max)
+        lines = []
+        for name in (PHASE_SECONDS, STEP_SECONDS, DECISION_SECONDS, CUE_LATENCY_SECONDS):
+            rows = sorted(((what, t) for (n, what), t in totals.items() if n == name), key=lambda row: -row[1][1])
+            if rows:
+                lines.append(HELP[name])
+            for what, (count, seconds, longest) in rows:
+                lines.append(f"  {what:<32} x{count:<4} total {seconds:8.3f}s  mean {seconds / count:8.4f}s  max {longest:8.4f}s")
+        return lines
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+METRICS = Metrics(enabled=os.environ.get("WEREWOLVES_METRICS", "") not in ("", "0"))
+
+
+# Engine spans (one flag check when disabled)
+def phase_span(game: "Game", phase: str) -> Union[Span, NullSpan]:
+    if not METRICS.enabled:
+        return NULL_SPAN
+    return METRICS.span(PHASE_SECONDS, game=game.uid, round=game.round_number, phase=phase)
+
+
+def step_span(game: "Game", step: "Step") -> Union[Span, NullSpan]:
+    if not METRICS.enabled:
+        return NULL_SPAN
+    role = step.role.value if step.role is not None else ""
+    return METRICS.span(STEP_SECONDS, game=game.uid, round=game.round_number, phase=step.period.value, role=role)
+
+
+def decision_span(game: "Game", author: Optional["Player"], decision: Optional["Decision"]) -> Union[Span, NullSpan]:
+    if not METRICS.enabled:
+        return NULL_SPAN
+    role = author.role.value if author is not None and author.role is not None else ""
+    return METRICS.span(
+        DECISION_SECONDS,
+        game=game.uid,
+        round=game.round_number,
+        decision=decision.value if decision is not None else "",
+        role=role,
+    )
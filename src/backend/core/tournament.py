@@ -0,0 +1,186 @@
+"""
+Bot tournaments: many games of each (lineup, strategy) pair on a process pool.
+
+Every game has its own seed, derived from the tournament seed, the lineup,
+the strategy and the game number, so a tournament gives the same games
+whatever the number of workers, and any game can be replayed alone with
+`play_tournament_game`. Workers play chunks of games; the rows of a chunk
+are appended to a CSV file (one typed column per `GameRow` field) as soon as
+it finishes, and only per-pair counters are kept in memory, so the number of
+games is not bounded by memory. At most a few chunks per worker are in
+flight at any time.
+
+    stats = run_tournament(lineups_for(15), STRATEGIES.values(), games=10_000, path="t.csv")
+    stats = TournamentStats.from_csv("t.csv")  # same counters, from the file
+"""
+import csv
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import astuple, dataclass, field, fields
+from pathlib import Path
+from random import Random
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .balance import BalanceResult, NOBODY
+from .bots import BotProvider, Strategy
+from .game import Game
+from .phases import play_game
+from .role_distributor import Role
+
+CHUNK_SIZE = 50
+# Chunks submitted per worker ahead of the results
+WINDOW = 4
+
+Lineup = Dict[Role, int]
+
+
+@dataclass
+class GameRow:
+    """One finished game (a CSV row)."""
+
+    # Index of the lineup in the tournament
+    lineup: int
+    strategy: str
+    game: int
+    winner: str
+    rounds: int
+    alive: int
+    wolves_alive: int
+
+
+COLUMNS = [f.name for f in fields(GameRow)]
+TYPES = [f.type for f in fields(GameRow)]
+
+
+def game_seed(seed: int, lineup: int, strategy: str, game: int) -> str:
+    # String seeds are hashed with SHA-512 by `Random`: stable across processes, unlike `hash()`
+    return f"{seed}/{lineup}/{strategy}/{game}"
+
+
+def play_tournament_game(lineup: Lineup, strategy: Strategy, seed: str) -> Game:
+    """Play one headless game of `lineup` with the bots of `strategy`, every random choice drawn from `seed`."""
+    rng = Random(seed)
+    game = Game.headless(lineup, BotProvider(strategy, rng), rng)
+    play_game(game)
+    return game
+
+
+def _play_chunk(task: Tuple[int, List[Tuple[str, int]], Strategy, int, int, int]) -> List[tuple]:
+    lineup_index, items, strategy, start, count, seed = task
+    lineup = {Role(role): n for role, n in items}
+    rows = []
+    for number in range(start, start + count):
+        game = play_tournament_game(lineup, strategy, game_seed(seed, lineup_index, strategy.name, number))
+        alive = game.players.view(alive=True)
+        rows.append(
+            astuple(
+                GameRow(
+                    lineup=lineup_index,
+                    strategy=strategy.name,
+                    game=number,
+                    winner=game.winner.value if game.winner else NOBODY,
+                    rounds=game.round_number,
+                    alive=len(alive),
+                    wolves_alive=sum(p.role == Role.LOUP_GAROU for p in alive),
+                )
+            )
+        )
+    return rows
+
+
+@dataclass
+class PairStats:
+    """Results of one (lineup, strategy) pair."""
+
+    result: BalanceResult = field(default_factory=BalanceResult)
+    rounds: int = 0
+
+    @property
+    def mean_rounds(self) -> float:
+        return self.rounds / self.result.games if self.result.games else 0.0
+
+
+@dataclass
+class TournamentStats:
+    """Counters per (lineup index, strategy name), updated row by row."""
+
+    pairs: Dict[Tuple[int, str], PairStats] = field(default_factory=dict)
+
+    def add(self, row: GameRow) -> None:
+        stats = self.pairs.get((row.lineup, row.strategy))
+        if stats is None:
+            stats = self.pairs[(row.lineup, row.strategy)] = PairStats()
+        stats.result.games += 1
+        stats.result.wins[row.winner] = stats.result.wins.get(row.winner, 0) + 1
+        stats.rounds += row.rounds
+
+    @classmethod
+    def from_csv(cls, path: Union[str, os.PathLike]) -> "TournamentStats":
+        stats = cls()
+        for row in read_rows(path):
+            stats.add(row)
+        return stats
+
+
+def read_rows(path: Union[str, os.PathLike]) -> Iterator[GameRow]:
+    """Stream the rows of a tournament file."""
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        if next(reader, None) != COLUMNS:
+            raise ValueError(f"{path} is not a tournament file (columns {', '.join(COLUMNS)})")
+        for values in reader:
+            yield GameRow(*(kind(value) for kind, value in zip(TYPES, values)))
+
+
+def run_tournament(
+    lineups: Iterable[Lineup],
+    strategies: Iterable[Strategy],
+    games: int,
+    path: Union[str, os.PathLike],
+    workers: Optional[int] = None,
+    seed: int = 0,
+) -> TournamentStats:
+    """Play `games` games of every (lineup, strategy) pair, streaming the rows to the CSV file `path`."""
+    lineups = list(lineups)
+    strategies = list(strategies)
+    for strategy in strategies:
+        # Fail before starting the pool
+        strategy.policies()
+    tasks = (
+        (index, [(role.value, count) for role, count in lineup.items()], strategy, start, min(CHUNK_SIZE, games - start), seed)
+        for index, lineup in enumerate(lineups)
+        for strategy in strategies
+        for start in range(0, games, CHUNK_SIZE)
+    )
+
+    stats = TournamentStats()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+
+        def _write(rows: List[tuple]) -> None:
+            writer.writerows(rows)
+            f.flush()
+            for row in rows:
+                stats.add(GameRow(*row))
+
+        if workers == 1:
+            for task in tasks:
+                _write(_play_chunk(task))
+            return stats
+
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            window = WINDOW * workers
+            pending = set()
+            for task in tasks:
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _write(future.result())
+                pending.add(pool.submit(_play_chunk, task))
+            for future in wait(pending).done:
+                _write(future.result())
+    return stats
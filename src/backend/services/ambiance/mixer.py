@@ -0,0 +1,348 @@
+"""
+Real-time ambiance mixer: looping beds crossfaded between phases, one-shot effects on top.
+
+`Mixer.render(out)` fills a block of int16 frames of any length; it is the
+sound card callback (`sounddevice.OutputStream(callback=mixer.callback)`,
+whose block size may change between calls) or is called in a loop by
+`render_offline` to write a `WavSink`. Everything it touches
+is allocated up front: a fixed pool of voices, the float mixing buffers and
+the equal-power fade curve, so a block only runs in-place NumPy operations
+over slices of the cues. Other threads never touch the voices: `play_bed`
+and `trigger` queue commands that the next block applies.
+
+`GameAmbiance` drives a mixer from a game: on every `update()` (called on
+period changes, or by `start()`'s polling thread) it crossfades to the bed
+of `game.period`, plays a death sting when players died and the winner's
+jingle once `play_game` has ended the game (`State.COMPLETED`). Cues come from an `AssetCache`,
+which the `Prefetcher` fills ahead of the phase changes.
+
+    mixer = Mixer(bank.sample_rate, bank.channels)
+    ambiance = GameAmbiance(game, mixer, AssetCache.from_bank(bank))
+    ambiance.update()                    # after each period change
+    with WavSink("ambiance.wav", bank.sample_rate, bank.channels) as sink:
+        render_offline(mixer, sink, seconds=10)
+"""
+import math
+import os
+import threading
+import time
+import wave
+from collections import deque
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from ...core.game import Game, State
+from .prefetch import AssetCache
+from .soundbank import SAMPLE_WIDTH, cue_name
+
+DEFAULT_BLOCK = 512
+DEFAULT_FADE = 1.5
+DEFAULT_VOICES = 8
+
+NIGHT_BED = "bed/night"
+DAY_BED = "bed/day"
+DEATH_STING = "sting/death"
+# Beds of the periods without their own cue ("state/<period>" comes first)
+FALLBACK_BEDS: Dict[State, Optional[str]] = {
+    State.START_UP: None,
+    State.CUPIDON: NIGHT_BED,
+    State.AMOUREUX: NIGHT_BED,
+    State.VOLEUR: NIGHT_BED,
+    State.VOYANTE: NIGHT_BED,
+    State.LOUP_GAROU: NIGHT_BED,
+    State.SORCIERE: NIGHT_BED,
+    State.MAYOR_ELECTION: DAY_BED,
+    State.DAY_VOTE: DAY_BED,
+    State.COMPLETED: None,
+}
+
+_SCALE = 1 / 32768
+
+
+class _Voice:
+    """One playing cue; `frames` is None when the voice is free."""
+
+    __slots__ = ("frames", "position", "loop", "gain", "fade", "fade_position")
+
+    def __init__(self) -> None:
+        self.frames: Optional[np.ndarray] = None
+        self.position = 0
+        self.loop = False
+        self.gain = 0.0
+        # +1 fading in, -1 fading out, 0 steady
+        self.fade = 0
+        self.fade_position = 0
+
+    def current_gain(self, curve: np.ndarray) -> float:
+        if self.fade == 0:
+            return 1.0
+        index = self.fade_position if self.fade > 0 else len(curve) - 1 - self.fade_position
+        return float(curve[min(index, len(curve) - 1), 0])
+
+
+class Mixer:
+    """Block mixer of a fixed number of voices into preallocated buffers."""
+
+    def __init__(
+        self,
+        sample_rate: int,
+        channels: int,
+        block: int = DEFAULT_BLOCK,
+        fade: float = DEFAULT_FADE,
+        voices: int = DEFAULT_VOICES,
+        gain: float = 1.0,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.block = block
+        self.gain = gain
+        self.blocks = 0
+        # Blocks where the sum went over full scale (clipped)
+        self.clipped = 0
+        self._voices = [_Voice() for _ in range(voices)]
+        self._bed: Optional[_Voice] = None
+        self._acc = np.zeros((block, channels), np.float32)
+        self._tmp = np.zeros((block, channels), np.float32)
+        # Equal-power fade curves, one column per channel: contiguous operands
+        # of the block's shape, so NumPy needs no broadcasting iterator
+        fade_frames = max(1, int(fade * sample_rate))
+        curve = np.sin(np.linspace(0, math.pi / 2, fade_frames, dtype=np.float32))
+        self._fade_in = np.repeat(curve[:, None], channels, axis=1)
+        self._fade_out = np.ascontiguousarray(self._fade_in[::-1])
+        self._commands: deque = deque()
+
+    # Control side (any thread)
+    def play_bed(self, frames: Optional[np.ndarray], gain: float = 1.0) -> None:
+        """Crossfade from the current bed to `frames` (looped), or fade out to silence with None."""
+        self._commands.append((True, frames, gain))
+
+    def trigger(self, frames: np.ndarray, gain: float = 1.0) -> None:
+        """Play `frames` once over the beds."""
+        self._commands.append((False, frames, gain))
+
+    @property
+    def active(self) -> int:
+        """Voices playing."""
+        return sum(voice.frames is not None for voice in self._voices)
+
+    # Audio side
+    def callback(self, outdata: np.ndarray, frames: int, time_info=None, status=None) -> None:
+        """`sounddevice` output callback (any block size)."""
+        self.render(outdata[:frames])
+
+    def render(self, out: np.ndarray) -> None:
+        """Mix the next `len(out)` frames into `out`, an int16 array of shape (frames, channels).
+
+        Longer requests than `block` are mixed in several blocks.
+        """
+        while self._commands:
+            self._apply(*self._commands.popleft())
+        for start in range(0, len(out), self.block):
+            self._render_block(out[start:start + self.block])
+
+    def _render_block(self, out: np.ndarray) -> None:
+        frames = len(out)
+        acc = self._acc if frames == self.block else self._acc[:frames]
+        acc.fill(0)
+        for voice in self._voices:
+            if voice.frames is not None:
+                self._mix(voice, frames)
+        if self.gain != 1.0:
+            np.multiply(acc, self.gain, out=acc)
+        if acc.max() > 1.0 or acc.min() < -1.0:
+            self.clipped += 1
+        np.minimum(acc, 1.0, out=acc)
+        np.maximum(acc, -1.0, out=acc)
+        np.multiply(acc, 32767, out=acc)
+        np.rint(acc, out=acc)
+        np.copyto(out, acc, casting="unsafe")
+        self.blocks += 1
+
+    def _apply(self, bed: bool, frames: Optional[np.ndarray], gain: float) -> None:
+        if bed:
+            previous = self._bed
+            if previous is not None and previous.frames is not None:
+                if frames is previous.frames:
+                    return
+                # Fade out from the gain it has now (it may still be fading in)
+                last = len(self._fade_in) - 1
+                level = previous.current_gain(self._fade_in)
+                previous.fade = -1
+                previous.fade_position = last - round(math.asin(min(level, 1.0)) * 2 / math.pi * last)
+            self._bed = None
+            if frames is None or not len(frames):
+                return
+        elif not len(frames):
+            return
+        voice = self._free_voice()
+        voice.frames = frames
+        voice.position = 0
+        voice.loop = bed
+        voice.gain = gain * _SCALE
+        voice.fade = 1 if bed else 0
+        voice.fade_position = 0
+        if bed:
+            self._bed = voice
+
+    def _free_voice(self) -> _Voice:
+        for voice in self._voices:
+            if voice.frames is None:
+                return voice
+        # Steal the quietest voice that is not the current bed
+        quietest, level = None, math.inf
+        for voice in self._voices:
+            if voice is not self._bed and voice.gain * voice.current_gain(self._fade_in) < level:
+                quietest, level = voice, voice.gain * voice.current_gain(self._fade_in)
+        return quietest
+
+    def _mix(self, voice: _Voice, block: int) -> None:
+        frames = voice.frames
+        done = 0
+        while done < block:
+            count = min(block - done, len(frames) - voice.position)
+            if voice.fade:
+                count = min(count, len(self._fade_in) - voice.fade_position)
+            tmp = self._tmp[:count]
+            # Cast then scale in place (a casting ufunc call would allocate its own buffer)
+            np.copyto(tmp, frames[voice.position:voice.position + count])
+            np.multiply(tmp, voice.gain, out=tmp)
+            if voice.fade:
+                curve = self._fade_in if voice.fade > 0 else self._fade_out
+                np.multiply(tmp, curve[voice.fade_position:voice.fade_position + count], out=tmp)
+                voice.fade_position += count
+            target = self._acc[done:done + count]
+            np.add(target, tmp, out=target)
+            done += count
+            voice.position += count
+
+            if voice.fade and voice.fade_position >= len(self._fade_in):
+                if voice.fade < 0:
+                    voice.frames = None
+                    return
+                voice.fade = 0
+            if voice.position >= len(frames):
+                if not voice.loop:
+                    voice.frames = None
+                    return
+                voice.position = 0
+
+
+class WavSink:
+    """16-bit PCM WAV file receiving rendered blocks."""
+
+    def __init__(self, path: Union[str, os.PathLike], sample_rate: int, channels: int) -> None:
+        self.path = path
+        self._wav = wave.open(str(path), "wb")
+        self._wav.setnchannels(channels)
+        self._wav.setsampwidth(SAMPLE_WIDTH)
+        self._wav.setframerate(sample_rate)
+        self.frames = 0
+
+    def write(self, block: np.ndarray) -> None:
+        self._wav.writeframes(block.astype("<i2", copy=False).tobytes())
+        self.frames += len(block)
+
+    def close(self) -> None:
+        self._wav.close()
+
+    def __enter__(self) -> "WavSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def render_offline(mixer: Mixer, sink: WavSink, seconds: float) -> None:
+    """Render `seconds` of the mixer into `sink` (blocks in a row, as a sound card would ask)."""
+    out = np.zeros((mixer.block, mixer.channels), np.int16)
+    for _ in range(math.ceil(seconds * mixer.sample_rate / mixer.block)):
+        mixer.render(out)
+        sink.write(out)
+
+
+class GameAmbiance:
+    """Bed of the current period, death stings and the winner's jingle, sent to a `Mixer`."""
+
+    def __init__(self, game: Game, mixer: Mixer, cache: AssetCache, poll_interval: float = 0.02) -> None:
+        self.game = game
+        self.mixer = mixer
+        self.cache = cache
+        self.poll_interval = poll_interval
+        self.period: Optional[State] = None
+        self.bed: Optional[str] = None
+        self._alive: Optional[int] = None
+        self._finished = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def update(self, game: Optional[Game] = None) -> None:
+        """Follow the current state of the game (cheap when nothing changed)."""
+        game = self.game if game is None else game
+        alive = len(game.players.view(alive=True))
+        if self._alive is not None and alive < self._alive:
+            self._play(DEATH_STING)
+        self._alive = alive
+        if game.period is self.period:
+            return
+        self.period = game.period
+        if game.period is State.COMPLETED:
+            self._set_bed(None)
+            if game.winner is not None and not self._finished:
+                self._play(cue_name(game.winner))
+            self._finished = True
+            return
+        for bed in (cue_name(game.period), FALLBACK_BEDS.get(game.period)):
+            if bed is None or self._load(bed) is not None:
+                self._set_bed(bed)
+                return
+
+    def start(self) -> None:
+        """Poll the game on a background thread."""
+        self._thread = threading.Thread(target=self._run, name="ambiance", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            self.update()
+
+    def _set_bed(self, bed: Optional[str]) -> None:
+        if bed == self.bed:
+            return
+        self.bed = bed
+        self.mixer.play_bed(self._load(bed) if bed else None)
+
+    def _play(self, cue: str) -> None:
+        frames = self._load(cue)
+        if frames is not None:
+            self.mixer.trigger(frames)
+
+    def _load(self, cue: str) -> Optional[np.ndarray]:
+        try:
+            return self.cache.get(cue)
+        except KeyError:
+            return None
+
+
+def benchmark(seconds: float = 60.0, voices: int = DEFAULT_VOICES, sample_rate: int = 44100, channels: int = 2) -> float:
+    """Real-time factor of `render` with every voice busy (seconds of audio mixed per second of CPU)."""
+    rng = np.random.default_rng(0)
+    mixer = Mixer(sample_rate, channels, voices=voices)
+    bed = rng.integers(-8000, 8000, size=(sample_rate * 3, channels), dtype=np.int16)
+    mixer.play_bed(bed)
+    for _ in range(voices - 1):
+        mixer.trigger(rng.integers(-4000, 4000, size=(sample_rate * 600, channels), dtype=np.int16))
+    out = np.zeros((mixer.block, channels), np.int16)
+    blocks = math.ceil(seconds * sample_rate / mixer.block)
+    start = time.perf_counter()
+    for number in range(blocks):
+        if number % 200 == 0:
+            # A crossfade in progress most of the time
+            mixer.play_bed(bed if number % 400 else bed[::-1])
+        mixer.render(out)
+    return blocks * mixer.block / sample_rate / (time.perf_counter() - start)
@@ -0,0 +1,211 @@
+"""
+Predictive prefetch of ambiance cues.
+
+The phases that may follow the current one are known from the game's
+compiled schedule (`Game.schedule`, i.e. `get_roles_order_for_game` order
+with the wolves before the Sorcière). A `Prefetcher` loads the cues of the
+next `lookahead` phases into a bounded LRU `AssetCache` on a background
+thread, so switching cues never waits on the disk. A period outside the
+predicted ones (the game ending, a GM skipping ahead) cancels the pending
+loads before planning from the new period.
+
+    cache = AssetCache.from_bank(bank)
+    prefetcher = Prefetcher.for_game(game, cache)
+    prefetcher.update(game.period)       # on every period change
+    frames = cache.get("state/loup_garou")
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from ...core.game import Game, State
+from ...core.phases import Schedule
+from .soundbank import SoundBank, cue_name
+
+DEFAULT_CAPACITY = 64 << 20
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    prefetched: int = 0
+    evicted: int = 0
+    # Prefetches cancelled or discarded after an unexpected period change
+    cancelled: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class AssetCache:
+    """LRU cache of decoded cues bounded by their total size in bytes (thread-safe)."""
+
+    def __init__(self, load: Callable[[str], np.ndarray], capacity: int = DEFAULT_CAPACITY) -> None:
+        self.load = load
+        self.capacity = capacity
+        self.size = 0
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_bank(cls, bank: SoundBank, capacity: int = DEFAULT_CAPACITY) -> "AssetCache":
+        """Cache of in-memory copies of a bank's cues (so playback never faults pages in)."""
+        return cls(lambda key: np.array(bank.frames(key)), capacity)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> np.ndarray:
+        """Frames of a cue, loaded synchronously on a miss."""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return data
+            self.stats.misses += 1
+        data = self.load(key)
+        self.put(key, data)
+        return data
+
+    def put(self, key: str, data: np.ndarray) -> None:
+        """Insert a cue, evicting the least recently used ones over capacity."""
+        with self._lock:
+            if key in self._entries or data.nbytes > self.capacity:
+                return
+            self._entries[key] = data
+            self.size += data.nbytes
+            while self.size > self.capacity:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.nbytes
+                self.stats.evicted += 1
+
+
+def phase_successors(schedule: Schedule) -> Dict[State, Tuple[State, ...]]:
+    """Periods that may directly follow each period of a game with this schedule."""
+    # process_day starts in DAY_VOTE before its first step
+    day = [State.DAY_VOTE, *(step.period for step in schedule.day)]
+    night = [step.period for step in schedule.night]
+    path = [State.START_UP, *(step.period for step in schedule.first_night), *day, *night, *day, *night[:1]]
+    successors: Dict[State, Dict[State, None]] = {}
+    for current, following in zip(path, path[1:]):
+        if current is not following:
+            successors.setdefault(current, {})[following] = None
+    return {state: tuple(following) for state, following in successors.items()}
+
+
+class Prefetcher:
+    """Loads the cues of the next phases into an `AssetCache` in the background."""
+
+    def __init__(
+        self,
+        cache: AssetCache,
+        successors: Mapping[State, Tuple[State, ...]],
+        cues: Callable[[State], List[str]] = lambda period: [cue_name(period)],
+        lookahead: int = 2,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        :param successors: periods that may follow each period (see `phase_successors`)
+        :param cues: cue names to load for a period
+        :param lookahead: number of phases ahead to prefetch
+        """
+        self.cache = cache
+        self.successors = successors
+        self.cues = cues
+        self.lookahead = lookahead
+        self.period: Optional[State] = None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self._owns_executor = executor is None
+        self._expected: Tuple[State, ...] = ()
+        self._pending: Dict[str, Future] = {}
+        self._generation = 0
+        # Reentrant: done callbacks may run in the thread that submits or cancels
+        self._lock = threading.RLock()
+
+    @classmethod
+    def for_game(cls, game: Game, cache: AssetCache, **kwargs) -> "Prefetcher":
+        """Prefetcher following the compiled schedule of `game`."""
+        return cls(cache, phase_successors(game.schedule), **kwargs)
+
+    def upcoming(self, period: State) -> List[State]:
+        """Periods reachable within `lookahead` phases, nearest first."""
+        found: Dict[State, None] = {}
+        frontier = [period]
+        for _ in range(self.lookahead):
+            frontier = [nxt for state in frontier for nxt in self.successors.get(state, ()) if nxt not in found]
+            found.update(dict.fromkeys(frontier))
+        found.pop(period, None)
+        return list(found)
+
+    def update(self, period: State) -> None:
+        """The game moved to `period`: cancel if it was not predicted, then prefetch what comes next."""
+        if period is self.period:
+            return
+        if self.period is not None and period not in self._expected:
+            self.cancel()
+        self.period = period
+        upcoming = self.upcoming(period)
+        self._expected = tuple(upcoming)
+        with self._lock:
+            generation = self._generation
+            for state in upcoming:
+                for key in self.cues(state):
+                    if key not in self.cache and key not in self._pending:
+                        future = self._executor.submit(self._load, key, generation)
+                        self._pending[key] = future
+                        future.add_done_callback(lambda _, key=key: self._done(key))
+
+    def cancel(self) -> None:
+        """Drop every pending prefetch (loads already running are discarded when they finish)."""
+        with self._lock:
+            self._generation += 1
+            pending, self._pending = self._pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.cancel()
+                    self.cache.stats.cancelled += 1
+
+    def wait(self) -> None:
+        """Block until the prefetches submitted so far are done (tests, benchmarks)."""
+        with self._lock:
+            futures = list(self._pending.values())
+        for future in futures:
+            if not future.cancelled():
+                future.exception()
+
+    def close(self) -> None:
+        self.cancel()
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+
+    def _load(self, key: str, generation: int) -> None:
+        if generation != self._generation:
+            return
+        try:
+            data = self.cache.load(key)
+        except KeyError:
+            # No such cue in the bank: nothing to prefetch
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self.cache.stats.prefetched += 1
+        self.cache.put(key, data)
+
+    def _done(self, key: str) -> None:
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None and future.done():
+                del self._pending[key]
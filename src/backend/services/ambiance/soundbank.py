@@ -0,0 +1,174 @@
+"""
+Packed sound bank: pre-decoded PCM cues in one memory-mapped file.
+
+A bank holds every ambiance cue already decoded to interleaved 16-bit PCM at
+a single sample rate and channel count, so triggering a cue never decodes
+anything: `SoundBank.clip(...)` hands out a zero-copy slice of the mapped
+file. Cues are keyed by name; `cue_name` maps game values to names
+(`State.LOUP_GAROU` -> "state/loup_garou", `Role.SORCIERE` -> "role/sorciere",
+`Camp.VILLAGEOIS` -> "camp/villageois").
+
+Layout (little endian): header, index (data offset, byte length, name), then
+the PCM of each cue, aligned on `ALIGN` bytes.
+"""
+import mmap
+import os
+import struct
+import wave
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Iterator, Tuple, Union
+
+import numpy as np
+
+MAGIC = b"WWSB"
+VERSION = 1
+SAMPLE_WIDTH = 2
+ALIGN = 64
+DEFAULT_SAMPLE_RATE = 44100
+DEFAULT_CHANNELS = 2
+
+# magic, version, channels, sample rate, cue count
+HEADER = struct.Struct("<4sHHII")
+# data offset, byte length, name length (the UTF-8 name follows)
+ENTRY = struct.Struct("<QQH")
+
+CueKey = Union[str, Enum]
+
+
+def cue_name(key: CueKey) -> str:
+    """Bank name of a cue: enums (`State`, `Role`, `Camp`...) become "<enum>/<value>"."""
+    if isinstance(key, Enum):
+        return f"{type(key).__name__.lower()}/{key.value}"
+    return key
+
+
+def read_wav(path: Union[str, os.PathLike], sample_rate: int, channels: int) -> np.ndarray:
+    """Decode a PCM WAV file to int16 frames of shape (n, channels) at `sample_rate`."""
+    with wave.open(str(path), "rb") as wav:
+        width, source_channels, source_rate = wav.getsampwidth(), wav.getnchannels(), wav.getframerate()
+        raw = wav.readframes(wav.getnframes())
+
+    if width == 1:
+        samples = (np.frombuffer(raw, np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(raw, "<i2").astype(np.float32) / 32768
+    elif width == 3:
+        bytes_ = np.frombuffer(raw, np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = bytes_[:, 0] | (bytes_[:, 1] << 8) | (bytes_[:, 2] << 16)
+        samples = (np.where(ints >= 1 << 23, ints - (1 << 24), ints)).astype(np.float32) / (1 << 23)
+    elif width == 4:
+        samples = np.frombuffer(raw, "<i4").astype(np.float32) / (1 << 31)
+    else:
+        raise ValueError(f"{path}: unsupported sample width {width}")
+    frames = samples.reshape(-1, source_channels)
+
+    if source_channels != channels:
+        # Down-mix to mono, then spread to the target channel count
+        frames = np.repeat(frames.mean(axis=1, keepdims=True), channels, axis=1)
+    if source_rate != sample_rate and len(frames):
+        # Linear interpolation is enough for ambiance beds and stings
+        size = max(1, round(len(frames) * sample_rate / source_rate))
+        positions = np.arange(size) * (source_rate / sample_rate)
+        frames = np.stack(
+            [np.interp(positions, np.arange(len(frames)), frames[:, c]) for c in range(channels)], axis=1
+        )
+    return np.clip(np.round(frames * 32767), -32768, 32767).astype("<i2")
+
+
+def build_bank(
+    source: Union[str, os.PathLike],
+    output: Union[str, os.PathLike],
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    channels: int = DEFAULT_CHANNELS,
+) -> Dict[str, int]:
+    """Pack every WAV file under `source` into a bank at `output`; returns frames per cue.
+
+    The cue name is the path relative to `source` without extension, so
+    `source/state/loup_garou.wav` becomes "state/loup_garou".
+    """
+    source = Path(source)
+    cues = {
+        path.relative_to(source).with_suffix("").as_posix(): read_wav(path, sample_rate, channels)
+        for path in sorted(source.rglob("*.wav"))
+    }
+    names = [name.encode("utf-8") for name in cues]
+    offset = _align(HEADER.size + sum(ENTRY.size + len(name) for name in names))
+
+    index, data = [], []
+    for name, frames in zip(names, cues.values()):
+        pcm = frames.tobytes()
+        index.append(ENTRY.pack(offset, len(pcm), len(name)) + name)
+        padding = _align(len(pcm)) - len(pcm)
+        data.append(pcm + b"\0" * padding)
+        offset += len(pcm) + padding
+
+    head = HEADER.pack(MAGIC, VERSION, channels, sample_rate, len(cues)) + b"".join(index)
+    # Written aside then renamed, so a running game never maps a half-written bank
+    tmp = Path(f"{output}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(head + b"\0" * (_align(len(head)) - len(head)))
+        for chunk in data:
+            f.write(chunk)
+    os.replace(tmp, output)
+    return {name: len(frames) for name, frames in cues.items()}
+
+
+class SoundBank:
+    """Memory-mapped sound bank; cues are handed out as zero-copy views of the file."""
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        magic, version, self.channels, self.sample_rate, count = HEADER.unpack_from(self._view)
+        if magic != MAGIC or version != VERSION:
+            self._view.release()
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} sound bank")
+        self.path = path
+        self._index: Dict[str, Tuple[int, int]] = {}
+        position = HEADER.size
+        for _ in range(count):
+            offset, size, name_size = ENTRY.unpack_from(self._view, position)
+            position += ENTRY.size
+            self._index[str(self._view[position:position + name_size], "utf-8")] = (offset, size)
+            position += name_size
+
+    def __contains__(self, key: CueKey) -> bool:
+        return cue_name(key) in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def clip(self, key: CueKey) -> memoryview:
+        """Raw interleaved int16 PCM of a cue, as a slice of the mapped file (KeyError if absent)."""
+        offset, size = self._index[cue_name(key)]
+        return self._view[offset:offset + size]
+
+    def frames(self, key: CueKey) -> np.ndarray:
+        """Read-only (n, channels) int16 array over the mapped PCM of a cue."""
+        return np.frombuffer(self.clip(key), "<i2").reshape(-1, self.channels)
+
+    def duration(self, key: CueKey) -> float:
+        """Length of a cue in seconds."""
+        _, size = self._index[cue_name(key)]
+        return size / (SAMPLE_WIDTH * self.channels * self.sample_rate)
+
+    def close(self) -> None:
+        """Unmap the file; every clip and array handed out must have been released."""
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self) -> "SoundBank":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _align(size: int) -> int:
+    return -(-size // ALIGN) * ALIGN
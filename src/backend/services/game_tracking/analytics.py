@@ -0,0 +1,290 @@
+"""
+Aggregate statistics of the stored games, kept up to date incrementally.
+
+When a game finishes, the store's writer thread extracts its `GameFacts`
+(lineup, winner, role of the first-night victim, first-night heal, mayor
+terms) from the game's own rows and adds them to small aggregate tables in
+the same transaction, so a dashboard reads a few rows instead of scanning
+every game. `analytics_games` marks the games already counted: a game is
+never counted twice, and `backfill` adds the finished games stored before
+the analytics existed, extracting their facts by chunks on a process pool.
+
+    with GameStore("games.db") as store:
+        report = store.analytics()
+    report.first_night_heal_rate, report.win_rates[lineup_key(lineup)].summary()
+    backfill("games.db", workers=4)
+"""
+import os
+import sqlite3
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from ...core.balance import NOBODY, BalanceResult
+from ...core.game import ActionType, GameStatus, State
+from ...core.journal import NO_PLAYER, JournalRecord
+from ...core.phases import DAY_PERIODS
+from ...core.role_distributor import ROLE_DISTRIBUTIONS, Role
+
+CHUNK_SIZE = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analytics_games (game_uid TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS analytics_counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS analytics_lineup_wins (
+    lineup TEXT NOT NULL,
+    winner TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    PRIMARY KEY (lineup, winner)
+);
+CREATE TABLE IF NOT EXISTS analytics_first_night_kills (role TEXT PRIMARY KEY, games INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS analytics_mayor_terms (
+    days INTEGER NOT NULL,
+    died INTEGER NOT NULL,
+    terms INTEGER NOT NULL,
+    PRIMARY KEY (days, died)
+);
+"""
+
+
+def lineup_key(lineup: Dict[Role, int]) -> str:
+    """Canonical text of a lineup, e.g. `loup_garou=2,sorciere=1,villageois=3`."""
+    return ",".join(f"{role}={count}" for role, count in sorted((role.value, count) for role, count in lineup.items() if count))
+
+
+def parse_lineup(key: str) -> Dict[Role, int]:
+    return {Role(role): int(count) for role, count in (item.split("=") for item in key.split(","))} if key else {}
+
+
+def lineup_label(key: str) -> str:
+    """`12 players #2` for the second lineup of `ROLE_DISTRIBUTIONS[12]`, `custom` otherwise."""
+    lineup = parse_lineup(key)
+    players = sum(lineup.values())
+    for number, variant in enumerate(ROLE_DISTRIBUTIONS.get(players, ()), 1):
+        if lineup == {role: count for role, count in variant.items() if count}:
+            return f"{players} players #{number}"
+    return "custom"
+
+
+@dataclass
+class GameFacts:
+    """What the aggregates need from one finished game."""
+
+    uid: str
+    lineup: str
+    winner: str
+    rounds: int
+    # Role of the wolves' first victim (NOBODY when they killed no one)
+    first_night_kill: str
+    sorciere: bool
+    first_night_heal: bool
+    # (days in office, ended by death) of every mayor; a term still running at the end is not a death
+    mayor_terms: List[Tuple[int, bool]] = field(default_factory=list)
+
+
+def game_facts(
+    uid: str,
+    lineup: Dict[Role, int],
+    roles: Mapping[int, Optional[Role]],
+    records: Iterable[JournalRecord],
+    winner: Optional[str],
+    rounds: int,
+) -> GameFacts:
+    """Facts of a game from its lineup, final role per seat (no swap happens after the first night) and journal.
+
+    `round_number` only moves after the second night, so nights and days are
+    counted from the journal itself: the first night ends at the first
+    day-period record and mayor terms last from one day to another.
+    """
+    first_night_kill = NOBODY
+    first_night_heal = False
+    # Days started so far (0 during the first night)
+    day = 0
+    in_day = False
+    # Seat of each mayor in office -> day of their election
+    mayors: Dict[int, int] = {}
+    terms = []
+    for record in records:
+        if record.period in DAY_PERIODS:
+            if not in_day:
+                day += 1
+            in_day = True
+        else:
+            in_day = False
+        if day == 0 and record.period is State.LOUP_GAROU and record.action is ActionType.KILL:
+            if first_night_kill == NOBODY:
+                role = roles[record.target]
+                first_night_kill = role.value if role else NOBODY
+        elif day == 0 and record.action is ActionType.HEAL:
+            first_night_heal = True
+        elif record.action is ActionType.MAYOR:
+            # Successions name the previous (dead) mayor as actor
+            if record.actor in mayors:
+                terms.append((day - mayors.pop(record.actor), True))
+            if record.target != NO_PLAYER:
+                mayors[record.target] = day
+    terms.extend((day - start, False) for start in mayors.values())
+    return GameFacts(
+        uid=uid,
+        lineup=lineup_key(lineup),
+        winner=winner or NOBODY,
+        rounds=rounds,
+        first_night_kill=first_night_kill,
+        sorciere=lineup.get(Role.SORCIERE, 0) > 0,
+        first_night_heal=first_night_heal,
+        mayor_terms=terms,
+    )
+
+
+def read_facts(conn: sqlite3.Connection, uid: str) -> GameFacts:
+    """Facts of the stored game `uid`."""
+    winner, rounds = conn.execute("SELECT winner, round_number FROM games WHERE uid = ?", (uid,)).fetchone()
+    lineup = {Role(role): count for role, count in conn.execute("SELECT role, count FROM lineups WHERE game_uid = ?", (uid,))}
+    roles = {seat: Role(role) if role else None for seat, role in conn.execute("SELECT seat, role FROM players WHERE game_uid = ?", (uid,))}
+    records = [
+        JournalRecord(round_number, State(period), ActionType(action), actor, target)
+        for round_number, period, action, actor, target in conn.execute(
+            "SELECT round_number, period, action, actor_seat, target_seat FROM actions WHERE game_uid = ? ORDER BY seq", (uid,)
+        )
+    ]
+    return game_facts(uid, lineup, roles, records, winner, rounds)
+
+
+def add_facts(conn: sqlite3.Connection, facts: Iterable[GameFacts]) -> int:
+    """Add the games not counted yet to the aggregates (in the caller's transaction); returns how many were added."""
+    counters: Counter = Counter()
+    wins: Counter = Counter()
+    kills: Counter = Counter()
+    terms: Counter = Counter()
+    for game in facts:
+        if conn.execute("INSERT OR IGNORE INTO analytics_games VALUES (?)", (game.uid,)).rowcount == 0:
+            continue
+        counters["games"] += 1
+        counters["rounds"] += game.rounds
+        counters["sorciere_games"] += game.sorciere
+        counters["first_night_heals"] += game.sorciere and game.first_night_heal
+        wins[(game.lineup, game.winner)] += 1
+        kills[game.first_night_kill] += 1
+        for term in game.mayor_terms:
+            terms[term] += 1
+    conn.executemany(
+        "INSERT INTO analytics_counters VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+        counters.items(),
+    )
+    conn.executemany(
+        "INSERT INTO analytics_lineup_wins VALUES (?, ?, ?) ON CONFLICT(lineup, winner) DO UPDATE SET games = games + excluded.games",
+        [(*key, n) for key, n in wins.items()],
+    )
+    conn.executemany(
+        "INSERT INTO analytics_first_night_kills VALUES (?, ?) ON CONFLICT(role) DO UPDATE SET games = games + excluded.games",
+        kills.items(),
+    )
+    conn.executemany(
+        "INSERT INTO analytics_mayor_terms VALUES (?, ?, ?) ON CONFLICT(days, died) DO UPDATE SET terms = terms + excluded.terms",
+        [(*key, n) for key, n in terms.items()],
+    )
+    return counters["games"]
+
+
+def record_game(conn: sqlite3.Connection, uid: str) -> bool:
+    """Count the finished game `uid` (called by the store's writer once its last rows are written)."""
+    return add_facts(conn, [read_facts(conn, uid)]) == 1
+
+
+@dataclass
+class AnalyticsReport:
+    """Dashboard numbers, read from the aggregate tables."""
+
+    games: int = 0
+    mean_rounds: float = 0.0
+    # Role of the first-night victim -> games
+    first_night_kills: Dict[str, int] = field(default_factory=dict)
+    sorciere_games: int = 0
+    first_night_heals: int = 0
+    # Lineup key -> outcomes
+    win_rates: Dict[str, BalanceResult] = field(default_factory=dict)
+    # (days in office, ended by death) -> mayor terms
+    mayor_terms: Dict[Tuple[int, bool], int] = field(default_factory=dict)
+
+    @property
+    def first_night_heal_rate(self) -> float:
+        """Share of the games with a Sorcière where she healed on the first night."""
+        return self.first_night_heals / self.sorciere_games if self.sorciere_games else 0.0
+
+    def mayor_survival(self) -> List[float]:
+        """Share of mayors still in office after 1, 2, 3... days (Kaplan-Meier; terms running at game end are censored)."""
+        longest = max((days for days, _ in self.mayor_terms), default=0)
+        at_risk = sum(self.mayor_terms.values())
+        alive = 1.0
+        survival = []
+        for days in range(longest + 1):
+            deaths = self.mayor_terms.get((days, True), 0)
+            if at_risk:
+                alive *= 1 - deaths / at_risk
+            at_risk -= deaths + self.mayor_terms.get((days, False), 0)
+            if days:
+                survival.append(alive)
+        return survival
+
+
+def read_report(conn: sqlite3.Connection) -> AnalyticsReport:
+    counters = dict(conn.execute("SELECT name, value FROM analytics_counters"))
+    games = counters.get("games", 0)
+    report = AnalyticsReport(
+        games=games,
+        mean_rounds=counters.get("rounds", 0) / games if games else 0.0,
+        first_night_kills=dict(conn.execute("SELECT role, games FROM analytics_first_night_kills ORDER BY games DESC")),
+        sorciere_games=counters.get("sorciere_games", 0),
+        first_night_heals=counters.get("first_night_heals", 0),
+        mayor_terms={(days, bool(died)): terms for days, died, terms in conn.execute("SELECT days, died, terms FROM analytics_mayor_terms")},
+    )
+    for lineup, winner, count in conn.execute("SELECT lineup, winner, games FROM analytics_lineup_wins"):
+        result = report.win_rates.setdefault(lineup, BalanceResult())
+        result.games += count
+        result.wins[winner] = result.wins.get(winner, 0) + count
+    return report
+
+
+def _chunk_facts(task: Tuple[str, List[str]]) -> List[GameFacts]:
+    path, uids = task
+    # Read-only URI of the file, with `?`, `#` and `%` in the path percent-encoded
+    conn = sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        return [read_facts(conn, uid) for uid in uids]
+    finally:
+        conn.close()
+
+
+def backfill(path: Union[str, os.PathLike], workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> int:
+    """Count the finished games of the database `path` missing from the aggregates; returns how many were added.
+
+    Facts are extracted by chunks of `chunk_size` games on a process pool (all
+    cores by default) and each chunk is added in its own transaction, so an
+    interrupted backfill keeps its progress.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA busy_timeout = 5000")
+    try:
+        with conn:
+            conn.executescript(SCHEMA)
+        uids = [
+            uid
+            for uid, in conn.execute(
+                "SELECT uid FROM games WHERE status = ? AND uid NOT IN (SELECT game_uid FROM analytics_games) ORDER BY uid",
+                (GameStatus.FINISHED.value,),
+            )
+        ]
+        tasks = [(os.fspath(path), uids[i:i + chunk_size]) for i in range(0, len(uids), chunk_size)]
+
+        def _add(facts: List[GameFacts]) -> int:
+            with conn:
+                return add_facts(conn, facts)
+
+        if workers == 1 or len(tasks) <= 1:
+            return sum(_add(_chunk_facts(task)) for task in tasks)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return sum(_add(facts) for facts in pool.map(_chunk_facts, tasks))
+    finally:
+        conn.close()
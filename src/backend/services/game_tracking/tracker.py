@@ -0,0 +1,412 @@
+"""
+SQLite persistence of games, players, lineups and actions.
+
+The game loop never touches the disk: `save_action` only appends to the
+in-memory journal and `Player.kill` only updates the player table. At the
+end of each phase, `GameTracker.flush` copies what changed since the
+previous phase (new journal records, changed player rows, the game row)
+into one batch and queues it. A single writer thread owns the write
+connection and commits the queued batches in WAL mode, several at a time
+when the disk is slower than the game, so readers (a small pool of
+read-only connections) are never blocked by a write. The batch of a
+finished game also updates the aggregate tables of `analytics`.
+
+    store = GameStore("games.db")
+    tracker = GameTracker(store, game)
+    play_game(game, after_phase=tracker.flush)
+    store.close()                        # waits for the last batch
+    records = GameStore("games.db").actions(game.uid)
+"""
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from random import Random
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from ...core.decisions import RandomDecisionProvider
+from ...core.game import ActionType, Camp, Game, GameStatus, State
+from ...core.journal import RECORD, ActionJournal, JournalRecord
+from ...core.role_distributor import Role
+from .analytics import SCHEMA as ANALYTICS_SCHEMA, AnalyticsReport, read_report, record_game
+
+SCHEMA_VERSION = 1
+DEFAULT_READERS = 4
+# Batches committed together when the writer falls behind
+MAX_GROUP = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    uid TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    period TEXT NOT NULL,
+    round_number INTEGER NOT NULL,
+    winner TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lineups (
+    game_uid TEXT NOT NULL REFERENCES games(uid),
+    role TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (game_uid, role)
+);
+CREATE TABLE IF NOT EXISTS players (
+    game_uid TEXT NOT NULL REFERENCES games(uid),
+    seat INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    role TEXT,
+    alive INTEGER NOT NULL,
+    is_revealed INTEGER NOT NULL,
+    is_mayor INTEGER NOT NULL,
+    lover_seat INTEGER,
+    PRIMARY KEY (game_uid, seat)
+);
+CREATE TABLE IF NOT EXISTS actions (
+    game_uid TEXT NOT NULL REFERENCES games(uid),
+    seq INTEGER NOT NULL,
+    round_number INTEGER NOT NULL,
+    period TEXT NOT NULL,
+    action TEXT NOT NULL,
+    actor_seat INTEGER NOT NULL,
+    target_seat INTEGER NOT NULL,
+    PRIMARY KEY (game_uid, seq)
+);
+"""
+
+# (seat, name, role, alive, is_revealed, is_mayor, lover seat)
+PlayerRow = Tuple[int, str, Optional[str], bool, bool, bool, Optional[int]]
+
+
+@dataclass
+class Batch:
+    """What changed in one game during one phase."""
+
+    # (uid, status, period, round, winner, updated at)
+    game: tuple
+    # (role, count), only in the first batch of a game
+    lineup: List[Tuple[str, int]]
+    players: List[PlayerRow]
+    # Journal index of the first record, packed records
+    first_seq: int
+    records: bytes
+
+
+@dataclass
+class StoredGame:
+    uid: str
+    status: GameStatus
+    period: State
+    round_number: int
+    winner: Optional[Camp]
+    lineup: Dict[Role, int]
+
+
+@dataclass
+class StoredPlayer:
+    seat: int
+    name: str
+    role: Optional[Role]
+    alive: bool
+    is_revealed: bool
+    is_mayor: bool
+    lover_seat: Optional[int]
+
+
+def _connect(path: Union[str, os.PathLike], **kwargs) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, **kwargs)
+    conn.execute("PRAGMA busy_timeout = 5000")
+    return conn
+
+
+class ConnectionPool:
+    """At most `size` read-only connections, opened on first use and shared between threads."""
+
+    def __init__(self, path: Union[str, os.PathLike], size: int = DEFAULT_READERS) -> None:
+        self.path = path
+        self.size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection (waits when all `size` are in use)."""
+        conn = self._borrow()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def _borrow(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                conn = _connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA query_only = ON")
+                return conn
+        return self._idle.get()
+
+    def close(self) -> None:
+        with self._lock:
+            while self._opened:
+                self._idle.get().close()
+                self._opened -= 1
+
+
+class GameStore:
+    """SQLite database of games; writes go through a background thread, reads through a `ConnectionPool`."""
+
+    def __init__(self, path: Union[str, os.PathLike], readers: int = DEFAULT_READERS) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Schema and WAL mode (kept by the database file) before any reader or writer
+        conn = _connect(self.path)
+        with conn:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(SCHEMA)
+            conn.executescript(ANALYTICS_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.close()
+        self.pool = ConnectionPool(self.path, readers)
+        self.batches = 0
+        self.commits = 0
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="game-store", daemon=True)
+        self._thread.start()
+
+    def submit(self, batch: Batch) -> None:
+        """Queue a batch for the writer (never blocks)."""
+        if self._closed:
+            raise RuntimeError("Game store is closed")
+        self._queue.put(batch)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Wait until every batch submitted so far is committed (re-raises a writer error)."""
+        done = threading.Event()
+        self._queue.put(done)
+        if not done.wait(timeout):
+            raise TimeoutError(f"Game store writer did not catch up within {timeout}s")
+        self._raise_error()
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+            self.pool.close()
+        self._raise_error()
+
+    def __enter__(self) -> "GameStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # Reads
+    def games(self) -> List[StoredGame]:
+        with self.pool.connection() as conn:
+            games = conn.execute("SELECT uid, status, period, round_number, winner FROM games ORDER BY updated_at").fetchall()
+            lineups: Dict[str, Dict[Role, int]] = {}
+            for uid, role, count in conn.execute("SELECT game_uid, role, count FROM lineups"):
+                lineups.setdefault(uid, {})[Role(role)] = count
+        return [
+            StoredGame(
+                uid=uid,
+                status=GameStatus(status),
+                period=State(period),
+                round_number=round_number,
+                winner=Camp(winner) if winner else None,
+                lineup=lineups.get(uid, {}),
+            )
+            for uid, status, period, round_number, winner in games
+        ]
+
+    def analytics(self) -> AnalyticsReport:
+        """Dashboard numbers of the finished games (aggregate tables only)."""
+        with self.pool.connection() as conn:
+            return read_report(conn)
+
+    def players(self, uid: str) -> List[StoredPlayer]:
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT seat, name, role, alive, is_revealed, is_mayor, lover_seat FROM players WHERE game_uid = ? ORDER BY seat",
+                (uid,),
+            ).fetchall()
+        return [
+            StoredPlayer(seat, name, Role(role) if role else None, bool(alive), bool(revealed), bool(mayor), lover)
+            for seat, name, role, alive, revealed, mayor, lover in rows
+        ]
+
+    def actions(self, uid: str) -> List[JournalRecord]:
+        """Recorded actions of a game, as journal records (player seats as ids)."""
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT round_number, period, action, actor_seat, target_seat FROM actions WHERE game_uid = ? ORDER BY seq",
+                (uid,),
+            ).fetchall()
+        return [
+            JournalRecord(round_number, State(period), ActionType(action), actor, target)
+            for round_number, period, action, actor, target in rows
+        ]
+
+    # Writer thread
+    def _run(self) -> None:
+        conn = _connect(self.path)
+        # Commits reach the WAL without an fsync; checkpoints fsync it into the database
+        conn.execute("PRAGMA synchronous = NORMAL")
+        try:
+            while True:
+                items = [self._queue.get()]
+                while len(items) < MAX_GROUP:
+                    try:
+                        items.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                batches = [item for item in items if isinstance(item, Batch)]
+                if batches and self._error is None:
+                    try:
+                        with conn:
+                            for batch in batches:
+                                self._write(conn, batch)
+                        self.batches += len(batches)
+                        self.commits += 1
+                    except Exception as e:
+                        # Kept for `flush`/`close`; the game goes on without persistence
+                        self._error = e
+                for item in items:
+                    if isinstance(item, threading.Event):
+                        item.set()
+                if None in items:
+                    return
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, batch: Batch) -> None:
+        uid = batch.game[0]
+        conn.execute(
+            "INSERT INTO games VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(uid) DO UPDATE SET "
+            "status = excluded.status, period = excluded.period, round_number = excluded.round_number, "
+            "winner = excluded.winner, updated_at = excluded.updated_at",
+            batch.game,
+        )
+        if batch.lineup:
+            conn.executemany("INSERT OR REPLACE INTO lineups VALUES (?, ?, ?)", [(uid, *row) for row in batch.lineup])
+        if batch.players:
+            conn.executemany("INSERT OR REPLACE INTO players VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [(uid, *row) for row in batch.players])
+        if batch.records:
+            conn.executemany(
+                "INSERT OR REPLACE INTO actions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (uid, seq, r.round_number, r.period.value, r.action.value, r.actor, r.target)
+                    for seq, r in enumerate(ActionJournal(batch.records), batch.first_seq)
+                ],
+            )
+        if batch.game[1] == GameStatus.FINISHED.value:
+            record_game(conn, uid)
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+
+class GameTracker:
+    """Sends what changed in `game` to `store` at the end of every phase (`play_game(game, after_phase=tracker.flush)`)."""
+
+    def __init__(self, store: GameStore, game: Game) -> None:
+        self.store = store
+        self.game = game
+        # Journal records already sent, last sent row of each seat
+        self._sent = 0
+        self._players: Dict[int, PlayerRow] = {}
+        self._lineup_sent = False
+
+    def flush(self, game: Optional[Game] = None) -> None:
+        """Queue the changes since the previous flush (in-memory copies only)."""
+        game = self.game if game is None else game
+        end = len(game.journal)
+        records = bytes(game.journal.raw()[self._sent * RECORD.size:end * RECORD.size]) if end > self._sent else b""
+        players = []
+        for player in game.players:
+            row = (
+                player.player_id,
+                player.name,
+                player.role.value if player.role else None,
+                player.alive,
+                player.is_revealed,
+                player.is_mayor,
+                player.lover.player_id if player.lover is not None else None,
+            )
+            if self._players.get(player.player_id) != row:
+                self._players[player.player_id] = row
+                players.append(row)
+        lineup = [] if self._lineup_sent else [(role.value, count) for role, count in game.lineup.items()]
+        self._lineup_sent = True
+        self.store.submit(
+            Batch(
+                game=(
+                    game.uid,
+                    game.status.value,
+                    game.period.value,
+                    game.round_number,
+                    game.winner.value if game.winner else None,
+                    time.time(),
+                ),
+                lineup=lineup,
+                players=players,
+                first_seq=self._sent,
+                records=records,
+            )
+        )
+        self._sent = end
+
+
+# Lineup of the benchmark game: every role the engine plays
+BENCH_LINEUP = {
+    Role.LOUP_GAROU: 3,
+    Role.VOYANTE: 1,
+    Role.SORCIERE: 1,
+    Role.CHASSEUR: 1,
+    Role.CUPIDON: 1,
+    Role.VOLEUR: 1,
+    Role.VILLAGEOIS: 6,
+}
+
+
+def benchmark(
+    actions: int = 200_000, phase_actions: int = 16, path: Optional[Union[str, os.PathLike]] = None, seed: int = 0
+) -> Tuple[float, float]:
+    """Sustained actions per second stored (committed), and the slowest `flush` of the game loop in seconds.
+
+    Actions are journaled like in a game and flushed every `phase_actions`
+    actions; the clock stops once the writer has committed them all.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        store = GameStore(path or Path(tmp) / "bench.db")
+        rng = Random(seed)
+        game = Game.headless(BENCH_LINEUP, RandomDecisionProvider(rng=rng), rng)
+        tracker = GameTracker(store, game)
+        players = list(game.players)
+        kinds = list(ActionType)
+        slowest = 0.0
+        start = time.perf_counter()
+        for i in range(1, actions + 1):
+            game.save_action(rng.choice(players), rng.choice(kinds), rng.choice(players))
+            if i % phase_actions == 0 or i == actions:
+                game.round_number = min(i // (phase_actions * 4) + 1, 0xFFFF)
+                flushed = time.perf_counter()
+                tracker.flush()
+                slowest = max(slowest, time.perf_counter() - flushed)
+        store.close()
+        return actions / (time.perf_counter() - start), slowest
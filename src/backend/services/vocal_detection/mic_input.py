@@ -0,0 +1,148 @@
+"""
+Microphone side of the voice pipeline: preallocated ring buffer and utterance cutting.
+
+Audio is mono 16-bit PCM. A source is any iterable of int16 blocks (a sound
+card callback queue, or `WavFileSource` for tests and offline runs).
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..ambiance.soundbank import read_wav
+
+DEFAULT_SAMPLE_RATE = 16000
+
+
+class RingBuffer:
+    """Fixed-size circular buffer of samples, addressed by absolute sample index.
+
+    One writer appends blocks; readers copy any range that has not been
+    overwritten yet. Nothing is allocated after construction except the
+    copies handed to readers.
+    """
+
+    def __init__(self, capacity: int, dtype=np.int16) -> None:
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._lock = threading.Lock()
+        # Absolute index of the next sample to be written
+        self.written = 0
+
+    @property
+    def oldest(self) -> int:
+        """Absolute index of the oldest sample still available."""
+        return max(0, self.written - self.capacity)
+
+    def write(self, samples: np.ndarray) -> None:
+        # A block longer than the buffer keeps its tail but still counts in full
+        written = len(samples)
+        if written > self.capacity:
+            samples = samples[-self.capacity:]
+        with self._lock:
+            start = (self.written + written - len(samples)) % self.capacity
+            head = min(len(samples), self.capacity - start)
+            self._data[start:start + head] = samples[:head]
+            self._data[:len(samples) - head] = samples[head:]
+            self.written += written
+
+    def read(self, start: int, end: int) -> Optional[np.ndarray]:
+        """Copy of samples [start, end), or None if part of it was already overwritten."""
+        with self._lock:
+            if start < self.oldest or end > self.written:
+                return None
+            first, last = start % self.capacity, end % self.capacity
+            if first < last or end == start:
+                return self._data[first:last].copy()
+            return np.concatenate((self._data[first:], self._data[:last]))
+
+
+class UtteranceSegmenter:
+    """Energy-based voice activity detection cutting a stream into utterances.
+
+    `feed` takes consecutive blocks and returns the (start, end) absolute
+    sample ranges of the utterances completed so far: voice frames separated
+    by at least `min_silence_ms` of silence, padded with `pre_roll_ms`, and
+    cut at `max_utterance_ms`.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+        threshold: float = 500.0,
+        frame_ms: int = 20,
+        min_silence_ms: int = 300,
+        pre_roll_ms: int = 100,
+        max_utterance_ms: int = 8000,
+    ) -> None:
+        self.frame = sample_rate * frame_ms // 1000
+        self.threshold = threshold
+        self.min_silence = sample_rate * min_silence_ms // 1000
+        self.pre_roll = sample_rate * pre_roll_ms // 1000
+        self.max_utterance = sample_rate * max_utterance_ms // 1000
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._position = 0  # absolute index of the first sample of `_pending`
+        self._start: Optional[int] = None
+        self._last_voice = 0
+
+    def feed(self, samples: np.ndarray) -> List[Tuple[int, int]]:
+        if len(self._pending):
+            samples = np.concatenate((self._pending, samples))
+        count = len(samples) // self.frame
+        self._pending = samples[count * self.frame:]
+        if not count:
+            return []
+        frames = samples[: count * self.frame].reshape(count, self.frame).astype(np.float32)
+        voiced = np.sqrt(np.mean(frames * frames, axis=1)) >= self.threshold
+
+        done = []
+        for i, is_voice in enumerate(voiced):
+            frame_start = self._position + i * self.frame
+            frame_end = frame_start + self.frame
+            if is_voice:
+                if self._start is None:
+                    self._start = max(0, frame_start - self.pre_roll)
+                self._last_voice = frame_end
+                if frame_end - self._start >= self.max_utterance:
+                    done.append((self._start, frame_end))
+                    self._start = None
+            elif self._start is not None and frame_end - self._last_voice >= self.min_silence:
+                done.append((self._start, min(frame_end, self._last_voice + self.pre_roll)))
+                self._start = None
+        self._position += count * self.frame
+        return done
+
+    def flush(self) -> List[Tuple[int, int]]:
+        """End of stream: close the utterance in progress, if any."""
+        if self._start is None:
+            return []
+        end = min(self._position + len(self._pending), self._last_voice + self.pre_roll)
+        self._start, start = None, self._start
+        return [(start, end)]
+
+
+@dataclass
+class WavFileSource:
+    """Blocks of a WAV file as if captured by a microphone (mono int16 at `sample_rate`).
+
+    With `realtime`, blocks are yielded at the pace they would be recorded.
+    """
+
+    path: Union[str, os.PathLike]
+    sample_rate: int = DEFAULT_SAMPLE_RATE
+    block_ms: int = 20
+    realtime: bool = False
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        samples = read_wav(self.path, self.sample_rate, 1)[:, 0]
+        block = self.sample_rate * self.block_ms // 1000
+        started = time.monotonic()
+        for i, offset in enumerate(range(0, len(samples), block)):
+            if self.realtime:
+                delay = started + i * block / self.sample_rate - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            yield samples[offset:offset + block]
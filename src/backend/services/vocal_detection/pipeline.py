@@ -0,0 +1,152 @@
+"""
+Streaming voice pipeline: microphone blocks -> ring buffer -> utterances -> STT workers -> game.
+
+    pipeline = VoicePipeline(WavFileSource("gm.wav"), FakeBackend(...), GameStateListener(game))
+    pipeline.run()
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ...core.game import Game, GameStatus, State
+from ...core.telemetry import CUE_LATENCY_SECONDS, METRICS
+from ..ambiance.prefetch import Prefetcher
+from .intents import IntentMatcher
+from .mic_input import DEFAULT_SAMPLE_RATE, RingBuffer, UtteranceSegmenter
+from .role_decoder import RoleDecoder
+from .speech_to_text import STTBackend, Transcript, TranscriptionPool, Utterance
+
+# Seconds allowed between the end of a GM sentence and the matching game state change
+DEFAULT_LATENCY_BUDGET = 0.5
+
+
+class GameStateListener:
+    """Transcript consumer moving `game.period` to the phase the GM announces.
+
+    With a `decoder`, every transcript is an observation of a `RoleDecoder`
+    and the period follows its most likely phase, so a missed or misheard
+    cue does not derail the ambiance. A `prefetcher` is told about every
+    change so the cues of the next phases are loaded ahead. The GM
+    announcing the end of the game finishes `game`, and the prefetcher
+    drops its pending loads.
+    """
+
+    def __init__(
+        self,
+        game: Game,
+        latency_budget: float = DEFAULT_LATENCY_BUDGET,
+        matcher: Optional[IntentMatcher] = None,
+        decoder: Optional[RoleDecoder] = None,
+        prefetcher: Optional[Prefetcher] = None,
+    ) -> None:
+        self.game = game
+        self.latency_budget = latency_budget
+        self.matcher = matcher or IntentMatcher()
+        self.decoder = decoder
+        self.prefetcher = prefetcher
+        # (state, latency) of each change, and changes that missed the budget
+        self.changes: List[Tuple[State, float]] = []
+        self.late = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, transcript: Transcript) -> None:
+        with self._lock:
+            # Transcripts may come from several workers; the matcher keeps state across them
+            intents = self.matcher.feed(transcript.text)
+            if self.decoder is not None:
+                state = self.decoder.observe_intents(intents)
+                if state is self.game.period or state is State.START_UP:
+                    return
+            else:
+                states = [intent.state for intent in intents if intent.state is not None]
+                if not states:
+                    return
+                state = states[-1]
+            self.game.period = state
+            if state is State.COMPLETED:
+                self.game.status = GameStatus.FINISHED
+            if self.prefetcher is not None:
+                self.prefetcher.update(state)
+            latency = time.monotonic() - transcript.utterance.captured_at
+            METRICS.observe(CUE_LATENCY_SECONDS, latency, game=self.game.uid, phase=state.value)
+            self.changes.append((state, latency))
+            if latency > self.latency_budget:
+                self.late += 1
+
+
+@dataclass
+class PipelineStats:
+    utterances: int = 0
+    # Utterances overwritten in the ring buffer before they could be cut
+    overruns: int = 0
+    latencies: List[float] = field(default_factory=list)
+
+
+class VoicePipeline:
+    """Capture, segmentation and transcription of one microphone stream."""
+
+    def __init__(
+        self,
+        source: Iterable[np.ndarray],
+        backend: STTBackend,
+        on_transcript: Callable[[Transcript], None],
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+        segmenter: Optional[UtteranceSegmenter] = None,
+        workers: int = 2,
+        max_pending: int = 4,
+        max_age: float = 2.0,
+        buffer_seconds: float = 30.0,
+    ) -> None:
+        self.source = source
+        self.sample_rate = sample_rate
+        self.on_transcript = on_transcript
+        self.segmenter = segmenter or UtteranceSegmenter(sample_rate)
+        capacity = max(int(buffer_seconds * sample_rate), 2 * (self.segmenter.max_utterance + self.segmenter.pre_roll))
+        self.ring = RingBuffer(capacity)
+        self.stats = PipelineStats()
+        self.pool = TranscriptionPool(backend, self._transcribed, sample_rate, workers, max_pending, max_age)
+        self._seq = count()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def process(self, block: np.ndarray) -> None:
+        """Push one captured block through the ring buffer and the segmenter."""
+        self.ring.write(block)
+        self._cut(self.segmenter.feed(block))
+
+    def run(self) -> None:
+        """Capture until the source ends (or `stop()`), then wait for the pending transcriptions."""
+        for block in self.source:
+            if self._stop.is_set():
+                break
+            self.process(block)
+        self._cut(self.segmenter.flush())
+        self.pool.join()
+
+    def start(self) -> None:
+        """Run the capture loop on a background thread."""
+        self._thread = threading.Thread(target=self.run, name="mic-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.pool.close()
+
+    def _cut(self, ranges: List[Tuple[int, int]]) -> None:
+        for start, end in ranges:
+            samples = self.ring.read(start, end)
+            if samples is None:
+                self.stats.overruns += 1
+                continue
+            self.stats.utterances += 1
+            self.pool.submit(Utterance(next(self._seq), start, end, samples))
+
+    def _transcribed(self, transcript: Transcript) -> None:
+        self.stats.latencies.append(transcript.latency)
+        self.on_transcript(transcript)
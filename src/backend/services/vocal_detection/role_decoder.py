@@ -0,0 +1,132 @@
+"""
+Online HMM decoder of the phase being played, from noisy per-utterance detections.
+
+The hidden states are the game periods in calling order: the first night
+(Cupidon -> Voleur -> Voyante -> Loup-Garou -> Sorcière, for the roles
+present), the day (vote, mayor election), then the following nights without
+the first-night roles, and the end of the game, reachable from any phase and
+never left. Each state may stay, move to the next one, or skip a few (a cue
+the STT missed). Every observation updates the Viterbi scores in O(states)
+with sparse predecessor lists; history is never decoded again.
+"""
+import math
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from ...core.game import Game, State
+from ...core.phases import Step
+from ...core.registry import FIRST_NIGHT_ONLY
+from .intents import Intent
+
+
+def _periods(steps: Iterable[Step], first: Optional[State] = None) -> List[State]:
+    """Periods of a run of steps, after `first` (consecutive steps of one period count once)."""
+    states = [] if first is None else [first]
+    for step in steps:
+        if not states or step.period is not states[-1]:
+            states.append(step.period)
+    return states
+
+
+class RoleDecoder:
+    """Most likely current phase given every observation so far (max-product filtering)."""
+
+    def __init__(
+        self,
+        first_night: Sequence[State],
+        night: Optional[Sequence[State]] = None,
+        day: Sequence[State] = (State.DAY_VOTE,),
+        stay: float = 0.6,
+        skip: float = 0.15,
+        max_skip: int = 2,
+        end: float = 0.5,
+        floor: float = 0.05,
+    ) -> None:
+        """
+        :param first_night: periods called on the first night, in order
+        :param night: periods of the following nights (default: first night minus Cupidon/Voleur)
+        :param day: periods of a day, in order
+        :param stay: prior of remaining in the same phase for one more utterance
+        :param skip: relative prior of jumping one phase further (per skipped phase)
+        :param end: relative prior of the game ending after any phase
+        :param floor: likelihood of a phase absent from an observation
+        """
+        if night is None:
+            first_night_only = {State[role.name] for role in FIRST_NIGHT_ONLY}
+            night = [state for state in first_night if state not in first_night_only]
+        self.floor = floor
+        paths = [[State.START_UP, *first_night, *day], [*day, *night, *day]]
+        states = dict.fromkeys(state for path in paths for state in path)
+        states[State.COMPLETED] = None
+        self.states: Tuple[State, ...] = tuple(states)
+        index = {state: i for i, state in enumerate(self.states)}
+
+        # Successors of each state with their weight, merged over both paths
+        weights: List[Dict[int, float]] = [{} for _ in self.states]
+        for path in paths:
+            for i, state in enumerate(path[:-1]):
+                for step in range(1, max_skip + 2):
+                    if i + step < len(path):
+                        target = index[path[i + step]]
+                        source = weights[index[state]]
+                        source[target] = max(source.get(target, 0.0), skip ** (step - 1))
+        # The game may end after any phase once it started; the end is never left
+        for state, targets in zip(self.states, weights):
+            if state not in (State.START_UP, State.COMPLETED):
+                targets[index[State.COMPLETED]] = end
+        # predecessors[t] = ((s, log P(s -> t)), ...)
+        predecessors: List[List[Tuple[int, float]]] = [[] for _ in self.states]
+        for source, targets in enumerate(weights):
+            total = sum(targets.values())
+            move = 1 - stay if total else 0.0
+            predecessors[source].append((source, math.log(stay if total else 1.0)))
+            for target, weight in targets.items():
+                if target != source:
+                    predecessors[target].append((source, math.log(move * weight / total)))
+        self._predecessors = predecessors
+        self._index = index
+        self.reset()
+
+    @classmethod
+    def for_game(cls, game: Game, **kwargs) -> "RoleDecoder":
+        """Decoder for the periods of `game.schedule` (a day starts in the day vote, as in `process_day`)."""
+        schedule = game.schedule
+        return cls(
+            _periods(schedule.first_night),
+            night=_periods(schedule.night),
+            day=_periods(schedule.day, first=State.DAY_VOTE),
+            **kwargs,
+        )
+
+    def reset(self) -> None:
+        """Back to the start of the game."""
+        self._scores = [0.0 if state is State.START_UP else -math.inf for state in self.states]
+        self._best = self._index[State.START_UP]
+
+    @property
+    def current(self) -> State:
+        return self.states[self._best]
+
+    def observe(self, likelihoods: Mapping[State, float]) -> State:
+        """Update with one utterance's per-phase likelihoods (missing phases get `floor`)."""
+        scores = self._scores
+        floor = math.log(self.floor)
+        updated = []
+        for target, predecessors in enumerate(self._predecessors):
+            best = max(scores[source] + weight for source, weight in predecessors)
+            likelihood = likelihoods.get(self.states[target])
+            updated.append(best + (math.log(likelihood) if likelihood else floor))
+        top = max(updated)
+        # Renormalized so scores never drift towards -inf
+        self._scores = [score - top for score in updated]
+        self._best = self._scores.index(0.0)
+        return self.current
+
+    def observe_intents(self, intents: Iterable[Intent], confidence: float = 0.9) -> State:
+        """Observation built from recognized intents (an utterance without any still counts)."""
+        return self.observe({intent.state: confidence for intent in intents if intent.state in self._index})
+
+    def probabilities(self) -> Dict[State, float]:
+        """Relative weight of each phase (normalized best-path scores)."""
+        weights = [math.exp(score) for score in self._scores]
+        total = sum(weights)
+        return {state: weight / total for state, weight in zip(self.states, weights)}
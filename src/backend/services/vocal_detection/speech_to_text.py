@@ -0,0 +1,184 @@
+"""
+Transcription side of the voice pipeline: pluggable backends and a bounded worker pool.
+"""
+import os
+import threading
+import time
+import unicodedata
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Protocol, Union
+
+import numpy as np
+
+from ..ambiance.soundbank import read_wav
+
+
+def normalize(text: str) -> str:
+    """Lowercase, accent-folded text with punctuation turned into spaces ("Sorcière !" -> "sorciere")."""
+    folded = unicodedata.normalize("NFKD", text.lower())
+    letters = (c if c.isalnum() else " " for c in folded if not unicodedata.combining(c))
+    return " ".join("".join(letters).split())
+
+
+@dataclass
+class Utterance:
+    """A cut of the microphone stream waiting for transcription."""
+
+    seq: int
+    start: int
+    end: int
+    samples: np.ndarray = field(repr=False)
+    # time.monotonic() when the end of the utterance was detected
+    captured_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class Transcript:
+    utterance: Utterance
+    text: str
+    # Seconds from the end of the utterance to the end of its transcription
+    latency: float
+
+
+class STTBackend(Protocol):
+    """Speech-to-text engine: mono int16 samples in, text out (may be called from several threads)."""
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> str:
+        ...
+
+
+class FakeBackend:
+    """Deterministic backend for tests: recognizes the WAV fixtures it was given.
+
+    An utterance is matched against each fixture once both are trimmed of
+    leading/trailing samples quieter than `trim_level`; unknown audio gives
+    "". `delay` simulates the processing time of a real engine.
+    """
+
+    def __init__(self, fixtures: Dict[str, np.ndarray], delay: float = 0.0, trim_level: int = 0) -> None:
+        self.trim_level = trim_level
+        self.delay = delay
+        self._fixtures = {text: self._trim(np.asarray(samples, dtype=np.int16)) for text, samples in fixtures.items()}
+
+    @classmethod
+    def from_directory(cls, path: Union[str, os.PathLike], sample_rate: int, **kwargs) -> "FakeBackend":
+        """Fixtures from `path/*.wav`; the text is the sidecar `.txt` if any, else the file stem."""
+        fixtures = {}
+        for wav in sorted(Path(path).glob("*.wav")):
+            sidecar = wav.with_suffix(".txt")
+            text = sidecar.read_text("utf-8").strip() if sidecar.exists() else wav.stem.replace("_", " ")
+            fixtures[text] = read_wav(wav, sample_rate, 1)[:, 0]
+        return cls(fixtures, **kwargs)
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> str:
+        if self.delay:
+            time.sleep(self.delay)
+        trimmed = self._trim(samples)
+        for text, fixture in self._fixtures.items():
+            if len(fixture) == len(trimmed) and np.array_equal(fixture, trimmed):
+                return text
+        return ""
+
+    def _trim(self, samples: np.ndarray) -> np.ndarray:
+        loud = np.flatnonzero(np.abs(samples.astype(np.int32)) > self.trim_level)
+        return samples[loud[0]:loud[-1] + 1] if len(loud) else samples[:0]
+
+
+@dataclass
+class PoolStats:
+    submitted: int = 0
+    transcribed: int = 0
+    # Dropped when the queue was full (oldest first) / too old once a worker was free
+    dropped: int = 0
+    stale: int = 0
+    # Raised by the backend or the transcript callback (the worker goes on with the next utterance)
+    failed: int = 0
+    last_error: Optional[BaseException] = None
+
+
+class TranscriptionPool:
+    """Worker threads transcribing utterances, with a bounded queue.
+
+    When more than `max_pending` utterances wait, the oldest is dropped
+    (backpressure: the GM's latest words matter most), and an utterance that
+    waited longer than `max_age` seconds is skipped instead of transcribed.
+    A failing utterance is counted in `stats.failed` and does not stop its worker.
+    """
+
+    def __init__(
+        self,
+        backend: STTBackend,
+        on_transcript: Callable[[Transcript], None],
+        sample_rate: int,
+        workers: int = 2,
+        max_pending: int = 4,
+        max_age: float = 2.0,
+    ) -> None:
+        self.backend = backend
+        self.on_transcript = on_transcript
+        self.sample_rate = sample_rate
+        self.max_pending = max_pending
+        self.max_age = max_age
+        self.stats = PoolStats()
+        self._queue: Deque[Utterance] = deque()
+        self._busy = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = [
+            threading.Thread(target=self._work, name=f"stt-{i}", daemon=True) for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, utterance: Utterance) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Transcription pool is closed")
+            self.stats.submitted += 1
+            if len(self._queue) >= self.max_pending:
+                self._queue.popleft()
+                self.stats.dropped += 1
+            self._queue.append(utterance)
+            self._cond.notify()
+
+    def join(self) -> None:
+        """Wait until every queued utterance has been handled."""
+        with self._cond:
+            self._cond.wait_for(lambda: not self._queue and not self._busy)
+
+    def close(self) -> None:
+        """Finish the queued utterances and stop the workers."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                utterance = self._queue.popleft()
+                if time.monotonic() - utterance.captured_at > self.max_age:
+                    self.stats.stale += 1
+                    self._cond.notify_all()
+                    continue
+                self._busy += 1
+            error = None
+            try:
+                text = self.backend.transcribe(utterance.samples, self.sample_rate)
+                self.on_transcript(Transcript(utterance, text, time.monotonic() - utterance.captured_at))
+            except Exception as e:
+                error = e
+            with self._cond:
+                self._busy -= 1
+                if error is None:
+                    self.stats.transcribed += 1
+                else:
+                    self.stats.failed += 1
+                    self.stats.last_error = error
+                self._cond.notify_all()
@@ -0,0 +1,123 @@
+import sqlite3
+
+from src.backend.core.balance import NOBODY
+from src.backend.core.game import ActionType, State
+from src.backend.core.journal import NO_PLAYER, JournalRecord
+from src.backend.core.phases import play_game
+from src.backend.core.role_distributor import ROLE_DISTRIBUTIONS, Role
+from src.backend.services.game_tracking.analytics import backfill, game_facts, lineup_key, lineup_label
+from src.backend.services.game_tracking.tracker import GameStore, GameTracker
+
+LINEUPS = [ROLE_DISTRIBUTIONS[8][0], ROLE_DISTRIBUTIONS[10][0]]
+TABLES = ("analytics_games", "analytics_counters", "analytics_lineup_wins", "analytics_first_night_kills", "analytics_mayor_terms")
+
+
+def _play(new_game, store, count, seed=0):
+    games = []
+    for number in range(count):
+        game = new_game(LINEUPS[number % len(LINEUPS)], seed * 1000 + number)
+        play_game(game, after_phase=GameTracker(store, game).flush)
+        games.append(game)
+    store.flush()
+    return games
+
+
+def test_game_facts_of_a_journal():
+    wolf, seer, witch, mayor, villager = range(5)
+    roles = {wolf: Role.LOUP_GAROU, seer: Role.VOYANTE, witch: Role.SORCIERE, mayor: Role.VILLAGEOIS, villager: Role.VILLAGEOIS}
+    records = [
+        JournalRecord(1, State.LOUP_GAROU, ActionType.KILL, NO_PLAYER, seer),
+        JournalRecord(1, State.SORCIERE, ActionType.HEAL, witch, seer),
+        JournalRecord(1, State.MAYOR_ELECTION, ActionType.MAYOR, NO_PLAYER, mayor),
+        JournalRecord(1, State.DAY_VOTE, ActionType.VOTE, NO_PLAYER, wolf),
+        # Second night, still round 1: not the first night
+        JournalRecord(1, State.LOUP_GAROU, ActionType.KILL, NO_PLAYER, villager),
+        JournalRecord(1, State.SORCIERE, ActionType.HEAL, witch, villager),
+        JournalRecord(2, State.DAY_VOTE, ActionType.VOTE, NO_PLAYER, seer),
+        JournalRecord(2, State.LOUP_GAROU, ActionType.KILL, NO_PLAYER, mayor),
+        # The mayor died on the second night and names a successor on day 3, still in office at the end
+        JournalRecord(3, State.MAYOR_ELECTION, ActionType.MAYOR, mayor, witch),
+        JournalRecord(3, State.DAY_VOTE, ActionType.VOTE, NO_PLAYER, villager),
+    ]
+    lineup = {Role.LOUP_GAROU: 1, Role.VOYANTE: 1, Role.SORCIERE: 1, Role.VILLAGEOIS: 2}
+    facts = game_facts("g", lineup, roles, records, None, rounds=3)
+    assert facts.first_night_kill == "voyante" and facts.first_night_heal and facts.sorciere
+    assert facts.winner == NOBODY
+    assert facts.mayor_terms == [(2, True), (0, False)]
+    assert lineup_key(lineup) == "loup_garou=1,sorciere=1,villageois=2,voyante=1"
+
+    # Nobody killed or healed on the first night: the second night does not count
+    facts = game_facts("g", lineup, roles, records[2:], None, rounds=3)
+    assert facts.first_night_kill == NOBODY and not facts.first_night_heal
+
+
+def test_game_facts_of_played_games(new_game):
+    for seed in range(60):
+        game = new_game(LINEUPS[0], seed)
+        first_night = []
+        play_game(game, after_phase=lambda game: first_night or first_night.extend(game.journal))
+        roles = {player.player_id: player.role for player in game.players}
+        facts = game_facts(game.uid, game.lineup, roles, game.journal, None, game.round_number)
+        kill = next((r for r in first_night if r.action is ActionType.KILL and r.period is State.LOUP_GAROU), None)
+        assert facts.first_night_kill == (roles[kill.target].value if kill else NOBODY)
+        assert facts.first_night_heal == any(r.action is ActionType.HEAL for r in first_night)
+
+
+def test_aggregates_follow_finished_games(tmp_path, new_game):
+    with GameStore(tmp_path / "games.db") as store:
+        games = _play(new_game, store, 30)
+        report = store.analytics()
+        assert report.games == len(games)
+        assert sum(report.first_night_kills.values()) == len(games)
+        assert report.sorciere_games == len(games)
+        assert 0 < report.first_night_heal_rate < 1
+        assert report.mean_rounds == sum(game.round_number for game in games) / len(games)
+        for lineup in LINEUPS:
+            result = report.win_rates[lineup_key(lineup)]
+            played = [game for game in games if game.lineup == lineup]
+            assert result.games == len(played)
+            wolves = sum(game.winner is not None and game.winner.value == "loup_garou" for game in played)
+            assert result.wins["loup_garou"] == wolves
+        assert {lineup_label(key) for key in report.win_rates} == {"8 players #1", "10 players #1"}
+        survival = report.mayor_survival()
+        assert survival and all(1 >= a >= b >= 0 for a, b in zip(survival, survival[1:]))
+
+        # Flushing a finished game again does not count it twice
+        GameTracker(store, games[0]).flush()
+        store.flush()
+        assert store.analytics().games == len(games)
+
+
+def test_parallel_backfill_matches_incremental_views(tmp_path, new_game):
+    path = tmp_path / "games.db"
+    with GameStore(path) as store:
+        _play(new_game, store, 40, seed=1)
+        incremental = store.analytics()
+
+    # Games archived before the analytics existed
+    conn = sqlite3.connect(path)
+    with conn:
+        for table in TABLES:
+            conn.execute(f"DELETE FROM {table}")
+    conn.close()
+    assert backfill(path, workers=2, chunk_size=7) == 40
+    assert backfill(path, workers=2, chunk_size=7) == 0
+    with GameStore(path) as store:
+        assert store.analytics() == incremental
+
+
+def test_backfill_opens_paths_with_uri_characters(tmp_path, new_game):
+    path = tmp_path / "100% ?#" / "games.db"
+    path.parent.mkdir()
+    with GameStore(path) as store:
+        _play(new_game, store, 3)
+        incremental = store.analytics()
+
+    conn = sqlite3.connect(path)
+    with conn:
+        for table in TABLES:
+            conn.execute(f"DELETE FROM {table}")
+    conn.close()
+    assert backfill(path, workers=1) == 3
+    with GameStore(path) as store:
+        assert store.analytics() == incremental
@@ -0,0 +1,40 @@
+from src.backend.core.game import ActionType, NightState, State
+from src.backend.services.vocal_detection.intents import IntentMatcher, benchmark
+
+
+def test_matches_phrases_across_transcripts():
+    matcher = IntentMatcher()
+
+    assert matcher.feed("Bon, les loups-garous") == []
+    intents = matcher.feed("désignent leur victime !")
+
+    assert [(i.state, i.action) for i in intents] == [(State.LOUP_GAROU, ActionType.KILL)]
+    assert intents[0].night_state is NightState.LOUP_GAROU
+
+
+def test_tolerates_inflections_and_stt_typos():
+    matcher = IntentMatcher()
+
+    assert [i.state for i in matcher.feed("Cupidon, réveillez-vous")] == [State.CUPIDON]
+    assert [i.action for i in matcher.feed("la sorcire utilise sa potion de mort")] == [ActionType.POISON]
+    assert matcher.feed("tout le monde se rendort") == []
+
+
+def test_a_hesitation_does_not_break_a_phrase():
+    matcher = IntentMatcher()
+
+    intents = matcher.feed("les loups garous, euh, désignent leur victime")
+    assert [(i.state, i.action) for i in intents] == [(State.LOUP_GAROU, ActionType.KILL)]
+    assert [i.state for i in matcher.feed("la voyante... hum")] == []
+    assert [i.state for i in matcher.feed("se réveille")] == [State.VOYANTE]
+
+
+def test_unknown_words_break_a_phrase():
+    matcher = IntentMatcher()
+
+    assert matcher.feed("la voyante mange une pomme et se réveille") == []
+    assert [i.state for i in matcher.feed("le village vote")] == [State.DAY_VOTE]
+
+
+def test_benchmark_reports_throughput():
+    assert benchmark(tokens=20_000) > 10_000
@@ -0,0 +1,139 @@
+import tracemalloc
+
+import numpy as np
+
+from src.backend.core.game import State
+from src.backend.core.phases import play_game
+from src.backend.core.role_distributor import Role
+from src.backend.services.ambiance.mixer import DEATH_STING, NIGHT_BED, GameAmbiance, Mixer, WavSink, render_offline
+from src.backend.services.ambiance.prefetch import AssetCache
+from src.backend.services.ambiance.soundbank import read_wav
+
+RATE = 8000
+LINEUP = {Role.LOUP_GAROU: 2, Role.CUPIDON: 1, Role.VOYANTE: 1, Role.SORCIERE: 1, Role.VILLAGEOIS: 3}
+
+
+def _tone(level, seconds=1.0):
+    return np.full((int(RATE * seconds), 2), level, np.int16)
+
+
+def _render(mixer, blocks):
+    out = np.zeros((mixer.block, mixer.channels), np.int16)
+    rendered = []
+    for _ in range(blocks):
+        mixer.render(out)
+        rendered.append(out[:, 0].copy())
+    return np.concatenate(rendered)
+
+
+def test_crossfades_are_smooth_even_when_interrupted():
+    mixer = Mixer(RATE, 2, block=256, fade=0.5)
+    mixer.play_bed(_tone(16000))
+    first = _render(mixer, 40)
+    # Fade in from silence, then the looped bed at full level
+    assert first[0] == 0 and first[-1] == 16000
+    mixer.play_bed(_tone(-16000))
+    switch = _render(mixer, 4)
+    # Crossfade interrupted halfway by another bed
+    mixer.play_bed(_tone(8000))
+    end = _render(mixer, 40)
+    samples = np.concatenate((first, switch, end)).astype(np.int32)
+    assert end[-1] == 8000
+    # Equal-power steps of a 0.5 s fade: no sample jumps like a cut would
+    assert np.abs(np.diff(samples)).max() < 200
+    assert mixer.active == 1
+
+
+def test_one_shots_play_once_over_the_bed():
+    mixer = Mixer(RATE, 2, block=256, fade=0.01, voices=2)
+    mixer.play_bed(_tone(1000))
+    mixer.trigger(_tone(2000, seconds=0.1))
+    samples = _render(mixer, 10)
+    assert samples[200] == 3000 and samples[-1] == 1000
+    assert mixer.active == 1
+    # Every voice busy: the quietest one that is not the bed is stolen
+    mixer.trigger(_tone(100))
+    mixer.trigger(_tone(200))
+    _render(mixer, 1)
+    assert mixer.active == 2 and _render(mixer, 1)[-1] == 1200
+
+
+def test_callback_renders_the_frames_asked_for():
+    fixed = Mixer(RATE, 2, block=256, fade=0.1)
+    varying = Mixer(RATE, 2, block=256, fade=0.1)
+    for mixer in (fixed, varying):
+        mixer.play_bed(np.arange(-4000, 4000, 2, dtype=np.int16).repeat(2).reshape(-1, 2))
+    expected = _render(fixed, 12)
+    # Sound card buffers smaller, larger and longer than asked for, as sounddevice may give
+    chunks = []
+    for frames in (100, 256, 700, 300, 1, 1715):
+        outdata = np.full((frames + 10, 2), 7, np.int16)
+        varying.callback(outdata, frames)
+        assert (outdata[frames:] == 7).all()
+        chunks.append(outdata[:frames, 0].copy())
+    assert np.array_equal(np.concatenate(chunks), expected)
+
+
+def test_render_allocates_nothing():
+    mixer = Mixer(RATE, 2, block=256, fade=0.2, voices=4)
+    out = np.zeros((256, 2), np.int16)
+    first, second = _tone(3000, 0.3), _tone(-3000, 0.3)
+    mixer.trigger(_tone(2000, 60))
+    # Warm up NumPy's dispatch caches with a whole crossfade
+    for bed in (first, second):
+        mixer.play_bed(bed)
+        for _ in range(10):
+            mixer.render(out)
+    mixer.play_bed(first)
+    growth = []
+    tracemalloc.start()
+    # Best of a few runs: tracing is global, other tests' threads may allocate meanwhile
+    for _ in range(5):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        for _ in range(40):
+            mixer.render(out)
+        growth.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+    # Less than one block of float samples: only short-lived slice objects
+    assert min(growth) < 256 * 2 * 4
+
+
+def test_game_drives_beds_stings_and_jingle(tmp_path, new_game):
+    cues = {
+        NIGHT_BED: _tone(1000),
+        "state/vote": _tone(2000),
+        DEATH_STING: _tone(5000, 0.2),
+        "camp/villageois": _tone(7000, 0.5),
+        "camp/loup_garou": _tone(7000, 0.5),
+        "camp/amoureux": _tone(7000, 0.5),
+    }
+    cache = AssetCache(lambda key: cues[key])
+    game = new_game(LINEUP, 3)
+
+    mixer = Mixer(RATE, 2, block=256, fade=0.1)
+    played = []
+    mixer.play_bed = lambda frames, gain=1.0: played.append(("bed", frames))
+    mixer.trigger = lambda frames, gain=1.0: played.append(("shot", frames))
+    ambiance = GameAmbiance(game, mixer, cache)
+    ambiance.update()
+    play_game(game, after_phase=ambiance.update)
+
+    beds = [frames for kind, frames in played if kind == "bed"]
+    shots = [frames for kind, frames in played if kind == "shot"]
+    assert beds[0] is cues[NIGHT_BED] and any(bed is cues["state/vote"] for bed in beds)
+    # Fade out to silence at the end, then the winner's jingle
+    assert beds[-1] is None and played[-1] == ("shot", cues[f"camp/{game.winner.value}"])
+    assert any(shot is cues[DEATH_STING] for shot in shots)
+    assert ambiance.period is State.COMPLETED
+
+
+def test_wav_sink_renders_offline(tmp_path):
+    mixer = Mixer(RATE, 2, block=256, fade=0.05)
+    mixer.play_bed(_tone(4000, 0.25))
+    with WavSink(tmp_path / "ambiance.wav", RATE, 2) as sink:
+        render_offline(mixer, sink, seconds=2)
+    frames = read_wav(tmp_path / "ambiance.wav", RATE, 2)
+    assert len(frames) == sink.frames >= 2 * RATE
+    # The 0.25 s bed loops for the whole render
+    assert (frames[RATE:, 0] == 4000).all()
@@ -0,0 +1,78 @@
+import threading
+
+import numpy as np
+
+from src.backend.core.game import State
+from src.backend.core.role_distributor import Role
+from src.backend.services.ambiance.prefetch import AssetCache, Prefetcher, phase_successors
+
+LINEUP = {Role.LOUP_GAROU: 2, Role.CUPIDON: 1, Role.VOYANTE: 1, Role.SORCIERE: 1, Role.VILLAGEOIS: 2}
+
+
+def _loader(calls, started=None, gate=None):
+    def load(key):
+        calls.append(key)
+        if gate is not None:
+            started.set()
+            gate.wait(5)
+        return np.zeros((100, 2), np.int16)
+
+    return load
+
+
+def test_successors_follow_the_schedule(new_game):
+    successors = phase_successors(new_game(LINEUP).schedule)
+
+    assert successors[State.START_UP] == (State.CUPIDON,)
+    assert successors[State.VOYANTE] == (State.LOUP_GAROU,)
+    assert successors[State.SORCIERE] == (State.DAY_VOTE,)
+    # After the vote: the mayor election, or the next night (without Cupidon)
+    assert successors[State.DAY_VOTE] == (State.MAYOR_ELECTION, State.VOYANTE)
+
+
+def test_next_phases_are_prefetched(new_game):
+    calls = []
+    cache = AssetCache(_loader(calls))
+    prefetcher = Prefetcher.for_game(new_game(LINEUP), cache)
+
+    prefetcher.update(State.VOYANTE)
+    prefetcher.wait()
+    assert calls == ["state/loup_garou", "state/sorciere"]
+
+    prefetcher.update(State.LOUP_GAROU)
+    cache.get("state/loup_garou")
+    prefetcher.wait()
+    prefetcher.close()
+    assert calls[2:] == ["state/vote"]
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.prefetched) == (1, 0, 3)
+
+
+def test_unexpected_period_cancels_prefetches(new_game):
+    calls, started, gate = [], threading.Event(), threading.Event()
+    cache = AssetCache(_loader(calls, started, gate))
+    prefetcher = Prefetcher.for_game(new_game(LINEUP), cache)
+
+    prefetcher.update(State.VOYANTE)
+    assert started.wait(5)
+    # The game ends while the first load is still running
+    prefetcher.update(State.COMPLETED)
+    gate.set()
+    prefetcher.close()
+
+    assert calls == ["state/loup_garou"]
+    assert len(cache) == 0 and cache.stats.prefetched == 0
+    assert cache.stats.cancelled == 2
+    assert cache.get("state/sorciere") is not None and cache.stats.misses == 1
+
+
+def test_cache_evicts_least_recently_used():
+    # 200 bytes per cue: room for two
+    cache = AssetCache(lambda key: np.zeros(100, np.int16), capacity=450)
+    for key in "abc":
+        cache.get(key)
+    cache.get("b")
+    cache.get("d")
+
+    assert list(cache._entries) == ["b", "d"]
+    assert cache.size == 400 and cache.stats.evicted == 2
+    assert (cache.stats.hits, cache.stats.misses) == (1, 4)
@@ -0,0 +1,88 @@
+import threading
+
+import numpy as np
+
+from src.backend.core.decisions import ScriptedDecisionProvider
+from src.backend.core.game import Game, GameStatus, State
+from src.backend.core.role_distributor import Role
+from src.backend.services.ambiance.prefetch import AssetCache, Prefetcher
+from src.backend.services.vocal_detection.intents import IntentMatcher
+from src.backend.services.vocal_detection.pipeline import GameStateListener
+from src.backend.services.vocal_detection.role_decoder import RoleDecoder
+from src.backend.services.vocal_detection.speech_to_text import Transcript, Utterance
+
+NIGHT = [State.CUPIDON, State.VOLEUR, State.VOYANTE, State.LOUP_GAROU, State.SORCIERE]
+
+
+def test_follows_the_night_order_and_skips_a_missed_cue():
+    decoder = RoleDecoder(NIGHT)
+
+    assert decoder.observe({State.CUPIDON: 0.9}) is State.CUPIDON
+    assert decoder.observe({}) is State.CUPIDON
+    assert decoder.observe({State.VOYANTE: 0.9}) is State.VOYANTE
+    # The wolves cue was missed: the Sorcière cue still moves forward
+    assert decoder.observe({State.SORCIERE: 0.9}) is State.SORCIERE
+    assert decoder.observe({State.DAY_VOTE: 0.9}) is State.DAY_VOTE
+
+
+def test_first_night_roles_are_not_called_again():
+    decoder = RoleDecoder(NIGHT)
+    for state in (State.CUPIDON, State.VOYANTE, State.LOUP_GAROU, State.SORCIERE, State.DAY_VOTE):
+        decoder.observe({state: 0.9})
+
+    # A noisy Cupidon detection on the second night loses against the Voyante
+    assert decoder.observe({State.CUPIDON: 0.6, State.VOYANTE: 0.3}) is State.VOYANTE
+    assert State.VOLEUR in decoder.states
+    assert abs(sum(decoder.probabilities().values()) - 1) < 1e-9
+
+
+def test_for_game_uses_present_roles_and_drives_the_listener():
+    game = Game(6, provider=ScriptedDecisionProvider())
+    decoder = RoleDecoder.for_game(game)
+    listener = GameStateListener(game, matcher=IntentMatcher(), decoder=decoder)
+
+    assert decoder.states[0] is State.START_UP and State.LOUP_GAROU in decoder.states
+    listener(Transcript(Utterance(0, 0, 0, None), "les loups-garous se réveillent", 0.0))
+    assert game.period is State.LOUP_GAROU
+    listener(Transcript(Utterance(1, 0, 0, None), "euh", 0.0))
+    assert game.period is State.LOUP_GAROU
+
+
+def _transcript(i, text):
+    return Transcript(Utterance(i, 0, 0, None), text, 0.0)
+
+
+def test_for_game_follows_the_schedule_until_the_end_of_the_game(new_game):
+    game = new_game({Role.LOUP_GAROU: 2, Role.CUPIDON: 1, Role.VOYANTE: 1, Role.SORCIERE: 1, Role.VILLAGEOIS: 2})
+    started, gate = threading.Event(), threading.Event()
+
+    def load(key):
+        started.set()
+        gate.wait(5)
+        return np.zeros((100, 2), np.int16)
+
+    cache = AssetCache(load)
+    prefetcher = Prefetcher.for_game(game, cache)
+    decoder = RoleDecoder.for_game(game)
+    listener = GameStateListener(game, matcher=IntentMatcher(), decoder=decoder, prefetcher=prefetcher)
+
+    assert decoder.states == (
+        State.START_UP, State.CUPIDON, State.VOYANTE, State.LOUP_GAROU, State.SORCIERE,
+        State.DAY_VOTE, State.MAYOR_ELECTION, State.COMPLETED,
+    )
+    announces = ("cupidon se réveille", "la voyante se réveille", "les loups-garous se réveillent",
+                 "la sorcière se réveille", "le village se réveille", "élection du maire")
+    for i, text in enumerate(announces):
+        listener(_transcript(i, text))
+    assert game.period is State.MAYOR_ELECTION
+    assert started.wait(5)
+
+    # The end is announced while the next cues are still loading
+    listener(_transcript(6, "la partie est terminée"))
+    assert (game.period, game.status) == (State.COMPLETED, GameStatus.FINISHED)
+    assert cache.stats.cancelled > 0
+    # The end is never left
+    listener(_transcript(7, "la voyante se réveille"))
+    assert game.period is State.COMPLETED
+    gate.set()
+    prefetcher.close()
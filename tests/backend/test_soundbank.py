@@ -0,0 +1,54 @@
+import wave
+
+import numpy as np
+import pytest
+
+from src.backend.core.game import State
+from src.backend.core.role_distributor import Role
+from src.backend.services.ambiance.soundbank import SoundBank, build_bank, cue_name
+
+
+def _write_wav(path, samples, rate, width=2):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(samples.shape[1])
+        wav.setsampwidth(width)
+        wav.setframerate(rate)
+        wav.writeframes(samples.astype("<i2" if width == 2 else np.uint8).tobytes())
+
+
+def test_cue_names_from_game_values():
+    assert cue_name(State.LOUP_GAROU) == "state/loup_garou"
+    assert cue_name(Role.SORCIERE) == "role/sorciere"
+    assert cue_name("jingle") == "jingle"
+
+
+def test_build_and_map_bank(tmp_path):
+    stereo = np.stack([np.arange(0, 1000, 10), -np.arange(0, 1000, 10)], axis=1)
+    _write_wav(tmp_path / "wav" / "state" / "loup_garou.wav", stereo, 8000)
+    # 8-bit mono at half the rate: converted to the bank format
+    _write_wav(tmp_path / "wav" / "role" / "sorciere.wav", np.full((50, 1), 192), 4000, width=1)
+    bank_path = tmp_path / "ambiance.bank"
+
+    frames = build_bank(tmp_path / "wav", bank_path, sample_rate=8000, channels=2)
+
+    assert frames == {"role/sorciere": 100, "state/loup_garou": 100}
+    with SoundBank(bank_path) as bank:
+        assert State.LOUP_GAROU in bank and Role.VOYANTE not in bank
+        clip = bank.clip(State.LOUP_GAROU)
+        wolves = bank.frames(State.LOUP_GAROU).copy()
+        sorciere = bank.frames(Role.SORCIERE).copy()
+        mapped = isinstance(clip.obj, type(bank._map))
+        clip.release()
+        assert bank.duration(Role.SORCIERE) == pytest.approx(100 / 8000)
+
+    assert mapped  # a view of the mapping, not a copy
+    assert np.array_equal(wolves, stereo)
+    assert np.all(sorciere == 16384)  # 8-bit 192 is half scale
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not.bank"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        SoundBank(path)
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+
+from src.backend.core.game import GameStatus
+from src.backend.core.phases import play_game
+from src.backend.services.game_tracking import tracker as tracker_module
+from src.backend.services.game_tracking.tracker import BENCH_LINEUP, ConnectionPool, GameStore, GameTracker, benchmark
+
+
+def test_games_are_stored_phase_by_phase(tmp_path, new_game):
+    games = [new_game(BENCH_LINEUP, seed) for seed in range(5)]
+    with GameStore(tmp_path / "games.db") as store:
+        for game in games:
+            play_game(game, after_phase=GameTracker(store, game).flush)
+        store.flush()
+        # First night, every day and night, and the end of the game
+        assert store.batches >= len(games) * 3
+        assert store.commits <= store.batches
+
+        stored = {game.uid: game for game in store.games()}
+        for game in games:
+            assert stored[game.uid].status is GameStatus.FINISHED
+            assert stored[game.uid].winner == game.winner
+            assert stored[game.uid].round_number == game.round_number
+            assert stored[game.uid].lineup == game.lineup
+            assert store.actions(game.uid) == list(game.journal)
+            players = store.players(game.uid)
+            assert [(p.name, p.role, p.alive, p.is_mayor) for p in players] == [(p.name, p.role, p.alive, p.is_mayor) for p in game.players]
+            assert [p.lover_seat for p in players] == [p.lover.player_id if p.lover else None for p in game.players]
+
+    # WAL mode is kept by the file; a new store reads the same games
+    with GameStore(tmp_path / "games.db") as store:
+        assert {game.uid for game in store.games()} == {game.uid for game in games}
+        with store.pool.connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_game_loop_never_waits_for_the_writer(tmp_path, monkeypatch, new_game):
+    release = threading.Event()
+    write = GameStore._write
+
+    def slow_write(conn, batch):
+        release.wait()
+        write(conn, batch)
+
+    monkeypatch.setattr(GameStore, "_write", staticmethod(slow_write))
+    store = GameStore(tmp_path / "games.db")
+    game = new_game(BENCH_LINEUP, 1)
+    start = time.perf_counter()
+    play_game(game, after_phase=GameTracker(store, game).flush)
+    assert time.perf_counter() - start < 1
+    # Nothing is written yet: the disk is "stuck"
+    assert store.games() == []
+    release.set()
+    store.close()
+    with GameStore(tmp_path / "games.db") as store:
+        assert store.actions(game.uid) == list(game.journal)
+
+
+def test_writer_errors_are_raised_on_flush(tmp_path, monkeypatch, new_game):
+    def broken_write(conn, batch):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(GameStore, "_write", staticmethod(broken_write))
+    store = GameStore(tmp_path / "games.db")
+    game = new_game(BENCH_LINEUP, 2)
+    GameTracker(store, game).flush()
+    with pytest.raises(OSError, match="disk full"):
+        store.flush()
+    with pytest.raises(OSError):
+        store.close()
+
+
+def test_read_pool_is_bounded_and_read_only(tmp_path):
+    GameStore(tmp_path / "games.db").close()
+    pool = ConnectionPool(tmp_path / "games.db", size=2)
+    with pool.connection() as first, pool.connection() as second:
+        assert first is not second
+        with pytest.raises(Exception):
+            first.execute("DELETE FROM games")
+    with pool.connection() as again:
+        assert again in (first, second)
+    assert pool._opened == 2
+    pool.close()
+
+
+def test_benchmark_reports_sustained_rate(tmp_path, monkeypatch):
+    monkeypatch.setattr(tracker_module, "MAX_GROUP", 8)
+    rate, slowest = benchmark(actions=2000, path=tmp_path / "bench.db")
+    assert rate > 0 and slowest < 1
+    with GameStore(tmp_path / "bench.db") as store:
+        assert len(store.games()) == 1
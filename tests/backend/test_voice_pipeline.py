@@ -0,0 +1,125 @@
+import time
+import wave
+
+import numpy as np
+
+from src.backend.core.decisions import RandomDecisionProvider
+from src.backend.core.game import Game, State
+from src.backend.services.vocal_detection.mic_input import RingBuffer, UtteranceSegmenter, WavFileSource
+from src.backend.services.vocal_detection.pipeline import GameStateListener, VoicePipeline
+from src.backend.services.vocal_detection.speech_to_text import FakeBackend, TranscriptionPool, Utterance, normalize
+
+RATE = 16000
+
+
+def _tone(freq, seconds=0.6):
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (np.sin(2 * np.pi * freq * t) * 8000).astype(np.int16)
+
+
+def _write_wav(path, samples):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes(samples.tobytes())
+
+
+def test_ring_buffer_wraps_and_forgets_old_samples():
+    ring = RingBuffer(8)
+    ring.write(np.arange(6, dtype=np.int16))
+    ring.write(np.arange(6, 12, dtype=np.int16))
+
+    assert list(ring.read(6, 12)) == [6, 7, 8, 9, 10, 11]
+    assert ring.read(2, 5) is None
+
+
+def test_ring_buffer_keeps_absolute_indices_after_an_oversized_block():
+    ring = RingBuffer(8)
+    ring.write(np.arange(3, dtype=np.int16))
+    ring.write(np.arange(3, 15, dtype=np.int16))
+    ring.write(np.arange(15, 20, dtype=np.int16))
+
+    assert ring.written == 20
+    assert list(ring.read(12, 20)) == list(range(12, 20))
+    assert ring.read(11, 14) is None
+
+
+def test_segmenter_cuts_on_silence():
+    segmenter = UtteranceSegmenter(RATE, pre_roll_ms=0)
+    silence = np.zeros(RATE // 2, dtype=np.int16)
+    stream = np.concatenate([silence, _tone(440), silence, _tone(880), silence])
+
+    cuts = [cut for block in np.array_split(stream, 37) for cut in segmenter.feed(block)] + segmenter.flush()
+
+    assert len(cuts) == 2
+    assert abs(cuts[0][0] - RATE // 2) <= segmenter.frame
+
+
+def test_gm_phrases_change_game_state(tmp_path):
+    fixtures = tmp_path / "fixtures"
+    fixtures.mkdir()
+    _write_wav(fixtures / "voyante.wav", _tone(440))
+    (fixtures / "voyante.txt").write_text("La voyante se réveille", "utf-8")
+    _write_wav(fixtures / "les_loups_garous_se_reveillent.wav", _tone(660))
+    silence = np.zeros(RATE // 2, dtype=np.int16)
+    _write_wav(tmp_path / "gm.wav", np.concatenate([silence, _tone(440), silence, _tone(660), silence]))
+    game = Game(6, provider=RandomDecisionProvider(seed=1))
+    listener = GameStateListener(game)
+
+    pipeline = VoicePipeline(
+        WavFileSource(tmp_path / "gm.wav", RATE), FakeBackend.from_directory(fixtures, RATE), listener, RATE
+    )
+    pipeline.run()
+    pipeline.stop()
+
+    assert [state for state, _ in listener.changes] == [State.VOYANTE, State.LOUP_GAROU]
+    assert game.period == State.LOUP_GAROU
+    assert listener.late == 0
+
+
+def test_pool_drops_oldest_and_stale_utterances():
+    texts = []
+    pool = TranscriptionPool(
+        FakeBackend({"x": _tone(440)}, delay=0.05), lambda t: texts.append(t), RATE, workers=1, max_pending=2, max_age=0.08
+    )
+    for seq in range(6):
+        pool.submit(Utterance(seq, 0, 0, _tone(440)))
+    pool.submit(Utterance(6, 0, 0, _tone(440), captured_at=time.monotonic() - 1))
+    pool.join()
+    pool.close()
+
+    assert pool.stats.dropped >= 3
+    assert pool.stats.stale >= 1
+    assert pool.stats.transcribed + pool.stats.dropped + pool.stats.stale == pool.stats.submitted
+    assert pool.stats.failed == 0
+    assert all(t.text == "x" for t in texts)
+
+
+class FlakyBackend:
+    """Fails on quiet utterances."""
+
+    def transcribe(self, samples, sample_rate):
+        if samples.max() < 5000:
+            raise RuntimeError("model crashed")
+        return "x"
+
+
+def test_pool_survives_failing_transcriptions():
+    texts = []
+    pool = TranscriptionPool(FlakyBackend(), lambda t: texts.append(t), RATE, workers=2, max_pending=10, max_age=60)
+    for seq in range(8):
+        pool.submit(Utterance(seq, 0, 0, _tone(440) // (1 + seq % 2)))
+    pool.join()
+    # More failures than workers: the queue is still drained
+    for seq in range(8, 10):
+        pool.submit(Utterance(seq, 0, 0, _tone(440) // (1 + seq % 2)))
+    pool.join()
+    pool.close()
+
+    assert (pool.stats.transcribed, pool.stats.failed) == (5, 5)
+    assert len(texts) == 5 and isinstance(pool.stats.last_error, RuntimeError)
+
+
+def test_normalize_folds_accents():
+    assert normalize("La Sorcière se RÉVEILLE !") == "la sorciere se reveille"
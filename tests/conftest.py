@@ -1,8 +1,29 @@
 import sys
 from pathlib import Path
+from random import Random
+
+import pytest
 
 # Ensure the repository root is on sys.path so `src` package can be imported
 ROOT = Path(__file__).resolve().parents[1]
 ROOT_STR = str(ROOT)
 if ROOT_STR not in sys.path:
     sys.path.insert(0, ROOT_STR)
+
+from src.backend.core.decisions import SimulationProvider  # noqa: E402
+from src.backend.core.game import Game  # noqa: E402
+
+
+@pytest.fixture
+def new_game():
+    """Factory of headless games: `new_game(lineup, seed)` deals with `Random(seed)`.
+
+    Decisions come from a `SimulationProvider` drawing from the same generator
+    unless a `provider` is given.
+    """
+
+    def make(lineup, seed=0, provider=None):
+        rng = Random(seed)
+        return Game.headless(lineup, provider if provider is not None else SimulationProvider(rng=rng), rng)
+
+    return make
@@ -0,0 +1,48 @@
+from src.backend.core.balance import (
+    BalanceResult,
+    evaluate_distributions,
+    lineup_table_hash,
+    load_balance,
+    save_balance,
+    simulate_lineup,
+)
+from src.backend.core.role_distributor import Role
+
+TABLE = {
+    4: [{Role.VILLAGEOIS: 3, Role.LOUP_GAROU: 1}],
+    5: [{Role.VILLAGEOIS: 2, Role.LOUP_GAROU: 1, Role.VOYANTE: 1, Role.SORCIERE: 1}],
+}
+
+
+def test_simulate_lineup_is_seeded():
+    lineup = TABLE[5][0]
+    first = simulate_lineup(lineup, 50, seed=3)
+
+    assert first == simulate_lineup(lineup, 50, seed=3)
+    assert sum(first.values()) == 50
+
+
+def test_wilson_interval_contains_rate():
+    result = BalanceResult(games=100, wins={"villageois": 40, "loup_garou": 60})
+    low, high = result.confidence_interval("villageois")
+
+    assert low < result.win_rate("villageois") == 0.4 < high
+    assert "👥 40%" in result.summary()
+
+
+def test_table_hash_ignores_role_order():
+    swapped = {4: [{Role.LOUP_GAROU: 1, Role.VILLAGEOIS: 3}], 5: TABLE[5]}
+
+    assert lineup_table_hash(TABLE) == lineup_table_hash(swapped)
+    assert lineup_table_hash(TABLE) != lineup_table_hash({4: TABLE[4]})
+
+
+def test_evaluate_and_cache_roundtrip(tmp_path):
+    results = evaluate_distributions(TABLE, games=30, workers=1)
+    assert [r.games for r in results[4]] == [30]
+
+    assert load_balance(TABLE, cache_dir=tmp_path) is None
+    save_balance(results, TABLE, cache_dir=tmp_path)
+    loaded = load_balance(TABLE, cache_dir=tmp_path)
+
+    assert loaded[5][0].wins == results[5][0].wins
@@ -0,0 +1,73 @@
+from random import Random
+
+import numpy as np
+import pytest
+
+from src.backend.core.balance import simulate_lineup
+from src.backend.core.batch import (
+    CAMP_CODES,
+    NO_PLAYER,
+    NOBODY,
+    RUNNING,
+    BatchGames,
+    BatchSimulator,
+    simulate_lineup_batch,
+)
+from src.backend.core.decisions import DecisionProvider
+from src.backend.core.game import Game
+from src.backend.core.role_distributor import ROLE_DISTRIBUTIONS, Role
+
+LINEUP = ROLE_DISTRIBUTIONS[12][0]  # Cupidon, Sorciere, Chasseur, Voyante and 3 wolves
+SIZE = sum(LINEUP.values())
+
+
+def _random_object_game(rng: Random) -> Game:
+    game = Game.headless(LINEUP, DecisionProvider(), rng)
+    first, second = rng.sample(game.players, 2)
+    first.lover, second.lover = second, first
+    return game
+
+
+def test_kills_and_is_over_match_object_engine():
+    rng = Random(7)
+    games = [_random_object_game(rng) for _ in range(200)]
+    state = BatchGames.from_games(games)
+
+    for _ in range(6):
+        victims = np.array([rng.randrange(SIZE) for _ in games], dtype=np.int16)
+        for game, victim in zip(games, victims):
+            game.players[victim].kill()
+        state.kill(victims)
+
+        assert (state.alive == [[p.alive for p in g.players] for g in games]).all()
+
+        active = state.winner == RUNNING
+        over = state.check_over(active)
+        for b, game in enumerate(games):
+            if not active[b]:
+                continue
+            assert over[b] == game.is_over()
+            if over[b]:
+                expected = CAMP_CODES[game.winner] if game.winner else NOBODY
+                assert state.winner[b] == expected
+
+
+def test_win_rates_match_object_engine():
+    objects = simulate_lineup(LINEUP, 1500, seed=1)
+    batch = simulate_lineup_batch(LINEUP, 20000, seed=1)
+
+    for outcome in ("villageois", "loup_garou", "amoureux"):
+        assert abs(objects[outcome] / 1500 - batch[outcome] / 20000) < 0.05
+
+
+def test_batch_games_all_finish_with_lovers_bound():
+    state = BatchGames.from_lineup(LINEUP, 1000, np.random.default_rng(0))
+    BatchSimulator(state, np.random.default_rng(0)).run()
+
+    assert (state.winner != RUNNING).all()
+    assert ((state.lovers != NO_PLAYER).sum(axis=1) == 2).all()
+
+
+def test_voleur_is_rejected():
+    with pytest.raises(ValueError):
+        BatchGames.from_lineup({Role.VOLEUR: 1, Role.LOUP_GAROU: 1}, 10, np.random.default_rng(0))
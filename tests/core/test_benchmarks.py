@@ -0,0 +1,25 @@
+from random import Random
+
+from src.backend.core.benchmarks import BENCHMARKS, BenchResult, compare, load_results, run_suite, save_results
+
+
+def test_every_benchmark_runs():
+    for build in BENCHMARKS.values():
+        build(Random(0))()
+
+
+def test_results_roundtrip_and_regressions(tmp_path):
+    results = run_suite(["is_over", "kill_lovers"], repeat=1, min_time=0.001)
+    assert all(r.seconds > 0 and r.number >= 1 for r in results.values())
+
+    path = save_results(results, tmp_path / "bench.json")
+    assert load_results(path) == results
+    assert load_results(tmp_path / "missing.json") is None
+
+    baseline = {
+        "is_over": BenchResult("is_over", results["is_over"].seconds / 2, 1),
+        "kill_lovers": BenchResult("kill_lovers", results["kill_lovers"].seconds, 1),
+    }
+    comparisons = {c.name: c for c in compare(results, baseline, threshold=0.2)}
+    assert comparisons["is_over"].regressed and comparisons["is_over"].ratio == 2
+    assert not comparisons["kill_lovers"].regressed
@@ -0,0 +1,53 @@
+from src.backend.api.functions import play_game
+from src.backend.core.decisions import (
+    Decision,
+    RandomDecisionProvider,
+    ScriptedDecisionProvider,
+)
+from src.backend.core.game import Game, GameStatus, Player
+from src.backend.core.role_distributor import Role, ROLE_DISTRIBUTIONS
+
+
+def test_scripted_game_runs_without_prompts():
+    provider = ScriptedDecisionProvider(["Bob", "Carl", "Ann"])
+    game = Game(0, provider=provider)
+    game.players = [
+        Player(name="Ann", role=Role.LOUP_GAROU),
+        Player(name="Bob", role=Role.VILLAGEOIS),
+        Player(name="Carl", role=Role.VILLAGEOIS),
+        Player(name="Dan", role=Role.VILLAGEOIS),
+    ]
+
+    play_game(game)
+
+    assert game.status == GameStatus.FINISHED
+    assert [p.name for p in game.players if not p.alive] == ["Ann", "Bob"]
+    assert game.get_player_by_name("Carl").is_mayor
+    assert provider.answers == []
+
+
+def test_select_player_passes_filtered_candidates_and_decision():
+    seen = {}
+
+    class RecordingProvider(RandomDecisionProvider):
+        def select_player(self, game, candidates, author=None, decision=None, can_select_none=False):
+            seen["names"] = [p.name for p in candidates]
+            seen["decision"] = decision
+            return candidates[0]
+
+    game = Game(0, provider=RecordingProvider())
+    game.players = [Player(name="A"), Player(name="B", alive=False), Player(name="C")]
+
+    chosen = game.select_player(author=game.players[0], decision=Decision.WOLF_KILL)
+
+    assert chosen is game.players[2]
+    assert seen == {"names": ["C"], "decision": Decision.WOLF_KILL}
+
+
+def test_random_games_always_finish():
+    for num_players in ROLE_DISTRIBUTIONS:
+        for seed in range(20):
+            game = Game(num_players, provider=RandomDecisionProvider(seed))
+            assert len(game.players) == num_players
+            play_game(game)
+            assert game.status == GameStatus.FINISHED
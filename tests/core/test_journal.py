@@ -0,0 +1,58 @@
+from src.backend.api.functions import play_game
+from src.backend.core.decisions import ScriptedDecisionProvider
+from src.backend.core.game import ActionType, Game, Player, State
+from src.backend.core.journal import (
+    NO_PLAYER,
+    RECORD,
+    ActionJournal,
+    JournalReader,
+    JournalSink,
+    read_journal,
+)
+from src.backend.core.role_distributor import Role
+
+
+def test_journal_roundtrip_is_fixed_width():
+    journal = ActionJournal()
+    journal.append(1, State.LOUP_GAROU, ActionType.KILL, NO_PLAYER, 3)
+    journal.append(2, State.SORCIERE, ActionType.POISON, 5, 0)
+
+    assert len(journal.raw()) == 2 * RECORD.size
+    assert journal[-1] == (2, State.SORCIERE, ActionType.POISON, 5, 0)
+    assert read_journal(journal.to_bytes("abcd1234")) == list(journal)
+
+
+def test_sink_streams_and_reader_maps_file(tmp_path):
+    path = tmp_path / "game.wwj"
+    journal = ActionJournal()
+    journal.append(1, State.CUPIDON, ActionType.CHOOSE_LOVERS, 0, 1)
+    with JournalSink(path, uid="abcd1234", fsync_every=2) as sink:
+        journal.stream_to(sink)
+        journal.append(1, State.DAY_VOTE, ActionType.VOTE, NO_PLAYER, 2)
+    with open(path, "ab") as f:
+        f.write(b"\x01\x00\x05")  # torn record from a crash
+
+    with JournalReader(path) as reader:
+        assert reader.uid == "abcd1234"
+        assert list(reader) == list(journal)
+        assert reader[1].target == 2
+
+
+def test_game_records_actions_with_player_ids():
+    provider = ScriptedDecisionProvider(["Bob", "Carl", "Ann"])
+    game = Game(0, provider=provider)
+    game.players = [
+        Player(name="Ann", role=Role.LOUP_GAROU),
+        Player(name="Bob", role=Role.VILLAGEOIS),
+        Player(name="Carl", role=Role.VILLAGEOIS),
+        Player(name="Dan", role=Role.VILLAGEOIS),
+    ]
+
+    play_game(game)
+
+    assert [(r.period, r.action, r.target) for r in game.journal] == [
+        (State.LOUP_GAROU, ActionType.KILL, 1),
+        (State.MAYOR_ELECTION, ActionType.MAYOR, 2),
+        (State.DAY_VOTE, ActionType.VOTE, 0),
+    ]
+    assert game.game_log[0].actions[0].target is game.players[1]
@@ -0,0 +1,57 @@
+import pytest
+
+from src.backend.core import lineup_catalog
+from src.backend.core.decisions import RandomDecisionProvider
+from src.backend.core.game import Game
+from src.backend.core.lineup_catalog import LineupCatalog, LineupConstraints, generate_lineups, lineups_for
+from src.backend.core.lineup_inference import LineupInference
+from src.backend.core.phases import play_game
+from src.backend.core.role_distributor import ROLE_DISTRIBUTIONS, Role
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    catalog = LineupCatalog(path=tmp_path / "lineups.json")
+    monkeypatch.setattr(lineup_catalog, "default_catalog", lambda: catalog)
+    return catalog
+
+
+@pytest.mark.parametrize("num_players", [13, 15, 22, 30])
+def test_generated_lineups_follow_the_constraints(num_players):
+    constraints = LineupConstraints(max_specials=3, required=frozenset({Role.VOYANTE, Role.PETITE_FILLE}), variants=4)
+    lineups = generate_lineups(num_players, constraints)
+    assert len(lineups) == 4
+    assert len({tuple(sorted((r.value, c) for r, c in lineup.items())) for lineup in lineups}) == 4
+    for lineup in lineups:
+        specials = [role for role in lineup if role not in (Role.VILLAGEOIS, Role.LOUP_GAROU)]
+        assert sum(lineup.values()) == num_players
+        assert 0.2 <= lineup[Role.LOUP_GAROU] / num_players <= 0.34
+        assert {Role.VOYANTE, Role.PETITE_FILLE} <= set(specials) and len(specials) <= 3
+        assert Role.VOLEUR not in lineup and lineup[Role.VILLAGEOIS] >= 1
+    # Memoized
+    assert generate_lineups(num_players, constraints) is lineups
+
+
+def test_impossible_constraints():
+    assert generate_lineups(2) == ()
+    with pytest.raises(ValueError):
+        generate_lineups(10, LineupConstraints(required=frozenset({Role.VOLEUR})))
+
+
+def test_catalog_is_stored_on_disk(catalog):
+    assert lineups_for(12) is ROLE_DISTRIBUTIONS[12]
+    lineups = lineups_for(18)
+    assert catalog.path.exists()
+    assert LineupCatalog(path=catalog.path).get(18) == lineups
+    with pytest.raises(KeyError):
+        lineups_for(2)
+
+
+def test_large_table_plays_a_game(catalog):
+    game = Game(20, provider=RandomDecisionProvider(0))
+    assert len(game.players) == 20 and game.lineup in lineups_for(20)
+    play_game(game)
+    assert game.winner is not None
+
+    inference = LineupInference(20)
+    assert inference.candidates == lineups_for(20)
@@ -0,0 +1,49 @@
+from src.backend.core.lineup_inference import LineupIndex, LineupInference
+from src.backend.core.role_distributor import ROLE_DISTRIBUTIONS, Role
+
+
+def test_wake_and_reveal_narrow_candidates():
+    inference = LineupInference(12)
+    assert len(inference.candidates) == 3
+
+    assert inference.observe_wake(Role.CHASSEUR)
+    assert len(inference.candidates) == 2
+    assert inference.observe_call(Role.VOYANTE, first_night=True)
+    # Cupidon was not called before the Voyante on the first night
+    assert inference.candidates == [ROLE_DISTRIBUTIONS[12][1]]
+    assert Role.CHASSEUR in inference.certain_roles()
+
+
+def test_contradictions_are_ignored():
+    inference = LineupInference(6)
+    for _ in range(2):
+        assert inference.observe_reveal(Role.LOUP_GAROU)
+
+    assert not inference.observe_reveal(Role.LOUP_GAROU)
+    assert not inference.observe_wake(Role.CUPIDON)
+    assert len(inference.candidates) == 2
+    assert inference.observe_reveal(Role.SORCIERE)
+    assert inference.candidates == [ROLE_DISTRIBUTIONS[6][0]]
+
+
+def test_night_roles_left_to_call():
+    inference = LineupInference(10)
+
+    assert inference.night_roles(first_night=True) == (Role.CUPIDON, Role.VOYANTE, Role.LOUP_GAROU, Role.SORCIERE)
+    assert inference.night_roles(first_night=False, after=Role.VOYANTE) == (Role.LOUP_GAROU, Role.SORCIERE)
+    inference.observe_absent(Role.SORCIERE)
+    assert inference.night_roles(first_night=False, after=Role.VOYANTE) == (Role.LOUP_GAROU,)
+
+
+def test_arbitrary_lineups_grouped_by_size():
+    index = LineupIndex.from_lineups([
+        {Role.VILLAGEOIS: 10, Role.LOUP_GAROU: 4, Role.VOLEUR: 1},
+        {Role.VILLAGEOIS: 9, Role.LOUP_GAROU: 5, Role.PETITE_FILLE: 1},
+    ])
+    inference = LineupInference(15, index)
+
+    assert inference.possible_roles() == {Role.VILLAGEOIS, Role.LOUP_GAROU, Role.VOLEUR, Role.PETITE_FILLE}
+    inference.observe_reveal(Role.VILLAGEOIS)
+    for _ in range(5):
+        inference.observe_reveal(Role.LOUP_GAROU)
+    assert Role.VOLEUR not in inference.possible_roles()
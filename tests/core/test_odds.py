@@ -0,0 +1,113 @@
+from random import Random
+
+import pytest
+
+from src.backend.core.balance import OUTCOMES
+from src.backend.core.decisions import RandomDecisionProvider, SimulationProvider
+from src.backend.core.game import Game, State
+from src.backend.core.odds import TranspositionTable, WinEstimator, position_of
+from src.backend.core.phases import first_night_process, play_game, process_day, process_night
+from src.backend.core.role_distributor import Role
+
+LINEUP = {Role.LOUP_GAROU: 2, Role.VOYANTE: 1, Role.SORCIERE: 1, Role.CHASSEUR: 1, Role.CUPIDON: 1, Role.VILLAGEOIS: 3}
+
+
+def test_exact_odds_of_a_small_endgame(new_game):
+    game = new_game({Role.LOUP_GAROU: 1, Role.VILLAGEOIS: 2})
+    # Day: the vote kills the wolf 1 time in 3, otherwise the wolf eats the last villager
+    game.period = State.LOUP_GAROU
+    odds = WinEstimator().estimate(game)
+    assert odds.exact and odds.samples == 0
+    assert odds.probabilities["villageois"] == pytest.approx(1 / 3)
+    assert odds.probabilities["loup_garou"] == pytest.approx(2 / 3)
+
+    # Night: the wolf eats a villager, then the vote kills one of the two left
+    game.period = State.DAY_VOTE
+    odds = WinEstimator().estimate(game)
+    assert odds.probabilities["villageois"] == pytest.approx(1 / 2)
+
+    with pytest.raises(ValueError):
+        WinEstimator().estimate(new_game(LINEUP))
+
+
+def test_exact_odds_match_simulated_games(new_game):
+    game = new_game(LINEUP, seed=1)
+    first_night_process(game)
+    estimator = WinEstimator(budget=10)
+    odds = estimator.estimate(game)
+    assert odds.exact and sum(odds.probabilities.values()) == pytest.approx(1)
+    assert len(estimator.table) > 0
+
+    wins = dict.fromkeys(OUTCOMES, 0)
+    games = 2000
+    for seed in range(games):
+        fork = game.fork(SimulationProvider(rng=Random(seed)))
+        while not fork.is_over():
+            process_day(fork)
+            if fork.is_over():
+                break
+            process_night(fork)
+        wins[fork.winner.value if fork.winner else "nobody"] += 1
+    for outcome in OUTCOMES:
+        assert wins[outcome] / games == pytest.approx(odds.probabilities[outcome], abs=0.04)
+
+
+def test_large_table_is_sampled_within_budget_then_solved_from_the_table(new_game):
+    lineup = {Role.LOUP_GAROU: 11, Role.VOYANTE: 1, Role.SORCIERE: 1, Role.CHASSEUR: 1, Role.CUPIDON: 1, Role.VILLAGEOIS: 33}
+    game = new_game(lineup)
+    first_night_process(game)
+    estimator = WinEstimator(budget=0.02, table=TranspositionTable(capacity=1 << 16), seed=0)
+    odds = estimator.estimate(game)
+    assert odds.seconds < 0.1
+    assert not odds.exact and odds.samples > 0
+    assert sum(odds.probabilities.values()) == pytest.approx(1)
+    # Each call solves more positions: the estimate becomes exact once the start is solved
+    for _ in range(100):
+        odds = estimator.estimate(game)
+        if odds.exact:
+            break
+    assert odds.exact and len(estimator.table) <= 1 << 16
+
+
+def test_exhausted_budget_still_samples_playouts(new_game):
+    lineup = {Role.LOUP_GAROU: 4, Role.VOYANTE: 1, Role.SORCIERE: 1, Role.CHASSEUR: 1, Role.CUPIDON: 1, Role.VILLAGEOIS: 8}
+    game = new_game(lineup)
+    first_night_process(game)
+    for budget in (0.0, 1e-4, 5e-4):
+        # Small enough for the exact search, too large to be solved in the budget
+        odds = WinEstimator(budget=budget, seed=0).estimate(game)
+        assert not odds.exact and odds.samples > 0
+        assert sum(odds.probabilities.values()) == pytest.approx(1)
+        assert f"~{odds.samples} playouts" in odds.summary()
+
+
+def test_finished_game_and_canonical_positions(new_game):
+    game = new_game(LINEUP, seed=2)
+    first_night_process(game)
+    # Renaming or reordering players does not change the position
+    position = position_of(game)
+    game.players[0].name, game.players[1].name = game.players[1].name, game.players[0].name
+    assert position_of(game) == position
+    for player in game.players:
+        if player.role != Role.LOUP_GAROU:
+            player.alive = False
+    assert WinEstimator().estimate(game).probabilities["loup_garou"] == 1.0
+
+
+class _VerboseProvider(RandomDecisionProvider):
+    verbose = True
+
+    def __init__(self, seed):
+        super().__init__(seed)
+        self.messages = []
+
+    def notify(self, message="", **style):
+        self.messages.append(message)
+
+
+def test_interactive_game_shows_odds_after_each_phase():
+    provider = _VerboseProvider(0)
+    game = Game(8, provider=provider)
+    play_game(game)
+    odds = [m for m in provider.messages if "Win odds" in m]
+    assert odds and len(odds) <= 2 * game.round_number
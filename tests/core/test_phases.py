@@ -0,0 +1,88 @@
+from src.backend.core.decisions import RandomDecisionProvider, ScriptedDecisionProvider
+from src.backend.core.game import Game, GameStatus, Player, State
+from src.backend.core.phases import first_night_process, play_game, run_steps
+from src.backend.core.role_distributor import Role
+from src.backend.core.roles import Chasseur, Cupidon, Voleur, Voyante
+
+
+def test_schedule_follows_the_roles_present(new_game):
+    lineup = {Role.LOUP_GAROU: 2, Role.VOLEUR: 1, Role.VOYANTE: 1, Role.CUPIDON: 1, Role.VILLAGEOIS: 2}
+    game = new_game(lineup, provider=RandomDecisionProvider(0))
+    schedule = game.schedule
+
+    assert [step.period for step in schedule.first_night] == [
+        State.CUPIDON, State.VOLEUR, State.VOYANTE, State.LOUP_GAROU
+    ]
+    assert [step.period for step in schedule.night] == [State.VOYANTE, State.LOUP_GAROU]
+    assert all(step.role is not Role.CHASSEUR for step in schedule.day)
+    # Compiled once per game
+    assert game.schedule is schedule
+
+
+def test_stolen_roles_come_with_their_class():
+    game = Game(0, provider=ScriptedDecisionProvider(["Val", "Vic", "Vic"]))
+    game.players = [
+        Player(name="Cy", role=Role.CUPIDON),
+        Player(name="Val", role=Role.VOLEUR),
+        Player(name="Vic", role=Role.VOYANTE),
+        Player(name="Ann", role=Role.LOUP_GAROU),
+    ]
+    # Hand-seated roles get their class too
+    for player in list(game.players):
+        game.reseat(player)
+    cupidon = game.get_role_instance(Cupidon)
+
+    run_steps(game, game.schedule.first_night[:2])
+
+    thief, seer = game.get_player_by_name("Val"), game.get_player_by_name("Vic")
+    assert (type(thief), thief.role, thief.player_id) == (Voyante, Role.VOYANTE, 1)
+    assert (type(seer), seer.role, seer.role_stolen) == (Voleur, Role.VOLEUR, True)
+    assert game.get_role_instance(Voyante) is thief
+    # References to the replaced players follow them
+    assert cupidon.lovers_chosen == (thief, seer)
+    assert thief.lover is seer and seer.lover is thief
+
+
+def test_stolen_chasseur_takes_revenge():
+    game = Game(0, provider=ScriptedDecisionProvider(["Cid", "Val", "Ann"]))
+    game.players = [
+        Player(name="Val", role=Role.VOLEUR),
+        Player(name="Cid", role=Role.CHASSEUR),
+        Player(name="Ann", role=Role.LOUP_GAROU),
+        Player(name="Bob", role=Role.VILLAGEOIS),
+    ]
+    for player in list(game.players):
+        game.reseat(player)
+    # Val steals the Chasseur card, then the wolf kills Val
+    first_night_process(game)
+    revenge = [step for step in game.schedule.day if step.role is Role.CHASSEUR]
+    run_steps(game, revenge)
+
+    hunter = game.get_role_instance(Chasseur)
+    assert hunter.name == "Val" and not hunter.alive
+    assert hunter.revenge_target is game.get_player_by_name("Ann")
+    assert not hunter.revenge_target.alive
+
+
+def test_headless_games_follow_the_schedule():
+    for seed in range(10):
+        game = Game(8, provider=RandomDecisionProvider(seed))
+        play_game(game)
+        assert game.status == GameStatus.FINISHED
+        assert game.period is State.COMPLETED
+
+
+def test_games_restored_between_phases_resume_with_the_next_phase(new_game):
+    lineup = {Role.LOUP_GAROU: 2, Role.VOYANTE: 1, Role.SORCIERE: 1, Role.CHASSEUR: 1, Role.CUPIDON: 1, Role.VILLAGEOIS: 4}
+    for seed in range(10):
+        provider = RandomDecisionProvider(seed)
+        game = new_game(lineup, seed, provider)
+        checkpoints = []
+        play_game(game, after_phase=lambda game: checkpoints.append((game.snapshot(), provider.rng.getstate())))
+        for snapshot, state in checkpoints:
+            resumed = RandomDecisionProvider(0)
+            resumed.rng.setstate(state)
+            copy = Game.restore(snapshot, resumed)
+            play_game(copy)
+            assert copy.journal.raw() == game.journal.raw()
+            assert (copy.winner, copy.round_number) == (game.winner, game.round_number)
@@ -0,0 +1,90 @@
+from src.backend.core.game import Camp, Player, Game, State
+from src.backend.core.players import PlayerTable
+from src.backend.core.role_distributor import Role
+from src.backend.core.roles import Sorciere, Voleur, Voyante
+
+
+def test_ids_are_stable_when_a_seat_is_replaced():
+    table = PlayerTable([Player(name="A"), Player(name="B")])
+    witch = Sorciere(name="B", role=Role.SORCIERE)
+
+    table[1] = witch
+
+    assert [p.player_id for p in table] == [0, 1]
+    assert table.get(1) is witch
+    assert table.by_name("B") is witch
+    assert table.first_with_role(Role.SORCIERE) is witch
+    assert table.types() == {Player, Sorciere}
+
+
+def test_views_are_invalidated_by_kill_heal_and_reveal():
+    game = Game(0)
+    game.players = [Player(name="A"), Player(name="B"), Player(name="C")]
+    alive = game.players.view(alive=True)
+
+    assert game.players.view(alive=True) is alive
+    game.players[0].kill()
+    assert [p.name for p in game.players.view(alive=True)] == ["B", "C"]
+
+    Sorciere(name="W").heal(game.players[0])
+    assert len(game.players.view(alive=True)) == 3
+
+    game.players[2].is_revealed = True
+    assert game.players.view(is_revealed=True) == (game.players[2],)
+
+
+def test_role_index_follows_voleur_steal_role():
+    thief = Voleur(name="Thief", role=Role.VOLEUR)
+    seer = Voyante(name="Seer", role=Role.VOYANTE)
+    game = Game(0)
+    game.players = [thief, seer]
+
+    thief.steal_role(seer)
+
+    assert game.get_role_instance(Voyante) is thief
+    assert game.get_role_instance(Voleur) is seer
+    assert game.players.with_role(Role.VOYANTE) == (thief,)
+
+
+def test_by_name_returns_first_seat_after_rename():
+    table = PlayerTable([Player(name="A"), Player(name="B")])
+
+    table[1].name = "A"
+    assert table.by_name("A") is table[0]
+
+    table[0].name = "Z"
+    assert table.by_name("A") is table[1]
+    assert table.by_name("Z") is table[0]
+
+
+def test_camp_counters_follow_kills_heals_lovers_and_role_swaps():
+    wolf = Player(name="Wolf", role=Role.LOUP_GAROU)
+    villager = Player(name="Vil", role=Role.VILLAGEOIS)
+    thief = Voleur(name="Thief", role=Role.VOLEUR)
+    table = PlayerTable([wolf, villager, thief])
+    assert table.alive_by_camp() == table.recount_camps()
+
+    wolf.lover, villager.lover = villager, wolf  # mixed couple -> Amoureux camp
+    assert table.recount_camps() == {Camp.AMOUREUX: 2, Camp.VILLAGEOIS: 1}
+    table.check_camp_counters()
+
+    thief.steal_role(wolf)  # the wolf becomes "voleur", breaking the mixed couple
+    table.check_camp_counters()
+
+    villager.kill()
+    table.check_camp_counters()
+    Sorciere(name="W").heal(villager)
+    table.check_camp_counters()
+    assert sum(table.alive_by_camp().values()) == 2
+
+
+def test_is_over_reads_counters_in_debug_mode():
+    game = Game(0, debug=True)
+    game.players = [Player(name="A", role=Role.LOUP_GAROU), Player(name="B", role=Role.VILLAGEOIS)]
+
+    assert game.is_over() is False
+    game.players[1].kill()
+    assert game.is_over() is True
+    assert game.winner == Camp.LOUP_GAROU
+    # A predicate: the runner, not is_over, ends the current period
+    assert game.period is State.START_UP
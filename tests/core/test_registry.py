@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+from src.backend.core.benchmarks import PROJECT_ROOT, import_time
+from src.backend.core.game import Player
+from src.backend.core.registry import ROLE_CLASSES, ROLE_ORDER, role_class
+from src.backend.core.role_distributor import Role
+from src.backend.core.roles import Cupidon, Sorciere
+from src.backend.core.roles_order import ROLES_ORDER
+
+
+def test_role_classes_resolve_lazily():
+    assert role_class(Role.SORCIERE) is Sorciere
+    assert role_class(Role.LOUP_GAROU) is Player and role_class(None) is Player
+    assert set(ROLE_ORDER) == set(ROLE_CLASSES)
+    assert ROLES_ORDER[0] is Cupidon and len(ROLES_ORDER) == len(ROLE_ORDER)
+
+
+def test_headless_worker_imports_no_ui_nor_role_classes_until_needed():
+    code = (
+        "import sys\n"
+        "from src.backend.core.decisions import RandomDecisionProvider\n"
+        "from src.backend.core.game import Game\n"
+        "from src.backend.core.phases import play_game\n"
+        "print([m for m in ('src.backend.core.roles', 'src.backend.core.lineup_catalog') if m in sys.modules])\n"
+        "play_game(Game(8, provider=RandomDecisionProvider(0)))\n"
+        "print(sorted(m for m in ('click', 'inquirer', 'numpy') if m in sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.split("\n")[:2] == ["[]", "[]"]
+
+
+def test_import_time_is_measured_in_a_fresh_interpreter():
+    assert 0 < import_time(runs=1) < 5
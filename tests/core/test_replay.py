@@ -0,0 +1,122 @@
+from click.testing import CliRunner
+
+from src.backend.api.replay import replay as replay_command
+from src.backend.core import replay as replay_module
+from src.backend.core.game import State
+from src.backend.core.journal import JournalReader, JournalSink
+from src.backend.core.phases import first_night_process, process_day, process_night
+from src.backend.core.replay import Replay
+from src.backend.core.role_distributor import Role
+
+LINEUP = {
+    Role.LOUP_GAROU: 3,
+    Role.VOYANTE: 1,
+    Role.SORCIERE: 1,
+    Role.CHASSEUR: 1,
+    Role.CUPIDON: 1,
+    Role.VOLEUR: 1,
+    Role.VILLAGEOIS: 6,
+}
+
+
+def _recorded_game(new_game, seed):
+    """A finished game, its start snapshot and (actions, round, period, position) after every phase."""
+    game = new_game(LINEUP, seed)
+    start = game.snapshot()
+    positions = []
+    first_night_process(game)
+    positions.append((len(game.journal), game.round_number, game.period, Replay._checkpoint(game)))
+    while not game.is_over():
+        process_day(game)
+        positions.append((len(game.journal), game.round_number, game.period, Replay._checkpoint(game)))
+        if game.is_over():
+            break
+        process_night(game)
+        game.round_number += 1
+        positions.append((len(game.journal), game.round_number, game.period, Replay._checkpoint(game)))
+    return game, start, positions
+
+
+def test_replayed_positions_match_the_game(new_game):
+    for seed in range(20):
+        game, start, positions = _recorded_game(new_game, seed)
+        replay = Replay(start, game.journal, every=4)
+        for index, round_number, period, expected in positions[:-1]:
+            position = replay.seek(index)
+            # Steps and round ends that recorded no action do not move the replay's clock
+            position.round_number, position.period = round_number, period
+            assert Replay._checkpoint(position) == expected
+        end = replay.seek(len(replay))
+        assert end.winner == game.winner
+        assert [(p.role, p.alive, p.is_mayor) for p in end.players] == [(p.role, p.alive, p.is_mayor) for p in game.players]
+
+
+def test_seek_applies_only_the_actions_after_a_checkpoint(monkeypatch, new_game):
+    game, start, _ = _recorded_game(new_game, 1)
+    replay = Replay(start, game.journal, every=4)
+    replay.build_checkpoints()
+    assert [index for index, _ in replay.checkpoints] == list(range(0, len(replay) + 1, 4))
+
+    applied = []
+    original = replay_module.apply_action
+    monkeypatch.setattr(replay_module, "apply_action", lambda g, r: applied.append(r) or original(g, r))
+    for index in range(len(replay) + 1):
+        applied.clear()
+        replay.seek(index)
+        assert len(applied) == index % 4
+
+
+def test_find_round_and_period(new_game):
+    game, start, _ = _recorded_game(new_game, 2)
+    replay = Replay(start, game.journal)
+    index = replay.find(2, State.LOUP_GAROU)
+    assert (replay.record(index - 1).round_number, replay.record(index - 1).period) == (2, State.LOUP_GAROU)
+    end = replay.find(2)
+    assert replay.record(end - 1).round_number == 2
+    assert end == len(replay) or replay.record(end).round_number == 3
+    assert replay.seek_to(2, State.LOUP_GAROU).period == State.LOUP_GAROU
+
+
+def test_find_tells_the_two_nights_of_round_one_apart(new_game):
+    for seed in range(5):
+        game, start, positions = _recorded_game(new_game, seed)
+        replay = Replay(start, game.journal)
+        (first_night, *_), (day, *_), (second_night, round_number, *_) = positions[:3]
+        assert round_number == 2
+
+        # Round 1 holds the first night, day 1 and the second night
+        index = replay.find(1, State.LOUP_GAROU)
+        assert index <= first_night and replay.record(index - 1).period == State.LOUP_GAROU
+        assert day < replay.find(1, State.LOUP_GAROU, phase=2) <= second_night
+        assert first_night < replay.find(1, State.DAY_VOTE) <= day
+
+
+def test_replay_file_and_archived_journal(tmp_path, new_game):
+    game, start, positions = _recorded_game(new_game, 3)
+    replay = Replay(start, game.journal, every=8)
+    replay.save(tmp_path / "game.wwr")
+    loaded = Replay.load(tmp_path / "game.wwr")
+    assert len(loaded.checkpoints) == len(replay) // 8 + 1
+    index, round_number, period, expected = positions[1]
+    position = loaded.seek(index)
+    position.round_number, position.period = round_number, period
+    assert Replay._checkpoint(position) == expected
+
+    with JournalSink(tmp_path / "game.wwj", game.uid) as sink:
+        game.journal.stream_to(sink)
+    with JournalReader(tmp_path / "game.wwj") as reader:
+        position = Replay(start, reader).seek(index)
+        position.round_number, position.period = round_number, period
+        assert Replay._checkpoint(position) == expected
+
+
+def test_cli_steps_before_and_next(tmp_path, new_game):
+    game, start, _ = _recorded_game(new_game, 4)
+    Replay(start, game.journal).save(tmp_path / "game.wwr")
+    result = CliRunner().invoke(
+        replay_command, [str(tmp_path / "game.wwr"), "--round", "1"], input="b\nn\nn\ng 1 loup_garou\ng 99\nq\n"
+    )
+    assert result.exit_code == 0, result.output
+    assert "Round 1, Loup Garou" in result.output
+    # Past the last round: the end of the game
+    assert f"({len(Replay.load(tmp_path / 'game.wwr'))}/" in result.output and "🏁 Winner" in result.output
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.backend.api.loadtest import http_json, run_load
+from src.backend.api.server import TableServer
+
+
+def test_table_actor_plays_through_awaitable_decisions():
+    async def scenario():
+        server = TableServer(max_tables=4)
+        table = await server.create_table(6, names=["A", "B", "C", "D", "E", "F"])
+        events = table.subscribe()
+        decisions = 0
+        while (pending := await table.next_decision()) is not None:
+            with pytest.raises(ValueError):
+                table.answer(pending.id, "Nobody")
+            table.answer(pending.id, pending.candidates[0].name)
+            decisions += 1
+        messages = []
+        while not events.empty():
+            event = events.get_nowait()
+            if event["type"] == "message":
+                messages.append(event["text"])
+        await server.close()
+        return table, decisions, messages
+
+    table, decisions, messages = asyncio.run(scenario())
+    assert table.status == "finished"
+    assert table.game.winner is not None
+    assert decisions > 0 and len(table.provider.answers) == decisions
+    # Replays publish each narration message once
+    assert messages.count("\n\n🌙 First night") == 1
+    assert sum("Night Phase" in m for m in messages) == table.game.round_number - 1
+
+
+def test_waiting_tables_hold_no_thread():
+    async def scenario():
+        server = TableServer(max_tables=100, engine_workers=2)
+        before = threading.active_count()
+        tables = [await server.create_table(8) for _ in range(50)]
+        pending = [await table.next_decision() for table in tables]
+        threads = threading.active_count() - before
+        await server.close()
+        return pending, threads
+
+    pending, threads = asyncio.run(scenario())
+    assert all(p is not None for p in pending)
+    assert threads <= 2
+
+
+def test_finished_tables_are_evicted_after_their_ttl():
+    async def scenario():
+        server = TableServer(finished_ttl=0.05)
+        table = await server.create_table(6)
+        while (pending := await table.next_decision()) is not None:
+            table.answer(pending.id, pending.candidates[0].name)
+        running = await server.create_table(6)
+        kept = server.evict_finished()
+        await asyncio.sleep(0.06)
+        evicted = server.evict_finished()
+        uids = set(server.tables)
+        await server.close()
+        return table.uid, running.uid, kept, evicted, uids
+
+    finished, running, kept, evicted, uids = asyncio.run(scenario())
+    assert (kept, evicted) == (0, 1)
+    assert uids == {running}
+
+
+def test_player_devices_only_see_their_own_role():
+    async def scenario():
+        server = TableServer()
+        table = await server.create_table(6, names=["A", "B", "C", "D", "E", "F"])
+        states = table.state("A"), table.state()
+        await server.close()
+        return states
+
+    player_view, master_view = asyncio.run(scenario())
+    roles = {p["name"]: p["role"] for p in player_view["players"]}
+    assert roles["A"] is not None
+    assert all(role is None for name, role in roles.items() if name != "A")
+    assert all(p["role"] is not None for p in master_view["players"])
+
+
+def test_http_api_rejects_bad_requests():
+    async def scenario():
+        server = TableServer()
+        await server.start("127.0.0.1", 0)
+        try:
+            bad_size = await http_json("127.0.0.1", server.port, "POST", "/tables", {"players": 99})
+            missing = await http_json("127.0.0.1", server.port, "GET", "/tables/nope")
+        finally:
+            await server.close()
+        return bad_size, missing
+
+    bad_size, missing = asyncio.run(scenario())
+    assert bad_size[0] == 400
+    assert missing[0] == 404
+
+
+def test_load_test_finishes_concurrent_games():
+    result = asyncio.run(run_load(tables=20, players=8, seed=1))
+
+    assert result.finished == 20
+    assert result.latencies
+    assert result.percentile(0.99) < 1.0
@@ -0,0 +1,64 @@
+import subprocess
+import sys
+
+import pytest
+
+from src.backend.api.functions import first_night_process, play_game, process_day
+from src.backend.core.benchmarks import PROJECT_ROOT
+from src.backend.core.decisions import RandomDecisionProvider
+from src.backend.core.game import Game
+from src.backend.core.roles import Cupidon, Sorciere, Voyante
+
+
+def _mid_game(seed=3):
+    game = Game(9, provider=RandomDecisionProvider(seed))
+    first_night_process(game)
+    process_day(game)
+    return game
+
+
+def test_restore_roundtrip_keeps_state_and_links():
+    game = _mid_game()
+    restored = Game.restore(game.snapshot(), provider=game.provider)
+
+    assert restored.snapshot() == game.snapshot()
+    assert [(p.name, type(p), p.role, p.alive) for p in restored.players] == [
+        (p.name, type(p), p.role, p.alive) for p in game.players
+    ]
+    for original, copy in zip(game.players, restored.players):
+        if original.lover is not None:
+            assert copy.lover is restored.players[original.lover.player_id]
+    cupidon = restored.get_role_instance(Cupidon)
+    assert all(lover in restored.players for lover in cupidon.lovers_chosen)
+    sorciere = game.get_role_instance(Sorciere)
+    assert restored.get_role_instance(Sorciere).potion_soin_utilisee == sorciere.potion_soin_utilisee
+    assert restored.get_role_instance(Voyante).investigations == game.get_role_instance(Voyante).investigations
+    assert list(restored.journal) == list(game.journal)
+    assert restored.players.alive_by_camp() == game.players.alive_by_camp()
+
+
+def test_fork_is_independent():
+    game = _mid_game()
+    before = game.snapshot()
+    fork = game.fork()
+    play_game(fork)
+
+    assert fork.winner is not None
+    assert game.snapshot() == before
+
+
+def test_restore_rejects_foreign_data():
+    with pytest.raises(ValueError):
+        Game.restore(b"\0" * 64)
+
+
+def test_restore_without_provider_is_silent_and_imports_no_ui():
+    code = (
+        "import sys\n"
+        "from src.backend.core.decisions import RandomDecisionProvider\n"
+        "from src.backend.core.game import Game\n"
+        "game = Game.restore(Game(8, provider=RandomDecisionProvider(0)).snapshot())\n"
+        "print(len(game.players), 'src.backend.api.prompts' in sys.modules)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout == "8 False\n"
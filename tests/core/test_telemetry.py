@@ -0,0 +1,79 @@
+import pytest
+
+from src.backend.api.server import encode_response
+from src.backend.core.decisions import RandomDecisionProvider
+from src.backend.core.game import Game
+from src.backend.core.phases import play_game
+from src.backend.core.telemetry import (
+    DECISION_SECONDS,
+    METRICS,
+    NULL_SPAN,
+    PHASE_SECONDS,
+    STEP_SECONDS,
+    Metrics,
+)
+
+
+class RecordingProvider(RandomDecisionProvider):
+    def __init__(self, seed):
+        super().__init__(seed)
+        self.messages = []
+
+    def notify(self, message, **style):
+        self.messages.append(message)
+
+
+@pytest.fixture
+def metrics():
+    METRICS.reset()
+    METRICS.enable()
+    yield METRICS
+    METRICS.enable(False)
+    METRICS.reset()
+
+
+def test_disabled_metrics_record_nothing():
+    assert not METRICS.enabled
+    assert METRICS.span(STEP_SECONDS, game="g") is NULL_SPAN
+    play_game(Game(8, provider=RandomDecisionProvider(0)))
+    assert METRICS.histograms() == {}
+
+
+def test_game_phases_steps_and_decisions_are_timed(metrics):
+    provider = RecordingProvider(1)
+    game = Game(9, provider=provider)
+    play_game(game)
+
+    names = {name for name, _ in metrics.histograms(game=game.uid)}
+    assert names == {PHASE_SECONDS, STEP_SECONDS, DECISION_SECONDS}
+    first_night = metrics.histograms(game=game.uid, phase="first_night", round=1)
+    assert [h.count for h in first_night.values()] == [1]
+    # Per-game summary at the end of the game
+    assert "\n⏱️ Timings" in provider.messages
+    assert provider.messages[-1] == metrics.summary(game.uid)[-1]
+
+    text = metrics.render()
+    assert "# TYPE werewolves_step_seconds histogram" in text
+    assert f'werewolves_phase_seconds_count{{game="{game.uid}",phase="first_night",round="1"}} 1' in text
+    metrics.forget(game.uid)
+    assert metrics.histograms() == {}
+
+
+def test_render_buckets_and_labels(tmp_path):
+    metrics = Metrics(enabled=True, buckets=(0.1, 1.0, float("inf")))
+    for value in (0.05, 0.5, 5.0):
+        metrics.observe("latency", value, role='a"b')
+    path = tmp_path / "metrics.prom"
+    metrics.write(path)
+
+    lines = path.read_text().splitlines()
+    assert 'latency_bucket{role="a\\"b",le="0.1"} 1' in lines
+    assert 'latency_bucket{role="a\\"b",le="1.0"} 2' in lines
+    assert 'latency_bucket{role="a\\"b",le="+Inf"} 3' in lines
+    assert 'latency_count{role="a\\"b"} 3' in lines
+
+
+def test_metrics_endpoint_is_plain_text():
+    response = encode_response(200, "x_count 1\n")
+    assert b"Content-Type: text/plain; version=0.0.4" in response
+    assert response.endswith(b"x_count 1\n")
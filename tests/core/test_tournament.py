@@ -0,0 +1,89 @@
+from random import Random
+
+import pytest
+
+from src.backend.core.balance import play_random_game
+from src.backend.core.bots import STRATEGIES, BotProvider, Strategy
+from src.backend.core.decisions import Decision
+from src.backend.core.game import ActionType, Camp, Game
+from src.backend.core.role_distributor import Role
+from src.backend.core.tournament import (
+    CHUNK_SIZE,
+    TournamentStats,
+    game_seed,
+    play_tournament_game,
+    read_rows,
+    run_tournament,
+)
+
+LINEUPS = [
+    {Role.VILLAGEOIS: 3, Role.LOUP_GAROU: 2, Role.VOYANTE: 1, Role.SORCIERE: 1, Role.CUPIDON: 1},
+    {Role.VILLAGEOIS: 4, Role.LOUP_GAROU: 2, Role.VOYANTE: 1, Role.CHASSEUR: 1},
+]
+
+
+def test_random_strategy_plays_like_the_balance_simulations():
+    for seed in range(5):
+        bots = play_tournament_game(LINEUPS[0], STRATEGIES["random"], str(seed))
+        balance = play_random_game(LINEUPS[0], Random(str(seed)))
+        assert [p.role for p in bots.players] == [p.role for p in balance.players]
+        assert bots.winner == balance.winner and bots.journal.raw() == balance.journal.raw()
+
+
+def test_policies_and_unknown_names():
+    game = play_tournament_game(LINEUPS[0], STRATEGIES["careful_witch"], "0")
+    never_poison = BotProvider(Strategy("x", poison="never"), Random(0))
+    assert never_poison.select_player(game, list(game.players), decision=Decision.SORCIERE_POISON, can_select_none=True) is None
+    # Non-optional decisions still get an answer
+    assert never_poison.select_player(game, list(game.players), decision=Decision.SORCIERE_POISON) is not None
+    with pytest.raises(ValueError):
+        Strategy("x", vote="plurality").policies()
+
+
+def test_seer_guided_village_finds_more_wolves():
+    lineup = {Role.VILLAGEOIS: 4, Role.LOUP_GAROU: 2, Role.VOYANTE: 1, Role.SORCIERE: 1}
+    results = {}
+    for name in ("random", "seer_guided"):
+        seen = wolves_seen = wolves_voted = wins = 0
+        for seed in range(400):
+            game = play_tournament_game(lineup, STRATEGIES[name], str(seed))
+            investigations = game.players.first_with_role(Role.VOYANTE).investigations
+            seen += len(investigations)
+            wolves_seen += sum(role is Role.LOUP_GAROU for role in investigations.values())
+            wolves_voted += sum(r.action is ActionType.VOTE and game.players.get(r.target).role is Role.LOUP_GAROU for r in game.journal)
+            wins += game.winner is Camp.VILLAGEOIS
+        results[name] = (wolves_seen / seen, wolves_voted, wins)
+    # The Voyante does not know roles before seeing them: she must not avoid the wolves
+    assert results["seer_guided"][0] >= results["random"][0]
+    assert results["seer_guided"][1] > results["random"][1]
+    assert results["seer_guided"][2] > results["random"][2]
+
+
+def test_seeded_bots_also_seed_the_role_shuffle():
+    roles = [[p.role for p in Game(8, provider=BotProvider(STRATEGIES["random"], Random(4))).players] for _ in range(2)]
+    assert roles[0] == roles[1]
+
+
+def test_tournament_streams_the_same_games_whatever_the_workers(tmp_path):
+    strategies = [STRATEGIES["random"], STRATEGIES["seer_guided"]]
+    games = CHUNK_SIZE + 10
+    stats = run_tournament(LINEUPS, strategies, games, tmp_path / "one.csv", workers=1, seed=7)
+    pooled = run_tournament(LINEUPS, strategies, games, tmp_path / "two.csv", workers=2, seed=7)
+
+    rows = sorted(read_rows(tmp_path / "one.csv"), key=lambda r: (r.lineup, r.strategy, r.game))
+    assert rows == sorted(read_rows(tmp_path / "two.csv"), key=lambda r: (r.lineup, r.strategy, r.game))
+    assert len(rows) == len(LINEUPS) * len(strategies) * games
+    assert stats == pooled == TournamentStats.from_csv(tmp_path / "two.csv")
+    assert all(pair.result.games == games for pair in stats.pairs.values())
+
+    # Any game can be replayed alone from its seed
+    row = rows[-1]
+    game = play_tournament_game(LINEUPS[row.lineup], STRATEGIES[row.strategy], game_seed(7, row.lineup, row.strategy, row.game))
+    assert (game.winner.value if game.winner else "nobody", game.round_number) == (row.winner, row.rounds)
+
+
+def test_read_rows_rejects_other_files(tmp_path):
+    path = tmp_path / "other.csv"
+    path.write_text("a,b\n1,2\n")
+    with pytest.raises(ValueError):
+        list(read_rows(path))